@@ -0,0 +1,161 @@
+"""Banc : débit de la correction LLM (segments par seconde).
+
+Trois façons de corriger la même file de finales, à travers le vrai
+`benji.llm.corrector` :
+
+- **naïf** : chaque segment ré-encode consigne + phrase (avant) ;
+- **préfixe** : consigne pré-remplie une fois dans un cache KV, chaque segment
+  ne paie plus que sa phrase (mlx-lm épinglé, sans génération par lots) ;
+- **lots** : les segments en attente sont décodés ensemble par
+  `batch_generate` (mlx-lm récent), par lots de `--batch`.
+
+Le modèle est un factice qui dort le temps qu'aurait pris la génération : un
+coût fixe par appel, le pré-remplissage proportionnel aux tokens du prompt, le
+décodage proportionnel aux tokens produits — et, par lots, une étape de
+décodage qui ne coûte qu'un peu plus par séquence ajoutée (`--batch-step`),
+la génération étant limitée par la bande passante mémoire et non par le
+calcul. Il recopie la phrase reçue. Tourne partout, sans mlx_lm.
+
+    python benchmarks/bench_correction.py [--segments 120] [--batch 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.llm import corrector  # noqa: E402
+
+# Phrases de réunion typiques : 4 à 18 mots.
+_WORDS = ("on", "va", "regarder", "le", "budget", "du", "trimestre", "prochain",
+          "avec", "l'équipe", "produit", "et", "valider", "la", "feuille", "de",
+          "route", "avant", "vendredi")
+_CHARS_PER_TOKEN = 4
+
+
+def _cost_tokens(tokens) -> float:
+    return len(tokens) / _CHARS_PER_TOKEN
+
+
+def _user(tokens) -> str:
+    return "".join(chr(t) for t in tokens).split("<user>")[-1].split("</user>")[0]
+
+
+class _Tokenizer:
+    """Un « token » par caractère ; les coûts sont ramenés à ~4 caractères."""
+
+    def apply_chat_template(self, messages, tokenize, add_generation_prompt):
+        text = "".join(f"<{m['role']}>{m['content']}</{m['role']}>" for m in messages)
+        return [ord(c) for c in text + "<assistant>"]
+
+
+class _KV:
+    def __init__(self, trimmable: bool):
+        self.offset = 0
+        self.trimmable = trimmable
+
+    def is_trimmable(self):
+        return self.trimmable
+
+
+class StubLLM:
+    def __init__(self, call_ms: float, prefill_ms: float, decode_ms: float,
+                 batch_step: float, prefix_cache: bool):
+        self.call_ms = call_ms
+        self.prefill_ms = prefill_ms
+        self.decode_ms = decode_ms
+        self.batch_step = batch_step
+        self.prefix_cache = prefix_cache
+        self.calls = 0
+
+    def _sleep(self, ms: float) -> None:
+        time.sleep(ms / 1000)
+
+    def generate(self, model, tokenizer, prompt, max_tokens, verbose, prompt_cache=None):
+        self.calls += 1
+        reply = _user(prompt)
+        self._sleep(self.call_ms + self.prefill_ms * _cost_tokens(prompt)
+                    + self.decode_ms * _cost_tokens(reply))
+        if prompt_cache is not None:
+            prompt_cache[0].offset += len(prompt) + len(reply)
+        return reply
+
+    def batch_generate(self, model, tokenizer, prompts, max_tokens, verbose):
+        self.calls += 1
+        replies = [_user(p) for p in prompts]
+        steps = max(_cost_tokens(r) for r in replies)
+        self._sleep(self.call_ms
+                    + self.prefill_ms * sum(_cost_tokens(p) for p in prompts)
+                    + self.decode_ms * steps * (1 + self.batch_step * (len(prompts) - 1)))
+        return types.SimpleNamespace(texts=replies)
+
+    def prefill(self, tokens, cache):
+        self._sleep(self.prefill_ms * _cost_tokens(tokens))
+        cache[0].offset += len(tokens)
+
+    def install(self, batched: bool) -> None:
+        module = types.ModuleType("mlx_lm")
+        module.generate = self.generate
+        if batched:
+            module.batch_generate = self.batch_generate
+        cache = types.ModuleType("mlx_lm.models.cache")
+        cache.make_prompt_cache = lambda model: [_KV(self.prefix_cache)]
+        cache.can_trim_prompt_cache = lambda c: all(kv.is_trimmable() for kv in c)
+        cache.trim_prompt_cache = lambda c, n: setattr(c[0], "offset", c[0].offset - n)
+        sys.modules["mlx_lm"] = module
+        sys.modules["mlx_lm.models"] = types.ModuleType("mlx_lm.models")
+        sys.modules["mlx_lm.models.cache"] = cache
+        corrector._model, corrector._tokenizer = object(), _Tokenizer()
+        corrector._prefill = self.prefill
+        corrector._prefix = None
+
+
+def sentences(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_WORDS, k=rng.randint(4, 18))) for _ in range(n)]
+
+
+def throughput(texts: list[str], batch: int) -> float:
+    """Segments corrigés par seconde, la file étant vidée par lots de *batch*."""
+    t0 = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        corrector.correct_batch(texts[i : i + batch])
+    return len(texts) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=120)
+    parser.add_argument("--batch", type=int, default=8, help="finales vidées d'un coup")
+    parser.add_argument("--call-ms", type=float, default=30.0, help="coût fixe par génération")
+    parser.add_argument("--prefill-ms", type=float, default=0.8, help="par token de prompt")
+    parser.add_argument("--decode-ms", type=float, default=12.0, help="par token produit")
+    parser.add_argument("--batch-step", type=float, default=0.15,
+                        help="surcoût d'une étape de décodage par séquence ajoutée")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = sentences(args.segments, args.seed)
+    print(f"{'mode':<8}  {'segments/s':>10}  {'générations':>11}  {'gain':>5}")
+    base = None
+    for mode, prefix_cache, batched, batch in (
+        ("naïf", False, False, 1),
+        ("préfixe", True, False, args.batch),
+        ("lots", True, True, args.batch),
+    ):
+        stub = StubLLM(args.call_ms, args.prefill_ms, args.decode_ms, args.batch_step,
+                       prefix_cache)
+        stub.install(batched)
+        rate = throughput(texts, batch)
+        base = base or rate
+        print(f"{mode:<8}  {rate:>10.1f}  {stub.calls:>11}  {rate / base:>5.2f}")
+
+
+if __name__ == "__main__":
+    main()
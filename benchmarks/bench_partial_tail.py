@@ -0,0 +1,138 @@
+"""Banc : passes partielles en re-décodage complet contre « queue seule ».
+
+Rejoue un énoncé comme le ferait le VAD — une passe partielle toutes les
+`--interval` secondes sur un tampon qui grandit — à travers le vrai
+`Transcriber._run_partial`, une fois par mode (`partial_tail_decode`).
+
+Sans fichier, le moteur est un factice dont le coût est proportionnel à l'audio
+reçu : on compte les secondes d'audio décodées par énoncé, qui croissent comme
+le carré de sa durée en re-décodage complet et linéairement en queue seule. Le
+factice lit l'horodatage absolu dans l'audio (une rampe), ses mots sont donc
+cohérents d'une tranche à l'autre et la dernière hypothèse doit être identique
+dans les deux modes.
+
+Avec des enregistrements (un énoncé par fichier, WAV 16 kHz de préférence), le
+vrai moteur des partielles est chargé (MLX, donc sur Mac) et on compare, en
+plus du temps de décodage, l'exactitude de la dernière hypothèse partielle de
+chaque mode : WER contre le décodage du fichier entier.
+
+    python benchmarks/bench_partial_tail.py [--overlap 1.0] [enregistrement.wav ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from queue import Queue
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.config import STTConfig  # noqa: E402
+from benji.stt.transcriber import Transcriber  # noqa: E402
+
+SAMPLE_RATE = 16000
+WORD_S = 0.25
+
+
+class RampBackend:
+    """Moteur factice : un mot `w<k>` par 250 ms d'horloge absolue, lue dans la rampe."""
+
+    name = "ramp"
+
+    def __init__(self):
+        self.decoded_s = 0.0
+
+    def transcribe(self, audio):
+        seconds = len(audio) / SAMPLE_RATE
+        self.decoded_s += seconds
+        t0 = float(audio[0])
+        k = int(t0 / WORD_S)
+        while (k + 1) * WORD_S <= t0 + seconds:
+            start = max(k * WORD_S, t0)
+            # Un mot entamé par le début de la tranche n'en donne qu'un fragment.
+            text = f"w{k}" if start == k * WORD_S else f"f{k}"
+            yield {"text": text, "start": start - t0, "end": (k + 1) * WORD_S - t0}
+            k += 1
+
+
+class _NullQueue:
+    def put(self, item, block=True, timeout=None):
+        pass
+
+
+def _transcriber(backend, tail: bool, overlap: float) -> Transcriber:
+    cfg = STTConfig(diarization=False, partial_tail_decode=tail,
+                    partial_tail_overlap_s=overlap, agc_target_peak=0.0)
+    with patch("benji.stt.transcriber.build_backend", return_value=backend), \
+         patch("benji.stt.transcriber.build_final_backend", return_value=None):
+        return Transcriber(Queue(), _NullQueue(), cfg, sample_rate=SAMPLE_RATE)
+
+
+def replay(audio: np.ndarray, backend, tail: bool, overlap: float,
+           interval_s: float) -> tuple[float, list[str]]:
+    """Passes partielles sur `audio` qui grandit ; rend (secondes de calcul, dernière hypothèse)."""
+    t = _transcriber(backend, tail, overlap)
+    step = int(interval_s * SAMPLE_RATE)
+    t0 = time.perf_counter()
+    for end in range(step, len(audio) + 1, step):
+        t._run_partial(audio[:end])
+    return time.perf_counter() - t0, list(t._prev_words_norm)
+
+
+def wer(ref: list[str], hyp: list[str]) -> float:
+    """Taux d'erreur mots (distance d'édition / longueur de la référence)."""
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / max(len(ref), 1)
+
+
+def synthetic(durations, overlap: float, interval_s: float) -> None:
+    print(f"{'énoncé (s)':>10}  {'décodé complet (s)':>18}  {'décodé queue (s)':>16}  "
+          f"{'ratio':>6}  {'même texte':>10}")
+    for seconds in durations:
+        audio = (np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE).astype(np.float32)
+        full, tail = RampBackend(), RampBackend()
+        _, full_words = replay(audio, full, False, overlap, interval_s)
+        _, tail_words = replay(audio, tail, True, overlap, interval_s)
+        print(f"{seconds:>10.0f}  {full.decoded_s:>18.1f}  {tail.decoded_s:>16.1f}  "
+              f"{full.decoded_s / tail.decoded_s:>6.1f}  {str(full_words == tail_words):>10}")
+
+
+def recorded(paths: list[Path], overlap: float, interval_s: float) -> None:
+    from benji.offline import read_audio_blocks
+    from benji.stt.backend import build_backend
+
+    backend = build_backend(STTConfig().model)
+    norm = Transcriber._norm
+    print(f"{'fichier':<24} {'durée':>6}  {'complet s':>9} {'WER':>5}  {'queue s':>8} {'WER':>5}")
+    for path in paths:
+        audio = np.concatenate(list(read_audio_blocks(path, SAMPLE_RATE)))
+        ref = [norm(w["text"]) for w in backend.transcribe(audio)]
+        full_s, full_words = replay(audio, backend, False, overlap, interval_s)
+        tail_s, tail_words = replay(audio, backend, True, overlap, interval_s)
+        print(f"{path.name:<24} {len(audio) / SAMPLE_RATE:>6.1f}  "
+              f"{full_s:>9.2f} {wer(ref, full_words):>5.2f}  {tail_s:>8.2f} {wer(ref, tail_words):>5.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--overlap", type=float, default=1.0, help="partial_tail_overlap_s")
+    parser.add_argument("--interval", type=float, default=0.4, help="écart entre passes (s)")
+    args = parser.parse_args()
+    if args.files:
+        recorded(args.files, args.overlap, args.interval)
+    else:
+        synthetic((4, 8, 16, 30), args.overlap, args.interval)
+
+
+if __name__ == "__main__":
+    main()
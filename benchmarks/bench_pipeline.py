@@ -0,0 +1,384 @@
+"""Banc de bout en bout : capture → VAD → transcribe_queue → Transcriber → affichage.
+
+Un audio synthétique « façon parole » (énoncés de 1 à 6 s entrecoupés de
+pauses, tirés d'une graine fixe) est poussé à N× le temps réel dans le vrai
+`SampleRing`, consommé par le vrai `VADProcessor` et le vrai `Transcriber`,
+chacun sur son thread comme dans l'app. Seuls les modèles sont remplacés :
+
+- Silero par une confiance tirée de l'énergie du chunk (déterministe) ;
+- les moteurs STT par des `STTBackend` factices dont la latence de décodage est
+  réglable (`base + par seconde d'audio`) et qui rendent un mot par 250 ms.
+
+Aucun MLX ni modèle téléchargé : le banc tourne tel quel sous Linux. La sortie
+est un JSON (latences par étage, profondeur des queues, pertes comptées par
+`SessionStats.record_drop`, cadence des partielles) destiné à être comparé
+d'un commit à l'autre.
+
+    python benchmarks/bench_pipeline.py [--speed 4] [--duration 120]
+        [--partial-ms 40 --final-ms 120 --per-second-ms 15] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from queue import Queue
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.audio.ring import SampleRing  # noqa: E402
+from benji.audio.vad import VADProcessor  # noqa: E402
+from benji.config import AudioConfig, STTConfig, VADConfig  # noqa: E402
+from benji.stats import SessionStats  # noqa: E402
+from benji.stt.cadence import PartialCadence  # noqa: E402
+from benji.stt.scheduler import TranscribeScheduler  # noqa: E402
+from benji.stt.transcriber import Transcriber  # noqa: E402
+
+SAMPLE_RATE = 16000
+CHUNK = 512
+
+
+# --- audio synthétique -------------------------------------------------------
+
+
+def synthetic_speech(duration_s: float, seed: int = 0) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """Audio mono 16 kHz et liste des énoncés `(début, fin)` en échantillons.
+
+    Parole = porteuse harmonique (f0 120–220 Hz) modulée à ~4 Hz (rythme
+    syllabique) + souffle ; pause = bruit de fond faible.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration_s * SAMPLE_RATE)
+    audio = (rng.standard_normal(total) * 0.003).astype(np.float32)
+    spans = []
+    pos = int(rng.uniform(0.3, 1.0) * SAMPLE_RATE)
+    while pos < total:
+        n = min(int(rng.uniform(1.0, 6.0) * SAMPLE_RATE), total - pos)
+        t = np.arange(n) / SAMPLE_RATE
+        f0 = rng.uniform(120, 220)
+        carrier = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3, 5) * t)
+        audio[pos : pos + n] += (0.08 * carrier * envelope
+                                 + rng.standard_normal(n) * 0.01).astype(np.float32)
+        spans.append((pos, pos + n))
+        pos += n + int(rng.uniform(0.3, 1.5) * SAMPLE_RATE)
+    return audio, spans
+
+
+class EnergyModel:
+    """Remplaçant déterministe de Silero : confiance = énergie du chunk."""
+
+    def __call__(self, chunk: np.ndarray) -> float:
+        rms = float(np.sqrt(np.dot(chunk, chunk) / len(chunk)))
+        return min(1.0, rms / 0.04)
+
+    def reset_state(self) -> None:
+        pass
+
+    def skip(self, chunk) -> None:
+        pass
+
+
+# --- moteurs STT factices ----------------------------------------------------
+
+
+class StubBackend:
+    """`STTBackend` à latence réglable : `base_ms + per_second_ms × durée`.
+
+    Un mot par 250 ms d'audio, dont le texte ne dépend que de sa position :
+    deux passes sur un même début d'énoncé s'accordent, comme un vrai moteur.
+    """
+
+    def __init__(self, name: str, base_ms: float, per_second_ms: float):
+        self.name = name
+        self.base_ms = base_ms
+        self.per_second_ms = per_second_ms
+        self.decode_ms: list[float] = []
+        self.done_at: list[float] = []  # instants de fin de décodage
+
+    def transcribe(self, audio):
+        t0 = time.monotonic()
+        seconds = len(audio) / SAMPLE_RATE
+        time.sleep((self.base_ms + self.per_second_ms * seconds) / 1000)
+        words = [
+            {"text": f"mot{i}", "start": i * 0.25, "end": (i + 1) * 0.25}
+            for i in range(max(1, int(seconds / 0.25)))
+        ]
+        now = time.monotonic()
+        self.decode_ms.append((now - t0) * 1000)
+        self.done_at.append(now)
+        yield from words
+
+
+# --- instrumentation ---------------------------------------------------------
+
+
+class TimedQueue(Queue):
+    """`Queue` qui mesure l'attente de chaque élément et sa profondeur à l'entrée."""
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.wait_ms: list[float] = []
+        self.depths: list[int] = []
+        self.final_put_at: deque[float] = deque()
+
+    def _put(self, item):
+        now = time.monotonic()
+        self.depths.append(self._qsize())
+        if isinstance(item, dict) and item.get("is_final") and not item.get("speculative"):
+            self.final_put_at.append(now)
+        super()._put((now, item))
+
+    def _get(self):
+        t, item = super()._get()
+        self.wait_ms.append((time.monotonic() - t) * 1000)
+        return item
+
+
+class TimedScheduler(TranscribeScheduler):
+    """`TranscribeScheduler` qui relève sa profondeur et date les finales déposées.
+
+    L'attente de chaque demande est déjà versée par l'ordonnanceur dans
+    `SessionStats` (étape `queue_wait`).
+    """
+
+    def __init__(self, stats):
+        super().__init__(stats=stats)
+        self.depths: list[int] = []
+        self.final_put_at: deque[float] = deque()
+
+    def put(self, item, block=True, timeout=None):
+        self.depths.append(self.qsize())
+        if isinstance(item, dict) and item.get("is_final") and not item.get("speculative"):
+            self.final_put_at.append(time.monotonic())
+        super().put(item, block, timeout)
+
+
+class TimedRing(SampleRing):
+    """`SampleRing` qui relève sa profondeur à chaque écriture."""
+
+    def __init__(self, block_size: int, capacity_blocks: int):
+        super().__init__(block_size, capacity_blocks)
+        self.depths: list[int] = []
+
+    def put_nowait(self, samples, stamp=None):
+        self.depths.append(self.qsize())
+        super().put_nowait(samples, stamp)
+
+
+def _summary(values) -> dict:
+    s = sorted(values)
+    if not s:
+        return {"count": 0}
+
+    def rank(p: float) -> float:
+        return s[max(0, math.ceil(len(s) * p) - 1)]
+
+    return {
+        "count": len(s),
+        "mean": sum(s) / len(s),
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": s[-1],
+    }
+
+
+def _depth(values) -> dict:
+    return {"max": max(values, default=0),
+            "mean": sum(values) / len(values) if values else 0.0}
+
+
+# --- banc --------------------------------------------------------------------
+
+
+def run(
+    duration_s: float = 120.0,
+    speed: float = 4.0,
+    partial_ms: float = 40.0,
+    final_ms: float = 120.0,
+    per_second_ms: float = 15.0,
+    seed: int = 0,
+    vad_config: VADConfig | None = None,
+    stt_config: STTConfig | None = None,
+) -> dict:
+    """Rejoue `duration_s` d'audio synthétique à `speed`× le temps réel
+    (0 = aussi vite que possible) et rend le rapport JSON-sérialisable."""
+    audio, spans = synthetic_speech(duration_s, seed)
+    # Une seconde de silence en fin de flux pour que le dernier énoncé se ferme.
+    audio = np.concatenate([audio, np.zeros(SAMPLE_RATE, dtype=np.float32)])
+    audio = audio[: len(audio) // CHUNK * CHUNK]
+
+    stats = SessionStats(max_latency_samples=100_000)
+    ring = TimedRing(CHUNK, capacity_blocks=100)
+    # Mêmes queues que l'app (cf. BenjiApp._build_pipeline).
+    transcribe_q = TimedScheduler(stats)
+    display_q = TimedQueue(maxsize=10)
+    partial_backend = StubBackend("stub-partial", partial_ms, per_second_ms)
+    final_backend = StubBackend("stub-final", final_ms, per_second_ms)
+
+    vad_config = vad_config or VADConfig()
+    # Cadence adaptative comme dans l'app ; le rejeu accéléré laisse `speed`
+    # fois moins de temps réel par seconde d'audio, d'où l'occupation visée
+    # divisée d'autant — bornée à 1, et inchangée sans limite de vitesse
+    # (speed <= 0, « aussi vite que possible »).
+    cadence = None
+    if vad_config.partial_adaptive and vad_config.partial_interval_ms > 0:
+        occupancy = vad_config.partial_target_occupancy
+        if speed > 0:
+            occupancy = min(1.0, occupancy / speed)
+        cadence = PartialCadence(
+            vad_config.partial_interval_ms, occupancy,
+            vad_config.partial_interval_min_ms, vad_config.partial_interval_max_ms,
+            stats=stats,
+        )
+    vad = VADProcessor(ring, transcribe_q, AudioConfig(), vad_config,
+                       display_q, stats=stats, model=EnergyModel(), cadence=cadence)
+    with patch("benji.stt.transcriber.build_backend", return_value=partial_backend), \
+         patch("benji.stt.transcriber.build_final_backend", return_value=final_backend):
+        transcriber = Transcriber(transcribe_q, display_q,
+                                  stt_config or STTConfig(diarization=False),
+                                  stats=stats, sample_rate=SAMPLE_RATE, cadence=cadence)
+
+    class _NullHistory:
+        def add(self, *a, **kw):
+            pass
+
+    transcriber.history = _NullHistory()
+
+    # Étage VAD : attente dans l'anneau + coût de traitement du chunk.
+    ring_wait_ms: list[float] = []
+    vad_chunk_ms: list[float] = []
+    process_chunk = vad.process_chunk
+
+    def timed_process_chunk(chunk, confidence=None):
+        t0 = time.monotonic()
+        ring_wait_ms.append((t0 - ring.last_stamp) * 1000)
+        process_chunk(chunk, confidence)
+        vad_chunk_ms.append((time.monotonic() - t0) * 1000)
+
+    vad.process_chunk = timed_process_chunk
+
+    # Consommateur d'affichage : vide la queue comme l'overlay, et mesure la
+    # latence de bout en bout d'un final (remis par le VAD → affiché).
+    final_e2e_ms: list[float] = []
+
+    def display_loop():
+        while True:
+            msg = display_q.get()
+            if msg is None:
+                return
+            if "trace" in msg:
+                stats.record_trace(msg["trace"])
+            if msg.get("type") == "final_text" and transcribe_q.final_put_at:
+                final_e2e_ms.append((time.monotonic() - transcribe_q.final_put_at.popleft()) * 1000)
+
+    threads = [
+        threading.Thread(target=vad.run, name="VAD"),
+        threading.Thread(target=transcriber.run, name="STT"),
+        threading.Thread(target=display_loop, name="display"),
+    ]
+    for th in threads:
+        th.start()
+
+    # Producteur : joue le rôle du callback audio, à la cadence demandée.
+    chunk_s = CHUNK / SAMPLE_RATE
+    t_start = time.monotonic()
+    for i in range(0, len(audio), CHUNK):
+        if speed > 0:
+            delay = t_start + (i // CHUNK) * chunk_s / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        try:
+            ring.put_nowait(audio[i : i + CHUNK])
+        except Exception:
+            stats.record_drop("audio_queue_full")
+    ring.close()
+    threads[0].join()
+    transcribe_q.put(None)
+    threads[1].join()
+    display_q.put(None)
+    threads[2].join()
+    wall_s = time.monotonic() - t_start
+
+    # Cadence des partielles : écart entre deux partielles affichées d'un même
+    # énoncé (un final clôt l'énoncé).
+    cadence_ms = []
+    finals = deque(final_backend.done_at)
+    prev = None
+    for t in partial_backend.done_at:
+        while finals and finals[0] < t:
+            finals.popleft()
+            prev = None
+        if prev is not None:
+            cadence_ms.append((t - prev) * 1000)
+        prev = t
+
+    snap = stats.snapshot()
+    return {
+        "config": {
+            "duration_s": duration_s, "speed": speed, "seed": seed,
+            "partial_ms": partial_ms, "final_ms": final_ms,
+            "per_second_ms": per_second_ms,
+        },
+        "audio_seconds": len(audio) / SAMPLE_RATE,
+        "utterances": len(spans),
+        "partial_interval_ms": snap["partial_interval_ms"],
+        "wall_s": wall_s,
+        "stages_ms": {
+            "ring_wait": _summary(ring_wait_ms),
+            "vad_chunk": _summary(vad_chunk_ms),
+            "partial_decode": _summary(partial_backend.decode_ms),
+            "final_decode": _summary(final_backend.decode_ms),
+            "display_queue_wait": _summary(display_q.wait_ms),
+            "final_end_to_end": _summary(final_e2e_ms),
+        },
+        "queue_depth": {
+            "audio_ring": _depth(ring.depths),
+            "transcribe_queue": _depth(transcribe_q.depths),
+            "display_queue": _depth(display_q.depths),
+        },
+        # Même découpage, vu par les traces que portent segments et messages.
+        "trace_stages_ms": snap["stages"],
+        "drops": snap["drops"],
+        "partials": {
+            "decoded": len(partial_backend.done_at),
+            "cadence_ms": _summary(cadence_ms),
+        },
+        "finals": snap["segments"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=120.0, help="secondes d'audio")
+    parser.add_argument("--speed", type=float, default=4.0,
+                        help="multiple du temps réel (0 = sans cadence)")
+    parser.add_argument("--partial-ms", type=float, default=40.0)
+    parser.add_argument("--final-ms", type=float, default=120.0)
+    parser.add_argument("--per-second-ms", type=float, default=15.0,
+                        help="coût de décodage par seconde d'audio")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, default=None, help="fichier de sortie (défaut : stdout)")
+    args = parser.parse_args()
+
+    report = run(args.duration, args.speed, args.partial_ms, args.final_ms,
+                 args.per_second_ms, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.json:
+        args.json.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
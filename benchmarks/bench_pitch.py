@@ -0,0 +1,111 @@
+"""Banc : coût et justesse de l'estimation de F0 du tagger « pitch ».
+
+Compare l'ancienne autocorrélation (`np.correlate` en mode "full" sur la
+seconde centrale, quadratique en la longueur) au YIN par trames de
+`benji.stt.diarization._estimate_f0` (une FFT pour toutes les trames) :
+
+- coût par segment selon sa durée ;
+- erreur sur des voix synthétiques (fondamentale + harmoniques décroissantes,
+  léger vibrato) à plusieurs niveaux de bruit, et taux d'erreurs d'octave.
+
+    python benchmarks/bench_pitch.py [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.stt.diarization import _estimate_f0  # noqa: E402
+
+SAMPLE_RATE = 16000
+F0S = (85.0, 110.0, 140.0, 180.0, 220.0, 280.0, 350.0)
+
+
+def reference_f0(audio: np.ndarray, sample_rate: int = SAMPLE_RATE,
+                 fmin: float = 70.0, fmax: float = 400.0) -> float | None:
+    """L'estimateur d'avant, recopié tel quel pour la comparaison."""
+    if len(audio) < sample_rate // 4:
+        return None
+    target_len = min(len(audio), sample_rate)
+    start = (len(audio) - target_len) // 2
+    segment = audio[start:start + target_len].astype(np.float32)
+    segment = segment - segment.mean()
+    if np.max(np.abs(segment)) < 1e-3:
+        return None
+    corr = np.correlate(segment, segment, mode="full")[len(segment) - 1:]
+    min_lag = int(sample_rate / fmax)
+    max_lag = int(sample_rate / fmin)
+    if max_lag >= len(corr):
+        return None
+    window = corr[min_lag:max_lag]
+    peak = int(np.argmax(window)) + min_lag
+    if corr[peak] < 0.3 * corr[0]:
+        return None
+    return sample_rate / peak
+
+
+def voice(f0: float, duration_s: float, noise: float, rng: np.random.Generator) -> np.ndarray:
+    t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+    # Vibrato de ±2 % à 5 Hz : une voix n'est jamais une sinusoïde figée.
+    phase = 2 * np.pi * f0 * (t + 0.02 / (2 * np.pi * 5) * np.sin(2 * np.pi * 5 * t))
+    audio = sum((0.6 / k) * np.sin(k * phase + rng.uniform(0, 2 * np.pi)) for k in range(1, 9))
+    return (audio + noise * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def _timing(estimate, duration_s: float, repeat: int) -> float:
+    audio = voice(150.0, duration_s, 0.05, np.random.default_rng(0))
+    estimate(audio)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        estimate(audio)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def _accuracy(estimate, noise: float) -> tuple[float, float, float]:
+    """(erreur médiane %, part d'erreurs d'octave, part de segments sans F0)."""
+    rng = np.random.default_rng(1)
+    errors, octaves, missing = [], 0, 0
+    for f0 in F0S:
+        for _ in range(5):
+            result = estimate(voice(f0, 1.5, noise, rng))
+            if isinstance(result, tuple):
+                result = result[0]
+            if result is None:
+                missing += 1
+                continue
+            error = abs(result - f0) / f0
+            errors.append(error * 100)
+            octaves += error > 0.3
+    n = len(F0S) * 5
+    return (float(np.median(errors)) if errors else float("nan"), octaves / n, missing / n)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print("coût par segment (ms)")
+    print(f"{'durée':>6}  {'correlate':>10}  {'yin':>8}")
+    for duration in (0.5, 1.0, 2.0, 4.0, 8.0):
+        old = _timing(reference_f0, duration, args.repeat)
+        new = _timing(_estimate_f0, duration, args.repeat)
+        print(f"{duration:>5.1f}s  {old:>10.2f}  {new:>8.2f}")
+
+    print("\njustesse sur voix synthétiques")
+    print(f"{'bruit':>6}  {'moteur':<10}  {'err. méd.':>9}  {'octave':>7}  {'sans F0':>7}")
+    for noise in (0.0, 0.1, 0.2, 0.3):
+        for name, estimate in (("correlate", reference_f0), ("yin", _estimate_f0)):
+            err, octave, missing = _accuracy(estimate, noise)
+            print(f"{noise:>6.1f}  {name:<10}  {err:>8.2f}%  {octave:>7.0%}  {missing:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
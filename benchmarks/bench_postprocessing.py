@@ -0,0 +1,153 @@
+"""Banc : coût du post-traitement des finales et du filtre d'hallucinations.
+
+Compare l'ancienne implémentation (une douzaine de `re.sub` à motifs en ligne,
+une boucle de recherches de sous-chaîne sur `HALLUCINATION_PATTERNS`),
+recopiée ici telle quelle, au pipeline compilé de
+`benji.stt.postprocessing` :
+
+- segment par segment, comme la boucle STT ;
+- par lot (`postprocess_many`), comme un historique retraité d'un bloc ;
+- et vérifie que les deux rendent exactement le même texte et le même verdict.
+
+Le corpus est synthétique par défaut (phrases de réunion fr/en avec
+hésitations, espaces fautifs, nombres, et quelques rebuts) ; `--history` le
+remplace par les textes d'un vrai historique (`history.jsonl`).
+
+    python benchmarks/bench_postprocessing.py [--segments 20000] [--repeat 5] [--history PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.stt.postprocessing import (  # noqa: E402
+    HALLUCINATION_PATTERNS,
+    is_hallucination,
+    postprocess_many,
+    postprocess_text,
+)
+
+
+def reference_is_hallucination(text: str) -> bool:
+    if not text:
+        return True
+    normalized = text.lower().strip().rstrip(".!?")
+    if any(pattern in normalized for pattern in HALLUCINATION_PATTERNS):
+        return True
+    if re.search(r"\b(\w{2,})\b(?:\W+\1\b){3,}", normalized, flags=re.IGNORECASE):
+        return True
+    return False
+
+
+def reference_postprocess(text: str, language: str = None) -> str:
+    if not text or not text.strip():
+        return text
+    for pattern in (r'\b(euh|euuh|heu|heuu)\b', r'\b(uh|uhh|um|umm|hmm|huh)\b'):
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+([,.!?;:])', r'\1', text)
+    text = re.sub(r'((?<!\d)[,.!?;:]|[,.!?;:](?!\d))\s*', r'\1 ', text)
+    text = re.sub(r"([a-z])\s*'\s*([a-z])", r"\1'\2", text, flags=re.IGNORECASE)
+    text = re.sub(r"([a-z])\s*-\s*([a-z])", r"\1-\2", text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'^[\s,;:]+', '', text)
+    text = text.strip()
+    if text:
+        text = text[0].upper() + text[1:]
+
+    def capitalize_after_period(match):
+        return match.group(1) + match.group(2) + match.group(3).upper()
+
+    text = re.sub(r'([.!?])(\s+)(\w)', capitalize_after_period, text, flags=re.UNICODE)
+    if language == 'en':
+        text = re.sub(r'\bi\b', 'I', text)
+        text = re.sub(r"\bim\b", "I'm", text, flags=re.IGNORECASE)
+        text = re.sub(r"\bdont\b", "don't", text, flags=re.IGNORECASE)
+        text = re.sub(r"\bcant\b", "can't", text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+_FR = ("on", "va", "regarder", "le", "budget", "du", "trimestre", "prochain", "avec",
+       "l'équipe", "qu ' on", "est - ce que", "c ' est - à - dire", "euh", "heu", "2,5",
+       "3.14", "eh bien", "ah bon", "d'accord", "valider", "la", "feuille", "de", "route")
+_EN = ("i", "think", "im", "sure", "we", "dont", "cant", "ship", "it", "uh", "um",
+       "before", "friday", "the", "roadmap", "is", "fine", "I", "IM", "Dont")
+_PUNCT = ("", "", "", " ,", ",", " .", ".", " ?", "!", " ;", ":")
+
+
+def synthetic(n: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        language = rng.choice(("fr", "fr", "en"))
+        words = _FR if language == "fr" else _EN
+        parts = []
+        for _ in range(rng.randint(3, 25)):
+            parts.append(rng.choice(words) + rng.choice(_PUNCT))
+        text = rng.choice(("", " ", "  ")).join(parts)
+        if rng.random() < 0.02:
+            text = rng.choice(HALLUCINATION_PATTERNS).capitalize() + "."
+        elif rng.random() < 0.01:
+            text = " ".join([rng.choice(words)] * 5)
+        out.append((text, language))
+    return out
+
+
+def from_history(path: Path) -> list[tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(r["text"], "fr") for r in rows if isinstance(r.get("text"), str)]
+
+
+def _rate(fn, corpus, repeat: int) -> float:
+    """Meilleur débit sur *repeat* passes : le moins bruité par la machine."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(corpus)
+        best = min(best, time.perf_counter() - t0)
+    return len(corpus) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=20000)
+    parser.add_argument("--history", type=Path, help="history.jsonl réel à la place du synthétique")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = from_history(args.history) if args.history else synthetic(args.segments, args.seed)
+    texts = [t for t, _ in corpus]
+
+    mismatches = sum(reference_postprocess(t, lang) != postprocess_text(t, lang)
+                     for t, lang in corpus)
+    verdicts = sum(reference_is_hallucination(t) != is_hallucination(t) for t in texts)
+    print(f"{len(corpus)} segments — écarts de texte : {mismatches}, de verdict : {verdicts}")
+
+    print(f"\n{'étape':<28}  {'avant seg/s':>12}  {'après seg/s':>12}  {'gain':>5}")
+    rows = (
+        ("post-traitement, par segment",
+         lambda c: [reference_postprocess(t, lang) for t, lang in c],
+         lambda c: [postprocess_text(t, lang) for t, lang in c]),
+        ("post-traitement, par lot",
+         lambda c: [reference_postprocess(t, "fr") for t, _ in c],
+         lambda c: postprocess_many([t for t, _ in c], "fr")),
+        ("hallucinations",
+         lambda c: [reference_is_hallucination(t) for t, _ in c],
+         lambda c: [is_hallucination(t) for t, _ in c]),
+    )
+    for name, old, new in rows:
+        before, after = _rate(old, corpus, args.repeat), _rate(new, corpus, args.repeat)
+        print(f"{name:<28}  {before:>12.0f}  {after:>12.0f}  {after / before:>5.2f}")
+
+
+if __name__ == "__main__":
+    main()
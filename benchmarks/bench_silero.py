@@ -0,0 +1,60 @@
+"""Benchmark : appels/s de `SileroVADOnnx`, IO binding contre `session.run`.
+
+Le modèle est le vrai Silero ONNX (téléchargé dans ~/.cache/benji au premier
+lancement, comme par l'app). Les deux variantes reçoivent les mêmes chunks ;
+on vérifie au passage qu'elles rendent exactement les mêmes confiances.
+
+    python benchmarks/bench_silero.py [--calls 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.audio.vad import SileroVADOnnx, _download_model  # noqa: E402
+
+
+def _measure(model: SileroVADOnnx, chunks: np.ndarray) -> tuple[float, list[float]]:
+    out = []
+    t0 = time.perf_counter()
+    for c in chunks:
+        out.append(model(c))
+    return len(chunks) / (time.perf_counter() - t0), out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    path = _download_model()
+    rng = np.random.default_rng(0)
+    chunks = (rng.standard_normal((args.calls, 512)) * 0.1).astype(np.float32)
+
+    plain = SileroVADOnnx(path, io_binding=False)
+    bound = SileroVADOnnx(path, io_binding=True)
+    # Préchauffage : premières allocations ORT hors mesure.
+    for c in chunks[:50]:
+        plain(c)
+        bound(c)
+    plain.reset_state()
+    bound.reset_state()
+
+    plain_rate, plain_out = _measure(plain, chunks)
+    bound_rate, bound_out = _measure(bound, chunks)
+    max_diff = float(np.max(np.abs(np.array(plain_out) - np.array(bound_out))))
+
+    print(f"session.run  : {plain_rate:8.0f} appels/s")
+    print(f"IO binding   : {bound_rate:8.0f} appels/s  (×{bound_rate / plain_rate:.2f})")
+    print(f"écart max des confiances : {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Micro-benchmark : coût par chunk du VAD en fonction de la longueur du tampon.
+
+Le modèle Silero est remplacé par une confiance constante : on ne mesure que
+la tenue du tampon (ajout, passes partielles, test de durée max). Le coût par
+chunk doit rester plat de 0 à `max_speech_duration_s` ; avec l'ancien tampon
+(liste de chunks + `np.concatenate` à chaque partielle) il croissait avec la
+longueur de l'énoncé.
+
+    python benchmarks/bench_vad_buffer.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from queue import Queue
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benji.audio.vad import VADProcessor  # noqa: E402
+from benji.config import AudioConfig, VADConfig  # noqa: E402
+
+CHUNK = 512
+SAMPLE_RATE = 16000
+MAX_SPEECH_S = 60.0  # assez long pour ne jamais forcer de final pendant la mesure
+
+
+class _ConstantModel:
+    def __call__(self, chunk) -> float:
+        return 0.9
+
+    def reset_state(self) -> None:
+        pass
+
+
+def _build_vad() -> tuple[VADProcessor, Queue]:
+    tx_q: Queue = Queue()
+    cfg = VADConfig(
+        partial_interval_ms=400,
+        min_speech_duration_ms=0,
+        silence_duration_ms=5000,
+        max_speech_duration_s=MAX_SPEECH_S,
+        adaptive_threshold=False,
+    )
+    with patch("benji.audio.vad._download_model", return_value="/dev/null"), \
+         patch("benji.audio.vad.SileroVADOnnx", return_value=_ConstantModel()):
+        vad = VADProcessor(Queue(), tx_q, AudioConfig(), cfg)
+    return vad, tx_q
+
+
+def run(buckets_s=(1, 2, 4, 8, 16, 32)) -> list[tuple[float, float]]:
+    """Temps moyen par chunk (µs) mesuré sur la seconde qui suit chaque palier."""
+    vad, tx_q = _build_vad()
+    chunk = np.random.default_rng(0).standard_normal(CHUNK).astype(np.float32) * 0.1
+    chunks_per_s = SAMPLE_RATE // CHUNK
+    results = []
+    fed_s = 0.0
+    for target in buckets_s:
+        while fed_s < target:
+            vad.process_chunk(chunk)
+            fed_s += CHUNK / SAMPLE_RATE
+        t0 = time.perf_counter()
+        for _ in range(chunks_per_s):
+            vad.process_chunk(chunk)
+        elapsed = time.perf_counter() - t0
+        fed_s += chunks_per_s * CHUNK / SAMPLE_RATE
+        while not tx_q.empty():
+            tx_q.get_nowait()
+        results.append((target, elapsed / chunks_per_s * 1e6))
+    return results
+
+
+def main() -> None:
+    print(f"{'tampon (s)':>10}  {'µs/chunk':>10}")
+    for seconds, us in run():
+        print(f"{seconds:>10.0f}  {us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
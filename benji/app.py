@@ -13,6 +13,7 @@ le `QApplication`.
 from __future__ import annotations
 
 import logging
+import os
 import signal
 import sys
 import threading
@@ -24,7 +25,8 @@ from PyQt6.QtGui import QKeySequence, QShortcut
 from PyQt6.QtWidgets import QApplication
 
 from benji.audio.capture import AudioCapture
-from benji.audio.vad import VADProcessor
+from benji.audio.ring import SampleRing
+from benji.audio.vad import MultiStreamVADProcessor, VADProcessor
 from benji.config import (
     IS_MACOS,
     AudioConfig,
@@ -35,9 +37,12 @@ from benji.config import (
     ensure_secure_backend_url,
 )
 from benji.launch_mode import launch_mode
+from benji.llm.correction_cache import CorrectionCache
 from benji.llm.providers import build_summary_provider
 from benji.llm.summary_worker import SummaryWorker
 from benji.stats import SessionStats
+from benji.stt.cadence import PartialCadence
+from benji.stt.scheduler import TranscribeScheduler
 from benji.stt.transcriber import Transcriber
 from benji.ui.display_bus import DisplayBus
 from benji.ui.history_window import HistoryWindow
@@ -74,8 +79,9 @@ class BenjiApplication:
         self.stats: SessionStats | None = None
         self.session_start = None
 
-        self.audio_queue: Queue | None = None
-        self.transcribe_queue: Queue | None = None
+        self.audio_queue: SampleRing | None = None
+        self.transcribe_queue: TranscribeScheduler | None = None
+        self.cadence: PartialCadence | None = None
         self.display_queue: Queue | None = None
         self.capture: AudioCapture | None = None
         self.vad: VADProcessor | None = None
@@ -173,8 +179,16 @@ class BenjiApplication:
         self.stats = SessionStats()
         self.session_start = self.stats.session_start
 
-        self.audio_queue = Queue(maxsize=100)
-        self.transcribe_queue = Queue(maxsize=3)
+        # Anneau préalloué plutôt qu'une Queue : le callback CoreAudio n'alloue
+        # rien et ne prend aucun verrou (cf. benji/audio/ring.py). Même
+        # profondeur qu'avant : 100 chunks, ~3,2 s d'audio.
+        self.audio_queue = SampleRing(self.cfg.audio.chunk_size, capacity_blocks=100)
+        # Finales prioritaires et jamais perdues, une seule partielle en attente
+        # par source (cf. benji/stt/scheduler.py).
+        self.transcribe_queue = TranscribeScheduler(stats=self.stats)
+        # Intervalle des partielles réglé sur le coût mesuré des passes, partagé
+        # par le VAD (qui le lit) et le Transcriber (qui le nourrit).
+        self.cadence = PartialCadence.from_config(self.cfg.vad, stats=self.stats)
         self.display_queue = Queue(maxsize=10)
 
         # Audio système : le micro alimente le mixeur, qui publie le mélange
@@ -187,12 +201,19 @@ class BenjiApplication:
                 capture_sink = self.mixer.mic_queue
 
         self.capture = AudioCapture(capture_sink, self.cfg.audio, stats=self.stats)
-        if not self.remote_mode:
+        if not self.remote_mode and self.mixer is not None and self.mixer.separate:
+            # Micro et système segmentés chacun de leur côté, un seul Silero
+            # batché pour les deux (cf. MultiStreamVADProcessor).
+            self.vad = MultiStreamVADProcessor(
+                self.audio_queue, self.transcribe_queue, self.cfg.audio, self.cfg.vad,
+                self.display_queue, stats=self.stats, cadence=self.cadence,
+            )
+        elif not self.remote_mode:
             # En mode remote le VAD n'est jamais démarré : inutile de charger
             # le modèle Silero ONNX (fait dans VADProcessor.__init__).
             self.vad = VADProcessor(
                 self.audio_queue, self.transcribe_queue, self.cfg.audio, self.cfg.vad,
-                self.display_queue, stats=self.stats,
+                self.display_queue, stats=self.stats, cadence=self.cadence,
             )
         log.info("Starting...")
 
@@ -228,12 +249,18 @@ class BenjiApplication:
             return
 
         self.system_capture = system
+        # Mode séparé (jamais en remote : le backend attend un flux mono) :
+        # chaque bloc de l'anneau porte les deux flux côte à côte.
+        separate = self.cfg.audio.system_audio_separate and not self.remote_mode
+        if separate:
+            self.audio_queue = SampleRing(2 * self.cfg.audio.chunk_size, capacity_blocks=100)
         self.mixer = AudioMixer(
-            mic_queue=Queue(maxsize=100),
+            mic_queue=SampleRing(self.cfg.audio.chunk_size, capacity_blocks=100),
             audio_queue=self.audio_queue,
             system=system,
             system_gain=self.cfg.audio.system_audio_gain,
             stats=self.stats,
+            separate=separate,
         )
 
     def _create_qapp(self) -> None:
@@ -287,6 +314,8 @@ class BenjiApplication:
         self.transcriber = Transcriber(
             self.transcribe_queue, self.display_queue, self.cfg.stt,
             stats=self.stats, sample_rate=self.cfg.audio.sample_rate,
+            cadence=self.cadence,
+            correction_cache=CorrectionCache.from_config(self.cfg.stt, stats=self.stats),
         )
         splash.set_status("Préchauffage du modèle…")
         self.app.processEvents()
@@ -345,7 +374,7 @@ class BenjiApplication:
         sys.unraisablehook = unraisable_hook
 
     def _build_display(self) -> None:
-        self.bus = DisplayBus(self.display_queue)
+        self.bus = DisplayBus(self.display_queue, stats=self.stats)
         self.bus.start()
 
         # Mode de lancement : CLI overlay-seul vs .app fenêtre principale.
@@ -513,3 +542,12 @@ class BenjiApplication:
             self.stt_supervisor.join(timeout=3)
         if self.remote_thread is not None:
             self.remote_thread.join(timeout=2)
+        # Diagnostic : BENJI_TRACE_FILE=/tmp/benji-trace.json exporte les
+        # dernières traces de latence, à ouvrir dans chrome://tracing ou Perfetto.
+        trace_file = os.environ.get("BENJI_TRACE_FILE")
+        if trace_file and self.stats is not None:
+            try:
+                n = self.stats.export_chrome_trace(trace_file)
+                log.info("%d latency traces written to %s", n, trace_file)
+            except OSError as e:
+                log.warning("Latency trace export failed: %s", e)
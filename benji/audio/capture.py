@@ -7,6 +7,7 @@ from queue import Queue
 import numpy as np
 import sounddevice as sd
 
+from benji.audio.ring import SampleRing
 from benji.config import AudioConfig
 
 log = logging.getLogger(__name__)
@@ -19,9 +20,12 @@ _DROP_LOG_INTERVAL_S = 5.0
 class AudioCapture:
     """Microphone capture with automatic reconnection on device changes."""
 
-    def __init__(self, audio_queue: Queue, config: AudioConfig = None, stats=None):
+    def __init__(self, audio_queue: Queue | SampleRing, config: AudioConfig = None, stats=None):
         self.config = config or AudioConfig()
         self.audio_queue = audio_queue
+        # A SampleRing copies into its preallocated buffer; a plain Queue keeps a
+        # reference, so the chunk must be copied before PortAudio reuses `indata`.
+        self._copy_chunks = not isinstance(audio_queue, SampleRing)
         self.stats = stats  # benji.stats.SessionStats (optional)
         self.stream: sd.InputStream | None = None
         self._stop = threading.Event()
@@ -36,8 +40,11 @@ class AudioCapture:
         if status:
             # Non-fatal (overflow, underflow); log at most
             log.warning("%s", status)
+        chunk = indata[:, 0]
+        if self._copy_chunks:
+            chunk = chunk.copy()
         try:
-            self.audio_queue.put_nowait(indata[:, 0].copy())
+            self.audio_queue.put_nowait(chunk)
         except queue.Full:
             if self.stats is not None:
                 self.stats.record_drop("audio_queue_full")
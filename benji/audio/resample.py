@@ -0,0 +1,27 @@
+"""Ré-échantillonnage mono vers le 16 kHz du VAD et des moteurs STT.
+
+Module à part pour que les chemins sans carte son (transcription de fichiers,
+cf. `benji/offline.py`) n'importent pas `sounddevice`.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def resample_linear(data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Ré-échantillonnage linéaire mono.
+
+    Suffisant ici : la cible est un VAD et un modèle STT à 16 kHz, pas de l'écoute.
+    Éviter scipy garde la dépendance hors du chemin critique.
+    """
+    if src_rate == dst_rate or len(data) == 0:
+        return data.astype(np.float32, copy=False)
+    ratio = dst_rate / src_rate
+    n_out = int(round(len(data) * ratio))
+    if n_out <= 0:
+        return np.zeros(0, dtype=np.float32)
+    positions = np.linspace(0, len(data) - 1, n_out, dtype=np.float32)
+    return np.interp(positions, np.arange(len(data), dtype=np.float32), data).astype(
+        np.float32
+    )
@@ -0,0 +1,143 @@
+"""Anneau d'échantillons mono-producteur / mono-consommateur entre le callback
+CoreAudio et le VAD.
+
+Une `Queue` imposait au thread temps réel une allocation (`indata[:, 0].copy()`)
+et la prise d'un mutex ~31 fois par seconde : sur une longue réunion, les pauses
+du GC et la contention sur la queue finissaient en débordements du callback.
+Ici tout est préalloué : le producteur copie ses échantillons dans un tampon
+NumPy fixe, le consommateur lit des vues de `block_size` échantillons — sans
+verrou, chaque index n'étant écrit que par un seul des deux threads.
+
+L'anneau imite la face de `Queue` dont se servent ses utilisateurs
+(`put_nowait`, `get`, `get_nowait`, `put(None)` pour la fin de flux) : le
+mixeur et le client STT distant le consomment sans le savoir, et la sémantique
+« queue pleine → `queue.Full`, le chunk est jeté » reste celle d'avant.
+
+Contrat de lecture : une vue rendue par `get()` reste valide **jusqu'au
+prochain `get()`** — c'est à ce moment seulement que son emplacement est rendu
+au producteur. Le consommateur qui veut garder l'audio plus longtemps copie.
+
+Chaque bloc est daté : après un `get()`, `last_index` et `last_stamp` donnent
+l'indice de son premier échantillon dans le flux et l'instant (`time.monotonic`)
+où il a été capturé — le point de départ du traçage de latence par étage
+(cf. `SessionStats.record_trace`).
+"""
+
+from __future__ import annotations
+
+import queue
+import time
+
+import numpy as np
+
+# Attente du consommateur quand aucun bloc n'est prêt. Réveiller le lecteur
+# depuis le callback demanderait un Event, donc un verrou côté temps réel : on
+# préfère un sondage court, ~1/8 de la durée d'un bloc de 512 à 16 kHz.
+_POLL_S = 0.004
+
+
+class SampleRing:
+    """Tampon circulaire float32 préalloué, lu par blocs fixes."""
+
+    def __init__(self, block_size: int = 512, capacity_blocks: int = 100):
+        if block_size <= 0 or capacity_blocks <= 0:
+            raise ValueError("block_size et capacity_blocks doivent être positifs")
+        self.block_size = block_size
+        # Capacité multiple du bloc : une lecture ne chevauche jamais la fin du
+        # tampon, chaque bloc rendu est donc une vue contiguë.
+        self._capacity = block_size * capacity_blocks
+        self._buf = np.zeros(self._capacity, dtype=np.float32)
+        # Compteurs monotones d'échantillons. `_write` n'est écrit que par le
+        # producteur, `_read` et `_held` que par le consommateur.
+        self._write = 0
+        self._read = 0
+        self._held = 0  # taille du bloc prêté au consommateur, pas encore rendu
+        self._closed = False
+        # Instant de capture de chaque bloc, indexé comme les blocs du tampon.
+        self._stamps = np.zeros(capacity_blocks, dtype=np.float64)
+        self.last_index = 0
+        self.last_stamp = 0.0
+
+    # --- producteur (thread temps réel) ---
+
+    def put_nowait(self, samples: np.ndarray, stamp: float | None = None) -> None:
+        """Copie *samples* dans l'anneau, ou lève `queue.Full` sans rien écrire.
+
+        Le bloc est jeté en entier plutôt que tronqué : un trou net dans le
+        flux est plus sain pour le VAD qu'un chunk amputé. *stamp* = instant de
+        capture quand il précède l'écriture (le mixeur relaie celui du micro) ;
+        par défaut, maintenant.
+        """
+        n = len(samples)
+        write = self._write
+        if n > self._capacity - (write - self._read):
+            raise queue.Full
+        start = write % self._capacity
+        end = start + n
+        if end <= self._capacity:
+            self._buf[start:end] = samples
+        else:
+            split = self._capacity - start
+            self._buf[start:] = samples[:split]
+            self._buf[: end - self._capacity] = samples[split:]
+        # Date les blocs que cette écriture complète (en pratique : un seul).
+        if stamp is None:
+            stamp = time.monotonic()
+        blocks = len(self._stamps)
+        for b in range(write // self.block_size, (write + n) // self.block_size):
+            self._stamps[b % blocks] = stamp
+        # Publication en dernier : le consommateur ne voit les échantillons
+        # qu'une fois entièrement copiés.
+        self._write = write + n
+
+    def put(self, item, block: bool = True, timeout: float | None = None) -> None:
+        """`put(None)` clôt le flux (sentinelle d'arrêt, comme sur une `Queue`).
+
+        Un tableau est écrit comme par `put_nowait` : l'anneau ne fait jamais
+        attendre son producteur.
+        """
+        if item is None:
+            self.close()
+            return
+        self.put_nowait(item)
+
+    def close(self) -> None:
+        """Fin de flux : le consommateur lit les blocs restants, puis None."""
+        self._closed = True
+
+    # --- consommateur ---
+
+    def get(self, block: bool = True, timeout: float | None = None) -> np.ndarray | None:
+        """Rend une vue de `block_size` échantillons, ou None une fois clos.
+
+        Rend d'abord au producteur le bloc prêté lors de l'appel précédent.
+        Lève `queue.Empty` si rien n'arrive avant *timeout* (ou tout de suite
+        avec `block=False`).
+        """
+        if self._held:
+            self._read += self._held
+            self._held = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            read = self._read
+            if self._write - read >= self.block_size:
+                start = read % self._capacity
+                self._held = self.block_size
+                self.last_index = read
+                self.last_stamp = float(self._stamps[(read // self.block_size) % len(self._stamps)])
+                return self._buf[start : start + self.block_size]
+            if self._closed:
+                return None
+            if not block or (deadline is not None and time.monotonic() >= deadline):
+                raise queue.Empty
+            time.sleep(_POLL_S)
+
+    def get_nowait(self) -> np.ndarray | None:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        """Blocs complets en attente (le bloc prêté n'est plus compté)."""
+        return (self._write - self._read - self._held) // self.block_size
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
@@ -28,6 +28,8 @@ from queue import Queue
 import numpy as np
 import sounddevice as sd
 
+from benji.audio.resample import resample_linear as _resample_linear
+
 log = logging.getLogger(__name__)
 
 # Tampon système, en secondes. Assez grand pour absorber une hoquet de
@@ -104,24 +106,6 @@ class _Ring:
             return self._available
 
 
-def _resample_linear(data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
-    """Ré-échantillonnage linéaire mono.
-
-    Suffisant ici : la cible est un VAD et un modèle STT à 16 kHz, pas de l'écoute.
-    Éviter scipy garde la dépendance hors du chemin critique.
-    """
-    if src_rate == dst_rate or len(data) == 0:
-        return data.astype(np.float32, copy=False)
-    ratio = dst_rate / src_rate
-    n_out = int(round(len(data) * ratio))
-    if n_out <= 0:
-        return np.zeros(0, dtype=np.float32)
-    positions = np.linspace(0, len(data) - 1, n_out, dtype=np.float32)
-    return np.interp(positions, np.arange(len(data), dtype=np.float32), data).astype(
-        np.float32
-    )
-
-
 class SystemAudioCapture:
     """Lit un périphérique de boucle et empile du mono 16 kHz dans un anneau."""
 
@@ -228,12 +212,19 @@ class AudioMixer:
         system: SystemAudioCapture,
         system_gain: float = 1.0,
         stats=None,
+        separate: bool = False,
     ):
         self.mic_queue = mic_queue
         self.audio_queue = audio_queue
         self.system = system
         self.system_gain = system_gain
         self.stats = stats
+        # Mode séparé : au lieu de la somme, on publie [micro | système] côte à
+        # côte dans un même bloc, pour un VAD multi-flux
+        # (cf. MultiStreamVADProcessor). Le tampon est réutilisé d'un chunk à
+        # l'autre : l'anneau de sortie en fait sa propre copie.
+        self.separate = separate
+        self._pair: np.ndarray | None = None
         self._stop = threading.Event()
         self._thread: threading.Thread | None = None
         self._last_drop_log = 0.0
@@ -249,15 +240,33 @@ class AudioMixer:
         mixed = mic_chunk + sys_chunk * self.system_gain
         return np.clip(mixed, -1.0, 1.0, out=mixed)
 
+    def pair_chunk(self, mic_chunk: np.ndarray) -> np.ndarray:
+        """Bloc `[micro | système]` aligné sur le chunk micro, sans sommation."""
+        n = len(mic_chunk)
+        if self._pair is None or len(self._pair) != 2 * n:
+            self._pair = np.zeros(2 * n, dtype=np.float32)
+        self._pair[:n] = mic_chunk
+        self._pair[n:] = self.system.ring.read(n)
+        self._pair[n:] *= self.system_gain
+        np.clip(self._pair[n:], -1.0, 1.0, out=self._pair[n:])
+        return self._pair
+
     def _loop(self) -> None:
         while not self._stop.is_set():
             try:
                 mic_chunk = self.mic_queue.get(timeout=0.2)
             except queue.Empty:
                 continue
-            mixed = self.mix_chunk(np.asarray(mic_chunk, dtype=np.float32))
+            mic_chunk = np.asarray(mic_chunk, dtype=np.float32)
+            # Instant de capture du micro, relayé pour que le traçage de latence
+            # parte de la capture et non de la sortie du mixeur.
+            stamp = getattr(self.mic_queue, "last_stamp", None)
+            mixed = self.pair_chunk(mic_chunk) if self.separate else self.mix_chunk(mic_chunk)
             try:
-                self.audio_queue.put_nowait(mixed)
+                if stamp is None:
+                    self.audio_queue.put_nowait(mixed)
+                else:
+                    self.audio_queue.put_nowait(mixed, stamp)
             except queue.Full:
                 if self.stats is not None:
                     self.stats.record_drop("audio_queue_full")
@@ -1,6 +1,7 @@
 import hashlib
 import logging
 import os
+import time
 from collections import deque
 from queue import Full, Queue
 
@@ -17,29 +18,103 @@ _ALLOWED_HOSTS = {"github.com", "raw.githubusercontent.com", "objects.githubuser
 _MAX_REDIRECTS = 3
 
 
+_CONTEXT = 64  # samples of left context Silero expects at 16 kHz
+_CHUNK = 512  # samples per call at 16 kHz
+
+
+def _silero_session(model_path: str) -> ort.InferenceSession:
+    opts = ort.SessionOptions()
+    # Single thread for minimal latency (VAD is very fast ~1-2ms)
+    opts.inter_op_num_threads = 1
+    opts.intra_op_num_threads = 1
+    # Note: graph optimization disabled - incompatible with Silero VAD LSTM layers
+    return ort.InferenceSession(model_path, sess_options=opts)
+
+
+def _io_binding(session, inputs: dict, outputs: dict):
+    """Prebuilt binding over preallocated CPU arrays (read/written in place)."""
+    b = session.io_binding()
+    for name, arr in inputs.items():
+        b.bind_input(name, "cpu", 0, arr.dtype, list(arr.shape), arr.ctypes.data)
+    for name, arr in outputs.items():
+        b.bind_output(name, "cpu", 0, arr.dtype, list(arr.shape), arr.ctypes.data)
+    return b
+
+
 class SileroVADOnnx:
-    """Silero VAD using ONNX runtime (no PyTorch dependency)."""
-
-    def __init__(self, model_path: str):
-        opts = ort.SessionOptions()
-        # Single thread for minimal latency (VAD is very fast ~1-2ms)
-        opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
-        # Note: graph optimization disabled - incompatible with Silero VAD LSTM layers
-        self.session = ort.InferenceSession(model_path, sess_options=opts)
-        self._state = np.zeros((2, 1, 128), dtype=np.float32)
-        self._context = np.zeros(64, dtype=np.float32)  # 64 samples context for 16kHz
+    """Silero VAD using ONNX runtime (no PyTorch dependency).
+
+    With `io_binding` (default) every buffer is allocated once: the chunk is
+    written in place after its 64-sample context, and ORT reads inputs from and
+    writes outputs into preallocated arrays through two prebuilt IO bindings
+    that ping-pong the LSTM state. The per-call path then allocates nothing on
+    the Python side — this is the hottest loop of the local pipeline. The plain
+    `session.run` path is kept as a fallback (and as the benchmark baseline).
+    """
+
+    def __init__(self, model_path: str, io_binding: bool = True):
+        self.session = _silero_session(model_path)
         self._sr = np.array(16000, dtype=np.int64)
+        self._bindings = None
+        if io_binding:
+            try:
+                self._init_bindings()
+            except Exception as e:
+                log.warning("ONNX IO binding unavailable, using session.run: %s", e)
+                self._bindings = None
+        if self._bindings is None:
+            self._state = np.zeros((2, 1, 128), dtype=np.float32)
+            self._context = np.zeros(_CONTEXT, dtype=np.float32)
+
+    def _init_bindings(self) -> None:
+        self._input = np.zeros((1, _CONTEXT + _CHUNK), dtype=np.float32)
+        self._context = self._input[0, :_CONTEXT]
+        self._states = (
+            np.zeros((2, 1, 128), dtype=np.float32),
+            np.zeros((2, 1, 128), dtype=np.float32),
+        )
+        self._out = np.zeros((1, 1), dtype=np.float32)
+        self._bindings = [
+            _io_binding(
+                self.session,
+                {"input": self._input, "state": src, "sr": self._sr},
+                {"output": self._out, "stateN": dst},
+            )
+            for src, dst in (self._states, self._states[::-1])
+        ]
+        self._flip = 0
+        self._state = self._states[0]
 
     def reset_state(self):
-        self._state = np.zeros((2, 1, 128), dtype=np.float32)
-        self._context = np.zeros(64, dtype=np.float32)
+        if self._bindings is None:
+            self._state = np.zeros((2, 1, 128), dtype=np.float32)
+            self._context = np.zeros(_CONTEXT, dtype=np.float32)
+        else:
+            # In place: the bindings hold pointers to these buffers.
+            self._state.fill(0.0)
+            self._context.fill(0.0)
+
+    def skip(self, audio_chunk: np.ndarray) -> None:
+        """Account for a chunk the caller decided not to run through the model.
+
+        The LSTM state is reset (what a stretch of digital silence converges to
+        anyway) and the context takes the chunk's tail, so the next real call
+        sees the samples that actually preceded it.
+        """
+        if self._bindings is None:
+            self._state = np.zeros((2, 1, 128), dtype=np.float32)
+            self._context = audio_chunk[-_CONTEXT:].copy()
+        else:
+            self._state.fill(0.0)
+            self._context[:] = audio_chunk[-_CONTEXT:]
 
     def __call__(self, audio_chunk: np.ndarray) -> float:
+        if self._bindings is not None:
+            return self._call_bound(audio_chunk)
         # Prepend context to audio chunk
         audio_with_context = np.concatenate([self._context, audio_chunk])
-        # Update context for next call
-        self._context = audio_chunk[-64:]
+        # Update context for next call (copy: the chunk may be a ring view)
+        self._context = audio_chunk[-_CONTEXT:].copy()
         # Run inference
         ort_inputs = {
             "input": audio_with_context[np.newaxis, :].astype(np.float32),
@@ -50,6 +125,90 @@ class SileroVADOnnx:
         self._state = new_state
         return float(out[0][0])
 
+    def _call_bound(self, audio_chunk: np.ndarray) -> float:
+        if len(audio_chunk) != _CHUNK:
+            raise ValueError(f"Silero expects {_CHUNK}-sample chunks, got {len(audio_chunk)}")
+        self._input[0, _CONTEXT:] = audio_chunk
+        self.session.run_with_iobinding(self._bindings[self._flip])
+        # stateN was written into the other buffer: it is the next call's input.
+        self._flip ^= 1
+        self._state = self._states[self._flip]
+        self._context[:] = self._input[0, -_CONTEXT:]
+        return float(self._out[0, 0])
+
+
+class SileroVADBatch:
+    """One Silero session scoring N aligned streams per call (batch dim B=N).
+
+    The model is stateful per row — state is shaped `(2, B, 128)` — so each
+    stream keeps its own LSTM history while the N streams share a single
+    `run`: per-stream segmentation costs about one ONNX call, not N. Buffers
+    and IO bindings are preallocated as in `SileroVADOnnx`.
+    """
+
+    def __init__(self, model_path: str, streams: int):
+        self.streams = streams
+        self.session = _silero_session(model_path)
+        self._sr = np.array(16000, dtype=np.int64)
+        self._input = np.zeros((streams, _CONTEXT + _CHUNK), dtype=np.float32)
+        self._context = self._input[:, :_CONTEXT]
+        self._states = (
+            np.zeros((2, streams, 128), dtype=np.float32),
+            np.zeros((2, streams, 128), dtype=np.float32),
+        )
+        self._out = np.zeros((streams, 1), dtype=np.float32)
+        self._bindings = [
+            _io_binding(
+                self.session,
+                {"input": self._input, "state": src, "sr": self._sr},
+                {"output": self._out, "stateN": dst},
+            )
+            for src, dst in (self._states, self._states[::-1])
+        ]
+        self._flip = 0
+
+    @property
+    def _state(self) -> np.ndarray:
+        return self._states[self._flip]
+
+    def __call__(self, chunks: np.ndarray) -> np.ndarray:
+        """Confidences for a `(streams, 512)` block, one per row (a view)."""
+        self._input[:, _CONTEXT:] = chunks
+        self.session.run_with_iobinding(self._bindings[self._flip])
+        self._flip ^= 1
+        self._context[:] = self._input[:, -_CONTEXT:]
+        return self._out[:, 0]
+
+    def reset_state(self, stream: int) -> None:
+        self._state[:, stream].fill(0.0)
+        self._context[stream].fill(0.0)
+
+    def skip(self, stream: int, audio_chunk: np.ndarray) -> None:
+        """Same contract as `SileroVADOnnx.skip`, for one row."""
+        self._state[:, stream].fill(0.0)
+        self._context[stream] = audio_chunk[-_CONTEXT:]
+
+    def slot(self, stream: int) -> "_BatchSlot":
+        return _BatchSlot(self, stream)
+
+
+class _BatchSlot:
+    """One stream's view of a `SileroVADBatch`, for its `VADProcessor`.
+
+    Inference is driven by `MultiStreamVADProcessor` for all rows at once; the
+    segmenter only needs to reset or skip its own row.
+    """
+
+    def __init__(self, batch: SileroVADBatch, stream: int):
+        self._batch = batch
+        self._stream = stream
+
+    def reset_state(self) -> None:
+        self._batch.reset_state(self._stream)
+
+    def skip(self, audio_chunk: np.ndarray) -> None:
+        self._batch.skip(self._stream, audio_chunk)
+
 
 def _verify_sha256(path: str, expected: str) -> bool:
     h = hashlib.sha256()
@@ -102,6 +261,163 @@ def _download_model() -> str:
     return model_path
 
 
+class _SegmentBuffer:
+    """Contiguous float32 buffer for the current utterance.
+
+    Appends copy into preallocated storage that doubles when full, so a chunk
+    costs O(chunk) instead of re-concatenating a growing list of chunks on every
+    partial. The buffer is append-only within an utterance, so `snapshot()` can
+    hand the transcriber a zero-copy view: later appends never touch it. Once a
+    snapshot is out, `clear()` switches to fresh storage instead of overwriting
+    audio another thread may still be decoding.
+    """
+
+    def __init__(self, initial_samples: int):
+        self._initial = max(1, initial_samples)
+        self._buf = np.zeros(self._initial, dtype=np.float32)
+        self._len = 0
+        self._shared = False
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, samples: np.ndarray) -> None:
+        n = len(samples)
+        end = self._len + n
+        if end > len(self._buf):
+            grown = np.zeros(max(end, 2 * len(self._buf)), dtype=np.float32)
+            grown[: self._len] = self._buf[: self._len]
+            self._buf = grown
+        self._buf[self._len : end] = samples
+        self._len = end
+
+    def snapshot(self) -> np.ndarray:
+        """Zero-copy view of the samples so far, safe to hand to another thread."""
+        self._shared = True
+        return self._buf[: self._len]
+
+    def clear(self) -> None:
+        if self._shared:
+            self._buf = np.zeros(self._initial, dtype=np.float32)
+            self._shared = False
+        self._len = 0
+
+
+class _PreSpeechRing:
+    """Fixed ring holding the last `capacity` samples heard before speech."""
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._capacity = capacity
+        self._write = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, samples: np.ndarray) -> None:
+        if self._capacity == 0:
+            return
+        if len(samples) >= self._capacity:
+            self._buf[:] = samples[-self._capacity :]
+            self._write = 0
+            self._len = self._capacity
+            return
+        end = self._write + len(samples)
+        if end <= self._capacity:
+            self._buf[self._write : end] = samples
+        else:
+            split = self._capacity - self._write
+            self._buf[self._write :] = samples[:split]
+            self._buf[: end - self._capacity] = samples[split:]
+        self._write = end % self._capacity
+        self._len = min(self._capacity, self._len + len(samples))
+
+    def drain_into(self, target: _SegmentBuffer) -> None:
+        """Append the buffered samples to *target*, oldest first, and empty the ring."""
+        start = (self._write - self._len) % self._capacity if self._capacity else 0
+        end = start + self._len
+        if end <= self._capacity:
+            target.append(self._buf[start:end])
+        else:
+            target.append(self._buf[start:])
+            target.append(self._buf[: end - self._capacity])
+        self.clear()
+
+    def clear(self) -> None:
+        self._write = 0
+        self._len = 0
+
+
+class _RollingQuantile:
+    """Sliding-window quantile of values in [0, 1], O(1) amortized per update.
+
+    Values are counted in fixed bins and the window is a deque of bin indices,
+    so evicting the oldest value is a decrement. A pointer to the bin holding
+    the target rank is nudged on each update instead of re-sorting the window:
+    one add/evict pair moves it by at most a few bins. The result is
+    interpolated within the bin, so the error stays well under one bin width
+    (1/bins) on realistic noise.
+    """
+
+    def __init__(self, window: int, q: float = 0.95, bins: int = 200):
+        self._q = q
+        self._bins = bins
+        self._counts = [0] * bins
+        self._window: deque[int] = deque(maxlen=window)
+        self._k = 0  # bin holding the target rank
+        self._below = 0  # number of values in bins < _k
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def add(self, value: float) -> None:
+        b = min(self._bins - 1, max(0, int(value * self._bins)))
+        if len(self._window) == self._window.maxlen:
+            old = self._window[0]
+            self._counts[old] -= 1
+            if old < self._k:
+                self._below -= 1
+        self._window.append(b)
+        self._counts[b] += 1
+        if b < self._k:
+            self._below += 1
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        rank = int((len(self._window) - 1) * self._q)
+        counts = self._counts
+        while self._below > rank:
+            self._k -= 1
+            self._below -= counts[self._k]
+        while self._below + counts[self._k] <= rank:
+            self._below += counts[self._k]
+            self._k += 1
+
+    def _order_stat(self, k: int, below: int, rank: int) -> float:
+        """Estimate of the rank-th smallest value, known to lie in bin k."""
+        return (k + (rank - below + 0.5) / self._counts[k]) / self._bins
+
+    def value(self) -> float:
+        """Same definition as `np.quantile` (linear between order statistics)."""
+        if not self._window:
+            return 0.0
+        pos = (len(self._window) - 1) * self._q
+        rank = int(pos)
+        lo = self._order_stat(self._k, self._below, rank)
+        frac = pos - rank
+        if frac == 0.0:
+            return lo
+        # The next order statistic is in the same bin or in the next non-empty
+        # one — a short forward scan, only ever past empty bins.
+        k, below = self._k, self._below
+        while below + self._counts[k] <= rank + 1:
+            below += self._counts[k]
+            k += 1
+        hi = self._order_stat(k, below, rank + 1)
+        return lo + frac * (hi - lo)
+
+
 class VADProcessor:
     def __init__(
         self,
@@ -111,6 +427,9 @@ class VADProcessor:
         vad_config: VADConfig = None,
         display_queue: Queue = None,
         stats=None,
+        model=None,
+        source: str | None = None,
+        cadence=None,
     ):
         self.audio_queue = audio_queue
         self.transcribe_queue = transcribe_queue
@@ -119,29 +438,58 @@ class VADProcessor:
         self.config = vad_config or VADConfig()
         self.sample_rate = self.audio_config.sample_rate
         self.stats = stats
-
-        # Load Silero VAD (ONNX)
-        model_path = _download_model()
-        self.model = SileroVADOnnx(model_path)
-        log.info("Silero VAD loaded (ONNX)")
-
-        # State
+        # Stream name carried on every segment when several streams are
+        # segmented side by side (see MultiStreamVADProcessor); None otherwise.
+        self.source = source
+        # PartialCadence: when set, it decides the partial interval from the
+        # measured decode cost instead of partial_interval_ms.
+        self.cadence = cadence
+
+        if model is None:
+            # Load Silero VAD (ONNX)
+            model_path = _download_model()
+            model = SileroVADOnnx(model_path)
+            log.info("Silero VAD loaded (ONNX)")
+        self.model = model
+
+        # State. The segment buffer starts at max_speech_duration_s worth of
+        # samples so a normal utterance never has to grow it.
         self.is_speaking = False
-        self.speech_buffer: list[np.ndarray] = []
+        self.speech_buffer = _SegmentBuffer(
+            int(self.config.max_speech_duration_s * self.sample_rate)
+        )
         self.silence_chunks = 0
-        self.pre_speech_buffer: list[np.ndarray] = []
+        chunk_size = self.audio_config.chunk_size
+        max_pre_chunks = int(
+            self.config.pre_speech_pad_ms / (chunk_size / self.sample_rate * 1000)
+        )
+        self.pre_speech_buffer = _PreSpeechRing(max_pre_chunks * chunk_size)
         self.samples_since_partial = 0
+        # (confidence, rms) of the latest speech chunks, for the smart split.
+        self._split_window = max(0, int(self.config.split_lookback_ms / 1000
+                                        * self.sample_rate / chunk_size))
+        self._chunk_scores: deque[tuple[float, float]] = deque(maxlen=self._split_window)
         self._partial_sample_interval = int(
             self.config.partial_interval_ms / 1000 * self.sample_rate
         )
+        # Speculative final (see _speculate): id of the last one sent, and
+        # whether it still covers the buffer (no speech since).
+        self._speculation_id = 0
+        self._speculating = False
 
-        # Adaptive threshold: rolling buffer of VAD confidence on non-speech chunks.
+        # Adaptive threshold: rolling p95 of VAD confidence on non-speech chunks.
         # Effective threshold = max(base, p95(noise) + margin). Robust to a noisy room.
         chunk_ms_est = self.audio_config.chunk_size / self.sample_rate * 1000
         self._noise_window_size = max(
             10, int(self.config.adaptive_window_seconds * 1000 / max(chunk_ms_est, 1))
         )
-        self._noise_confidences: deque[float] = deque(maxlen=self._noise_window_size)
+        self._noise_confidences = _RollingQuantile(self._noise_window_size, q=0.95)
+
+        # Latency tracing: samples seen on this stream, and when the current
+        # chunk was captured / reached the VAD (set by run() via note_capture).
+        self.samples_seen = 0
+        self._chunk_capture: float | None = None
+        self._chunk_in: float | None = None
 
     def _chunk_duration_ms(self, chunk: np.ndarray) -> float:
         return len(chunk) / self.sample_rate * 1000
@@ -156,11 +504,31 @@ class VADProcessor:
         base = self.config.speech_threshold
         if not self.config.adaptive_threshold or len(self._noise_confidences) < 20:
             return base
-        noise_p95 = float(np.quantile(self._noise_confidences, 0.95))
+        noise_p95 = self._noise_confidences.value()
         return max(base, min(0.95, noise_p95 + self.config.adaptive_margin))
 
-    def process_chunk(self, chunk: np.ndarray) -> None:
-        confidence = self.model(chunk)
+    def _is_digital_silence(self, chunk: np.ndarray) -> bool:
+        floor = self.config.digital_silence_floor
+        # max/min instead of np.abs(chunk).max(): no temporary array.
+        return floor > 0.0 and max(chunk.max(), -chunk.min()) < floor
+
+    def note_capture(self, captured_at: float) -> None:
+        """Record when the next chunk was captured; segments then carry a trace."""
+        self._chunk_capture = captured_at
+        self._chunk_in = time.monotonic()
+
+    def process_chunk(self, chunk: np.ndarray, confidence: float | None = None) -> None:
+        """Score *chunk* (unless the caller already did) and advance segmentation."""
+        self.samples_seen += len(chunk)
+        if confidence is None:
+            skipped = self._is_digital_silence(chunk)
+            if skipped:
+                self.model.skip(chunk)
+                confidence = 0.0
+            else:
+                confidence = self.model(chunk)
+            if self.stats is not None:
+                self.stats.record_vad_chunk(skipped)
 
         chunk_ms = self._chunk_duration_ms(chunk)
         threshold = self._effective_threshold()
@@ -168,17 +536,23 @@ class VADProcessor:
         if confidence >= threshold:
             if not self.is_speaking:
                 self.is_speaking = True
-                self.speech_buffer = list(self.pre_speech_buffer)
+                self.speech_buffer.clear()
+                self.pre_speech_buffer.drain_into(self.speech_buffer)
                 self.samples_since_partial = 0
                 log.debug("Speech started")
-                if self.display_queue:
-                    self.display_queue.put({"type": "vad_status", "speaking": True})
+                self._display({"type": "vad_status", "speaking": True})
+            # Chunks read from a SampleRing are views, only valid until the next
+            # read: both buffers copy them into their own storage.
             self.speech_buffer.append(chunk)
+            self._track_chunk(chunk, confidence)
             self.samples_since_partial += len(chunk)
             self.silence_chunks = 0
+            # Speech resumed: an outstanding speculative final is now stale.
+            self._speculating = False
         else:
             if self.is_speaking:
                 self.speech_buffer.append(chunk)
+                self._track_chunk(chunk, confidence)
                 self.samples_since_partial += len(chunk)
                 self.silence_chunks += 1
                 silence_ms = self.silence_chunks * chunk_ms
@@ -186,19 +560,19 @@ class VADProcessor:
                 if silence_ms >= self.config.silence_duration_ms:
                     self._flush_segment(is_final=True)
                     return
+                spec_ms = self.config.speculative_final_ms
+                if spec_ms > 0 and not self._speculating and silence_ms >= spec_ms:
+                    self._speculate()
             else:
                 # Idle: update noise floor estimate and ring-buffer pre-speech audio.
-                self._noise_confidences.append(confidence)
+                self._noise_confidences.add(confidence)
                 self.pre_speech_buffer.append(chunk)
-                max_pre = int(self.config.pre_speech_pad_ms / chunk_ms)
-                if len(self.pre_speech_buffer) > max_pre:
-                    self.pre_speech_buffer.pop(0)
                 return
 
-        # Force flush long utterances as final
-        total_samples = sum(len(c) for c in self.speech_buffer)
+        # Force flush long utterances as final, at the quietest recent point
+        total_samples = len(self.speech_buffer)
         if total_samples / self.sample_rate >= self.config.max_speech_duration_s:
-            self._flush_segment(is_final=True)
+            self._flush_segment(is_final=True, carry=self._split_carry())
             return
 
         # Incremental partial during ongoing speech. A partial re-transcribes the
@@ -206,44 +580,118 @@ class VADProcessor:
         # segment length. Back off as the buffer grows (the final pass redoes the
         # whole segment anyway); this keeps per-segment partial work ~linear while
         # staying responsive early when perceived latency matters most.
-        if self.config.partial_interval_ms > 0:
-            dynamic_interval = self._partial_sample_interval + int(
+        # A pending speculative final already covers the buffer: a partial
+        # over the same audio plus silence would show nothing new.
+        if self.config.partial_interval_ms > 0 and not self._speculating:
+            base = (self._partial_sample_interval if self.cadence is None
+                    else self.cadence.interval_samples(self.sample_rate))
+            dynamic_interval = base + int(
                 self.config.partial_growth_factor * total_samples
             )
             if self.samples_since_partial >= dynamic_interval:
                 self._emit_partial()
 
+    def _track_chunk(self, chunk: np.ndarray, confidence: float) -> None:
+        if self._split_window:
+            rms = float(np.sqrt(np.dot(chunk, chunk) / max(len(chunk), 1)))
+            self._chunk_scores.append((confidence, rms))
+
+    def _split_carry(self) -> int:
+        """Samples after the best cut point, to carry into the next segment.
+
+        Looks back over the last `split_lookback_ms` of speech and picks the
+        chunk with the lowest VAD confidence + energy (energy normalised to the
+        loudest chunk of the window), then cuts in its middle. 0 = cut at the end.
+        """
+        scores = self._chunk_scores
+        if len(scores) < 2:
+            return 0
+        loudest = max(rms for _, rms in scores) or 1.0
+        quietest = min(range(len(scores)),
+                       key=lambda i: scores[i][0] + scores[i][1] / loudest)
+        chunk_size = self.audio_config.chunk_size
+        carry = (len(scores) - 1 - quietest) * chunk_size + chunk_size // 2
+        return min(carry, len(self.speech_buffer))
+
+    def _segment(self, audio: np.ndarray, is_final: bool, carry: int = 0) -> dict:
+        # End of the last speech chunk: what follows is trailing silence, which
+        # the Transcriber leaves out when matching a final against the last
+        # partial's decode (see Transcriber._cache_key).
+        trailing = 0 if carry else self.silence_chunks * self.audio_config.chunk_size
+        item = {"audio": audio, "is_final": is_final,
+                "speech_end": max(0, len(audio) - trailing)}
+        if self.source is not None:
+            item["source"] = self.source
+        if self._chunk_in is not None:
+            # Timestamps of the newest chunk in the segment; the Transcriber and
+            # the DisplayBus add theirs (see SessionStats.record_trace).
+            item["trace"] = {
+                "kind": "final" if is_final else "partial",
+                "sample": self.samples_seen - carry,
+                "capture": self._chunk_capture,
+                "vad_in": self._chunk_in,
+                "vad_out": time.monotonic(),
+            }
+        return item
+
     def _emit_partial(self):
-        if not self.speech_buffer:
-            return
-        audio = np.concatenate(self.speech_buffer)
         min_samples = int(self.config.min_speech_duration_ms / 1000 * self.sample_rate)
-        if len(audio) < min_samples:
+        if len(self.speech_buffer) == 0 or len(self.speech_buffer) < min_samples:
             return
+        audio = self.speech_buffer.snapshot()
         self.samples_since_partial = 0
         try:
             self.transcribe_queue.put(
-                {"audio": audio, "is_final": False}, block=False
+                self._segment(audio, is_final=False), block=False
             )
         except Full:
             # Transcriber is busy; it'll catch up on next partial or final
             if self.stats is not None:
                 self.stats.record_drop("partial_skipped")
 
-    def _flush_segment(self, is_final: bool = True):
-        audio = np.concatenate(self.speech_buffer) if self.speech_buffer else np.array([], dtype=np.float32)
+    def _speculate(self) -> None:
+        """Send the segment for a final decode before the silence window ends.
+
+        Only trailing silence can be appended until the segment closes, so if
+        no speech comes back the Transcriber reuses this decode for the final
+        (matched by id) instead of starting from scratch at close time.
+        """
+        min_samples = int(self.config.min_speech_duration_ms / 1000 * self.sample_rate)
+        if len(self.speech_buffer) < min_samples:
+            return
+        self._speculation_id += 1
+        item = self._segment(self.speech_buffer.snapshot(), is_final=True)
+        item["speculative"] = True
+        item["speculation"] = self._speculation_id
+        # Set even if the put fails: one attempt per silence. The Transcriber
+        # never saw that id, so the final is simply decoded at close.
+        self._speculating = True
+        try:
+            self.transcribe_queue.put(item, block=False)
+        except Full:
+            if self.stats is not None:
+                self.stats.record_drop("speculation_skipped")
+
+    def _flush_segment(self, is_final: bool = True, carry: int = 0):
+        """Emit the segment. With *carry*, the last `carry` samples stay in the
+        buffer and open the next segment (speech goes on, VAD state is kept)."""
+        full = self.speech_buffer.snapshot()
+        audio = full[: len(full) - carry]
         min_samples = int(self.config.min_speech_duration_ms / 1000 * self.sample_rate)
 
         if len(audio) >= min_samples:
             duration = len(audio) / self.sample_rate
             log.debug("Speech segment: %.1fs (final=%s)", duration, is_final)
-            # Finals must not be dropped silently. Block briefly to let the STT
-            # catch up; if it's still saturated after the timeout, log loudly
-            # and count the drop so a stalled pipeline is visible to the user.
+            # Finals must not be dropped silently. The app's TranscribeScheduler
+            # never refuses one; a bounded Queue gets a brief block to let the
+            # STT catch up, then a loud, counted drop so a stalled pipeline is
+            # visible to the user.
+            item = self._segment(audio, is_final=is_final, carry=carry)
+            if self._speculating and not carry:
+                # Nothing but silence since the speculative final: same speech.
+                item["speculation"] = self._speculation_id
             try:
-                self.transcribe_queue.put(
-                    {"audio": audio, "is_final": is_final}, timeout=2.0
-                )
+                self.transcribe_queue.put(item, timeout=2.0)
             except Full:
                 log.warning(
                     "transcribe_queue full after 2s; dropping final segment (%.1fs). "
@@ -252,25 +700,149 @@ class VADProcessor:
                 )
                 if self.stats is not None:
                     self.stats.record_drop("transcribe_queue_full")
-                if self.display_queue is not None:
-                    # Clear any streamed partial words from the dropped segment.
-                    self.display_queue.put({"type": "final_text", "text": "", "drop": True})
+                # Clear any streamed partial words from the dropped segment.
+                self._display({"type": "final_text", "text": "", "drop": True})
+
+        self._speculating = False
+        self.speech_buffer.clear()
+        if carry:
+            # `full` still holds the old storage: clear() moved to fresh storage
+            # because a snapshot is out.
+            self.speech_buffer.append(full[len(full) - carry :])
+            kept = -(-carry // self.audio_config.chunk_size)
+            tail = list(self._chunk_scores)[-kept:]
+            self._chunk_scores.clear()
+            self._chunk_scores.extend(tail)
+            self.samples_since_partial = carry
+            return
 
-        self.speech_buffer = []
+        self._chunk_scores.clear()
         self.silence_chunks = 0
         self.is_speaking = False
-        self.pre_speech_buffer = []
+        self.pre_speech_buffer.clear()
         self.samples_since_partial = 0
         self.model.reset_state()
 
-        if self.display_queue:
-            self.display_queue.put({"type": "vad_status", "speaking": False})
+        self._display({"type": "vad_status", "speaking": False})
+
+    def _display(self, msg: dict) -> None:
+        """Push *msg* to the UI, tagged with the stream it comes from."""
+        if self.display_queue is None:
+            return
+        if self.source is not None:
+            msg["source"] = self.source
+        self.display_queue.put(msg)
 
     def run(self):
+        # audio_queue is normally a SampleRing: each get() hands out a 512-sample
+        # view and releases the previous one back to the capture callback.
         log.info("Processing started")
         while True:
             chunk = self.audio_queue.get()
             if chunk is None:
                 break
+            self.note_capture(getattr(self.audio_queue, "last_stamp", None) or time.monotonic())
             self.process_chunk(chunk)
         log.info("Processing stopped")
+
+
+class _AnyStreamSpeaking:
+    """`display_queue` shared by the streams of a MultiStreamVADProcessor.
+
+    Each stream reports its own `vad_status`; the UI only learns whether *any*
+    stream is speaking, so the mic going quiet doesn't switch the indicator off
+    while the system stream still talks. Everything else passes through,
+    tagged with its source by the stream.
+    """
+
+    def __init__(self, queue: Queue):
+        self._queue = queue
+        self._speaking: set[str | None] = set()
+
+    def put(self, msg: dict, *args, **kwargs) -> None:
+        if msg.get("type") == "vad_status":
+            source = msg.pop("source", None)
+            was_speaking = bool(self._speaking)
+            if msg["speaking"]:
+                self._speaking.add(source)
+            else:
+                self._speaking.discard(source)
+            if bool(self._speaking) == was_speaking:
+                return
+        self._queue.put(msg, *args, **kwargs)
+
+
+class MultiStreamVADProcessor:
+    """Independent segmentation of N aligned streams with one batched Silero.
+
+    `audio_queue` hands out blocks of `streams × chunk_size` samples, stream
+    after stream (see `AudioMixer` in separate mode). Each block is scored in a
+    single `SileroVADBatch` call, then every row goes through its own
+    `VADProcessor` — own buffers, own noise floor, own endpointing — whose
+    segments carry the stream name as `source`, as do the UI messages. The
+    streams share one speaking indicator: see `_AnyStreamSpeaking`.
+    """
+
+    def __init__(
+        self,
+        audio_queue,
+        transcribe_queue: Queue,
+        audio_config: AudioConfig = None,
+        vad_config: VADConfig = None,
+        display_queue: Queue = None,
+        stats=None,
+        sources: tuple[str, ...] = ("mic", "system"),
+        model: SileroVADBatch | None = None,
+        cadence=None,
+    ):
+        self.audio_queue = audio_queue
+        self.audio_config = audio_config or AudioConfig()
+        self.stats = stats
+        if model is None:
+            model = SileroVADBatch(_download_model(), len(sources))
+            log.info("Silero VAD loaded (ONNX, %d streams batched)", len(sources))
+        self.model = model
+        if display_queue is not None:
+            display_queue = _AnyStreamSpeaking(display_queue)
+        self.streams = [
+            VADProcessor(
+                audio_queue, transcribe_queue, self.audio_config, vad_config,
+                display_queue, stats=stats, model=model.slot(i), source=name,
+                cadence=cadence,
+            )
+            for i, name in enumerate(sources)
+        ]
+
+    def process_block(self, chunks: np.ndarray) -> None:
+        """Score a `(streams, chunk_size)` block and segment each row."""
+        gated = [vad._is_digital_silence(c) for vad, c in zip(self.streams, chunks)]
+        # Inference is only saved when every row is silent: one live row runs
+        # the batch for all of them.
+        skipped = all(gated)
+        if skipped:
+            confidences = [0.0] * len(self.streams)
+        else:
+            confidences = self.model(chunks).tolist()
+        for i, (vad, chunk) in enumerate(zip(self.streams, chunks)):
+            if gated[i]:
+                # The row was scored along with the others; apply the same
+                # reset as a skipped single-stream chunk so the gate behaves
+                # identically either way.
+                self.model.skip(i, chunk)
+                confidences[i] = 0.0
+            if self.stats is not None:
+                self.stats.record_vad_chunk(skipped)
+            vad.process_chunk(chunk, confidence=confidences[i])
+
+    def run(self):
+        log.info("Processing started (%d streams)", len(self.streams))
+        n = len(self.streams)
+        while True:
+            block = self.audio_queue.get()
+            if block is None:
+                break
+            captured_at = getattr(self.audio_queue, "last_stamp", None) or time.monotonic()
+            for vad in self.streams:
+                vad.note_capture(captured_at)
+            self.process_block(block.reshape(n, -1))
+        log.info("Processing stopped")
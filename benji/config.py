@@ -25,6 +25,10 @@ class AudioConfig:
     # Gain appliqué au flux système avant sommation. 1.0 convient quand la
     # sortie est à un niveau normal ; baisser si la visio sature le mixage.
     system_audio_gain: float = 1.0
+    # Micro et audio système segmentés séparément par le VAD (un seul appel
+    # Silero batché pour les deux) au lieu d'être additionnés : chaque segment
+    # porte sa source ("mic" / "system"). Sans effet si system_audio est off.
+    system_audio_separate: bool = False
 
 
 @dataclass
@@ -33,8 +37,25 @@ class VADConfig:
     silence_duration_ms: int = 600  # Wait longer before cutting, reduces fragmentation
     min_speech_duration_ms: int = 300  # Keep short interjections ("oui", "ok", "non")
     max_speech_duration_s: float = 8.0  # Force flush sooner for long utterances
+    # Smart split: at max_speech_duration_s, cut at the quietest chunk (lowest VAD
+    # confidence + energy) of the last N ms instead of mid-word; the audio after
+    # the cut opens the next segment. 0 = hard cut at the limit.
+    split_lookback_ms: int = 800
     pre_speech_pad_ms: int = 200  # Less pre-context = smaller audio buffer = faster inference
     partial_interval_ms: int = 400  # Re-transcribe partial audio every N ms (0 = disabled)
+    # Cadence adaptative (cf. benji.stt.cadence) : partial_interval_ms n'est plus
+    # que la valeur de départ, l'intervalle suit ensuite la latence mesurée des
+    # passes pour occuper le thread STT à partial_target_occupancy, dans
+    # [partial_interval_min_ms, partial_interval_max_ms].
+    partial_adaptive: bool = True
+    partial_target_occupancy: float = 0.5
+    partial_interval_min_ms: int = 200
+    partial_interval_max_ms: int = 2000
+    # Speculative final: after this much trailing silence the segment is sent
+    # for a final decode ahead of time; when the segment closes at
+    # silence_duration_ms with no speech in between, that result is reused.
+    # 0 = disabled.
+    speculative_final_ms: int = 150
     # Espacement progressif des passes partielles à mesure que le tampon grandit :
     # intervalle effectif = partial_interval_ms + growth_factor * durée_tampon_ms.
     # Hérité de Whisper, dont une passe sur 8 s coûtait ~800 ms : sans ce frein, le
@@ -48,6 +69,10 @@ class VADConfig:
     adaptive_threshold: bool = True
     adaptive_margin: float = 0.10
     adaptive_window_seconds: float = 5.0  # Rolling window for noise-floor estimation
+    # Pre-gate: a chunk whose peak stays below this floor (digital silence: mic
+    # muted at OS level, silent loopback) gets confidence 0 without running
+    # Silero. 1e-4 ≈ -80 dBFS, far below any real room noise. 0 disables.
+    digital_silence_floor: float = 1e-4
 
 
 @dataclass
@@ -68,15 +93,45 @@ class STTConfig:
     #                final, mais la langue n'est plus garantie.
     final_engine: str = "whisper"
     final_model_size: str = "medium"
+    # Délestage (cf. benji/stt/shedding.py) : quand les finales prennent du
+    # retard, la passe finale descend vers ces tailles de Whisper puis vers
+    # Parakeet, et remonte une fois la file vidée. Sans effet avec "parakeet".
+    final_shedding: bool = True
+    final_shedding_sizes: tuple[str, ...] = ("small",)
     # Langue imposée à la passe finale, et langue du post-traitement (nombres,
     # interjections) et de la correction LLM. None = détection automatique.
     language: str | None = "fr"
+    # Passes partielles en mode « queue seule » : au lieu de re-décoder tout le
+    # tampon, on ne décode qu'à partir de `partial_tail_overlap_s` avant la fin
+    # du dernier mot figé, recollé au préfixe. Travail linéaire au lieu de
+    # quadratique sur un long énoncé ; le modèle perd en revanche le début de
+    # la phrase (cf. benchmarks/bench_partial_tail.py). La passe finale décode
+    # toujours le segment entier.
+    partial_tail_decode: bool = False
+    partial_tail_overlap_s: float = 1.0
     diarization: bool = True  # Enable speaker labeling
     # "pitch" (built-in F0 clustering, no extra deps) or "pyannote" (real embeddings,
     # requires `uv sync --extra diarization` and HF token via env HF_TOKEN).
+    # "pyannote-process" : le même pyannote dans un process à part (cf.
+    # benji/stt/diarization_worker.py) — torch ne dispute plus le GIL à la
+    # boucle STT ; un worker planté est relancé sans emporter l'app.
     diarization_backend: str = "pyannote"
     diarization_max_speakers: int = 4  # Cap for pyannote clustering (pitch is hard-capped at 2)
+    # pyannote : tours de parole à l'intérieur d'un segment (cf.
+    # SlidingWindowDiarizer). Fenêtres de `diarization_window_s` au pas de
+    # `diarization_hop_s`, encodées une fois chacune ; 0 = un seul embedding
+    # et un seul locuteur par segment.
+    diarization_window_s: float = 1.5
+    diarization_hop_s: float = 0.75
     llm_correction: bool = False  # Post-hoc grammar/punctuation fix via MLX-LM
+    # Mémo des corrections (cf. benji/llm/correction_cache.py) : les énoncés
+    # courts et répétés (« Oui. », « D'accord. ») ne repassent plus par le LLM.
+    # Nombre d'entrées (0 = désactivé), longueur maximale d'une phrase mémorisée,
+    # et sauvegarde dans les données utilisateur (0600) pour survivre au
+    # redémarrage.
+    llm_correction_cache: int = 512
+    llm_correction_cache_max_chars: int = 60
+    llm_correction_cache_persist: bool = True
     live_summary_interval_s: int = 0  # 0 = disabled; e.g. 300 = every 5 min
     # Audio gain control before STT: peak-normalize quiet segments to this target.
     # 0.0 disables. Useful for low-gain microphones.
@@ -37,18 +37,30 @@ class TranscriptionHistory:
         # None = jamais compté. Le comptage initial est fait au premier ajout,
         # une seule fois pour la durée du process.
         self._line_count: int | None = None
+        # Caches tirés du contenu des transcriptions (cf. CorrectionCache) :
+        # vidés — fichier compris — dès qu'une partie de l'historique est effacée.
+        self.caches: list = []
 
     # --- écriture ---
 
-    def add(self, text: str, speaker: str | None = None, meeting_id: str | None = None):
-        """Ajoute une transcription (optionnellement taguée d'un locuteur)."""
+    def add(self, text: str, speaker: str | None = None, meeting_id: str | None = None,
+            timestamp: datetime | None = None, voice: int | None = None):
+        """Ajoute une transcription (optionnellement taguée d'un locuteur).
+
+        `timestamp` = instant où la phrase a été dite, quand ce n'est pas
+        maintenant (transcription d'un enregistrement, cf. `benji/offline.py`).
+        `voice` = indice de l'embedding du locuteur (cf. SpeakerClusters), qui
+        permet de ré-étiqueter l'entrée en fin de réunion (cf. `relabel`).
+        """
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": (timestamp or datetime.now()).isoformat(),
             "text": text,
             "meeting": meeting_id or meetings.current_meeting().id,
         }
         if speaker:
             entry["speaker"] = speaker
+        if voice is not None:
+            entry["voice"] = voice
         line = json.dumps(entry, ensure_ascii=False) + "\n"
 
         with self._lock:
@@ -129,10 +141,42 @@ class TranscriptionHistory:
     def has_legacy_entries(self) -> bool:
         return any(not e.get("meeting") for e in self._iter_entries())
 
+    def relabel(self, meeting_id: str, speakers: dict[int, str]) -> int:
+        """Réécrit d'un coup les locuteurs d'une réunion, voix par voix.
+
+        *speakers* associe un indice de voix à son locuteur définitif. Les
+        indices n'ont de sens que pour le process qui les a produits : ils sont
+        retirés des entrées de la réunion une fois celle-ci ré-étiquetée.
+        Rend le nombre d'entrées dont le locuteur a changé.
+        """
+        with self._lock:
+            entries = list(self._iter_entries())
+            touched = changed = 0
+            for entry in entries:
+                if entry.get("meeting") != meeting_id or "voice" not in entry:
+                    continue
+                touched += 1
+                speaker = speakers.get(entry.pop("voice"))
+                if speaker is not None and speaker != entry.get("speaker"):
+                    entry["speaker"] = speaker
+                    changed += 1
+            if not touched:
+                return 0
+            tmp = self.history_file.with_suffix(".jsonl.tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.history_file)
+            self._line_count = len(entries)
+            return changed
+
     # --- suppression ---
 
     def clear(self, meeting_id: str | None = None):
         """Efface tout l'historique, ou seulement celui d'une réunion."""
+        for cache in self.caches:
+            cache.clear()
         with self._lock:
             if meeting_id is None:
                 if self.history_file.exists():
@@ -0,0 +1,179 @@
+"""Mémo des corrections LLM pour les énoncés courts et répétés.
+
+Une réunion est pleine de « Oui. », « D'accord. », « Ok, merci. » : chacun
+coûtait un appel complet au modèle de correction, pour une réponse toujours la
+même. `CorrectionCache` se place devant `corrector.correct_batch` : une phrase
+déjà corrigée (même texte normalisé, même langue) ressort du cache sans passer
+par le LLM, qui reste libre pour les phrases longues.
+
+- **Borné** — LRU de `max_entries` entrées ; la moins récemment servie sort.
+- **Court seulement** — au-delà de `max_chars`, une phrase ne se répète
+  quasiment jamais : la garder ne ferait que chasser les vraies répétitions et,
+  persistée, recopier le contenu des réunions sur le disque.
+- **Persistant, en option** — un JSON en 0600 dès l'`os.open` (comme
+  l'historique, cf. `benji/history.py`), réécrit de façon atomique après
+  chaque lot qui a appris quelque chose (cf. `Transcriber._corrector_loop`) ;
+  le cache survit ainsi aux redémarrages. Fichier illisible : on repart à vide.
+  Il recopie des bouts de transcription : effacer l'historique l'efface aussi
+  (cf. `TranscriptionHistory.caches`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from benji.config import STTConfig
+
+log = logging.getLogger(__name__)
+
+_FILE_NAME = "corrections.json"
+
+
+def normalize(text: str) -> str:
+    """Clé d'une phrase : casse, espaces et point final effacés.
+
+    Seul le point final est neutre (« oui » et « Oui. » ne font qu'une entrée) :
+    « ? », « ! » et « … » changent le sens — « Oui ? » n'est pas « Oui. » — et
+    restent dans la clé, comme « ... ».
+    """
+    text = " ".join(unicodedata.normalize("NFC", text).casefold().split())
+    if text.endswith(".") and not text.endswith(".."):
+        text = text[:-1].rstrip()
+    return text
+
+
+class CorrectionCache:
+    def __init__(self, max_entries: int = 512, max_chars: int = 60,
+                 path: Path | None = None, stats=None):
+        if max_entries <= 0:
+            raise ValueError("max_entries doit être positif")
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.path = path
+        self.stats = stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Servi et sauvé par le thread correcteur ; les compteurs sont lus ailleurs.
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str | None, str], str] = OrderedDict()
+        self._dirty = False
+        if path is not None:
+            self._load()
+
+    @classmethod
+    def from_config(cls, config: STTConfig, stats=None, path: Path | None = None
+                    ) -> CorrectionCache | None:
+        """Cache réglé par *config* ; None sans correction LLM ou cache coupé."""
+        if not config.llm_correction or config.llm_correction_cache <= 0:
+            return None
+        if path is None and config.llm_correction_cache_persist:
+            from benji.paths import user_path
+
+            path = user_path(_FILE_NAME)
+        return cls(config.llm_correction_cache, config.llm_correction_cache_max_chars,
+                   path=path, stats=stats)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        looked_up = self.hits + self.misses
+        return self.hits / looked_up if looked_up else 0.0
+
+    def _key(self, text: str, language: str | None) -> tuple[str | None, str] | None:
+        key = normalize(text)
+        if not key or len(key) > self.max_chars:
+            return None
+        return language, key
+
+    def get(self, text: str, language: str | None) -> str | None:
+        """Correction mémorisée pour *text*, ou None. Une phrase trop longue
+        pour le cache n'est pas comptée comme un échec."""
+        key = self._key(text, language)
+        if key is None:
+            return None
+        with self._lock:
+            corrected = self._entries.get(key)
+            if corrected is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if self.stats is not None:
+            self.stats.record_correction_cache(hit=corrected is not None)
+        return corrected
+
+    def put(self, text: str, language: str | None, corrected: str) -> None:
+        key = self._key(text, language)
+        if key is None:
+            return
+        with self._lock:
+            if self._entries.get(key) == corrected:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = corrected
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Vide le cache et efface son fichier (historique effacé)."""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = False
+            if self.path is not None:
+                try:
+                    self.path.unlink(missing_ok=True)
+                except OSError as e:
+                    log.warning("Cache de corrections non effacé (%s)", e)
+
+    # --- persistance ---
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                rows = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.warning("Cache de corrections illisible (%s) — repart à vide", e)
+            return
+        if not isinstance(rows, list):
+            return
+        # Du moins au plus récemment servi : l'ordre LRU est conservé.
+        for row in rows[-self.max_entries:]:
+            try:
+                language, key, corrected = row
+            except (TypeError, ValueError):
+                continue
+            if (isinstance(key, str) and isinstance(corrected, str)
+                    and (language is None or isinstance(language, str))):
+                self._entries[(language, key)] = corrected
+
+    def save(self) -> None:
+        """Écrit le cache sur disque s'il a changé ; sans effet sans fichier."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            rows = [[lang, key, corrected] for (lang, key), corrected in self._entries.items()]
+            self._dirty = False
+        tmp = self.path.with_suffix(".json.tmp")
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning("Cache de corrections non sauvegardé (%s)", e)
@@ -1,8 +1,9 @@
 """Post-hoc text correction via MLX-LM (punctuation, grammar).
 
 Loads the model lazily on first call. Falls back to returning the input
-text unchanged on any error. Runs synchronously in the transcriber thread,
-so keep the model small (~1B params) to stay under ~500ms per segment.
+text unchanged on any error. Runs in the transcriber's corrector thread,
+which hands over every final waiting at once (see `correct_batch`); keep
+the model small (~1B params) to stay under ~500ms per segment.
 """
 
 from __future__ import annotations
@@ -46,36 +47,148 @@ def _ensure_loaded() -> bool:
             return False
 
 
-def correct(text: str, language: str | None = "fr") -> str:
-    """Return a lightly corrected version of *text*, or *text* unchanged on error."""
-    if not text or len(text.strip()) < 3:
-        return text
-    if not _ensure_loaded():
+def _messages(text: str, language: str | None) -> list[dict]:
+    lang = "français" if language in (None, "fr") else language
+    return [
+        {
+            "role": "system",
+            "content": (
+                f"Tu corriges des transcriptions vocales en {lang}. "
+                "Corrige UNIQUEMENT la ponctuation, les majuscules et les fautes "
+                "d'accord évidentes. Ne reformule JAMAIS. Réponds avec le texte corrigé seul, sans commentaire."
+            ),
+        },
+        {"role": "user", "content": text},
+    ]
+
+
+def _tokens(text: str, language: str | None) -> list[int]:
+    return list(_tokenizer.apply_chat_template(
+        _messages(text, language), tokenize=True, add_generation_prompt=True
+    ))
+
+
+def _accept(text: str, output: str) -> str:
+    corrected = output.strip().strip('"').strip()
+    # Safety: reject if the model invented a much longer response
+    if not corrected or len(corrected) > 2 * len(text) + 40:
         return text
+    return corrected
+
+
+# Consigne déjà encodée : (modèle, langue, tokens du préfixe, cache KV). Le
+# prompt de chaque segment commence par les mêmes tokens (gabarit de chat +
+# consigne) ; on les pré-remplit une fois, et chaque génération ne paie plus
+# que la phrase. Propre au thread du correcteur, seul à s'en servir.
+_prefix: tuple[int, str | None, list[int], list] | None = None
+
+
+def _prefill(tokens: list[int], cache: list) -> None:
+    import mlx.core as mx
+
+    _model(mx.array(tokens)[None], cache=cache)
+    mx.eval([c.state for c in cache])
+
+
+def _prefix_cache(language: str | None) -> tuple[list[int], list] | None:
+    """Préfixe partagé et son cache KV, construits au premier appel par langue ;
+    None si le modèle n'a pas de cache rognable."""
+    global _prefix
+    if _prefix is not None and _prefix[:2] == (id(_model), language):
+        return _prefix[2], _prefix[3]
+    from mlx_lm.models.cache import can_trim_prompt_cache, make_prompt_cache
+
+    # Le préfixe commun à deux prompts quelconques est exactement la partie
+    # partagée, quel que soit le gabarit du modèle.
+    a, b = _tokens("a", language), _tokens("b", language)
+    n = 0
+    while n < min(len(a), len(b)) and a[n] == b[n]:
+        n += 1
+    cache = make_prompt_cache(_model)
+    if n == 0 or not can_trim_prompt_cache(cache):
+        return None
+    _prefill(a[:n], cache)
+    _prefix = (id(_model), language, a[:n], cache)
+    return a[:n], cache
+
+
+def _generate_one(text: str, language: str | None) -> str:
+    from mlx_lm import generate
+
+    tokens = _tokens(text, language)
+    shared = _prefix_cache(language)
+    if shared is None or tokens[: len(shared[0])] != shared[0]:
+        return generate(_model, _tokenizer, prompt=tokens, max_tokens=len(text) + 50,
+                        verbose=False)
+    prefix, cache = shared
+    from mlx_lm.models.cache import trim_prompt_cache
 
     try:
-        from mlx_lm import generate
-        lang = "français" if language in (None, "fr") else language
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    f"Tu corriges des transcriptions vocales en {lang}. "
-                    "Corrige UNIQUEMENT la ponctuation, les majuscules et les fautes "
-                    "d'accord évidentes. Ne reformule JAMAIS. Réponds avec le texte corrigé seul, sans commentaire."
-                ),
-            },
-            {"role": "user", "content": text},
-        ]
-        prompt = _tokenizer.apply_chat_template(
-            messages, tokenize=False, add_generation_prompt=True
-        )
-        output = generate(_model, _tokenizer, prompt=prompt, max_tokens=len(text) + 50, verbose=False)
-        corrected = output.strip().strip('"').strip()
-        # Safety: reject if the model invented a much longer response
-        if not corrected or len(corrected) > 2 * len(text) + 40:
-            return text
-        return corrected
+        return generate(_model, _tokenizer, prompt=tokens[len(prefix):], prompt_cache=cache,
+                        max_tokens=len(text) + 50, verbose=False)
+    finally:
+        # Retour au seul préfixe pour la phrase suivante.
+        trim_prompt_cache(cache, cache[0].offset - len(prefix))
+
+
+def _remember(cache, text: str, language: str | None, corrected: str) -> None:
+    # Seules les réponses du modèle sont mémorisées : un texte rendu brut
+    # après une erreur resterait sinon figé, redémarrage compris.
+    if cache is not None:
+        cache.put(text, language, corrected)
+
+
+def correct(text: str, language: str | None = "fr", cache=None) -> str:
+    """Return a lightly corrected version of *text*, or *text* unchanged on error."""
+    return correct_batch([text], language, cache=cache)[0]
+
+
+def correct_batch(texts: list[str], language: str | None = "fr", cache=None) -> list[str]:
+    """Corrige *texts* ; rend une correction par texte, dans le même ordre.
+
+    Avec un mlx-lm qui sait générer par lots (`batch_generate`), toutes les
+    phrases sont décodées ensemble : une étape de décodage coûte à peu près
+    autant pour huit séquences que pour une. Sinon elles passent l'une après
+    l'autre, mais la consigne n'est encodée qu'une fois (cf. _prefix_cache).
+    Chaque phrase garde son propre prompt : aucune ne peut récupérer la
+    correction d'une voisine. Erreur ou réponse suspecte : texte brut.
+
+    *cache* (un `CorrectionCache`) sert les phrases déjà corrigées sans passer
+    par le modèle, et mémorise celles que le modèle vient de corriger.
+    """
+    out = list(texts)
+    pending = [i for i, t in enumerate(texts) if t and len(t.strip()) >= 3]
+    if cache is not None:
+        remembered = {i: cache.get(texts[i], language) for i in pending}
+        for i, corrected in remembered.items():
+            if corrected is not None:
+                out[i] = corrected
+        pending = [i for i in pending if remembered[i] is None]
+    if not pending or not _ensure_loaded():
+        return out
+
+    try:
+        import mlx_lm
+
+        batch_generate = getattr(mlx_lm, "batch_generate", None)
+        if batch_generate is not None and len(pending) > 1:
+            response = batch_generate(
+                _model, _tokenizer, [_tokens(texts[i], language) for i in pending],
+                max_tokens=[len(texts[i]) + 50 for i in pending], verbose=False,
+            )
+            for i, output in zip(pending, response.texts):
+                out[i] = _accept(texts[i], output)
+                _remember(cache, texts[i], language, out[i])
+            return out
     except Exception as e:
         log.warning("Skipped: %s", e)
-        return text
+        return out
+
+    for i in pending:
+        try:
+            out[i] = _accept(texts[i], _generate_one(texts[i], language))
+        except Exception as e:
+            log.warning("Skipped: %s", e)
+            continue
+        _remember(cache, texts[i], language, out[i])
+    return out
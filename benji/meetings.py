@@ -19,6 +19,7 @@ import logging
 import os
 import threading
 import uuid
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -165,6 +166,9 @@ class MeetingStore:
 _current_lock = threading.Lock()
 _current: Meeting | None = None
 _store: MeetingStore | None = None
+# Abonnés à la fin d'une réunion (cf. `on_meeting_end`), en références faibles :
+# un Transcriber jeté ne doit pas rester abonné — ni vivant — par ce biais.
+_end_listeners: list[weakref.ref] = []
 
 
 def _store_locked() -> MeetingStore:
@@ -200,24 +204,57 @@ def current_meeting_id() -> str | None:
         return _current.id if _current is not None else None
 
 
+def on_meeting_end(callback) -> None:
+    """Appelle `callback(meeting_id)` à la fin de chaque réunion — nouvelle
+    réunion ou arrêt de l'app —, hors verrou, dans le thread qui la clôt.
+
+    Un callback n'est tenu que par une référence faible (une méthode liée
+    suit la vie de son objet) : l'abonné doit rester vivant par ailleurs.
+    """
+    ref = weakref.WeakMethod(callback) if hasattr(callback, "__func__") else weakref.ref(callback)
+    with _current_lock:
+        _end_listeners.append(ref)
+
+
+def _notify_end(meeting_id: str) -> None:
+    with _current_lock:
+        _end_listeners[:] = [ref for ref in _end_listeners if ref() is not None]
+        callbacks = [ref() for ref in _end_listeners]
+    for callback in callbacks:
+        if callback is None:
+            continue
+        try:
+            callback(meeting_id)
+        except Exception as e:
+            # Un abonné en échec n'empêche ni la clôture ni les autres abonnés.
+            log.warning("Fin de réunion : abonné en échec (%s)", e)
+
+
 def start_meeting(title: str | None = None) -> Meeting:
     """Clôt la réunion courante et en démarre une nouvelle."""
     global _current
     with _current_lock:
         s = _store_locked()
-        if _current is not None:
-            s.end(_current.id)
+        ended = _current.id if _current is not None else None
+        if ended is not None:
+            s.end(ended)
         _current = s.start(title)
-        return _current
+        meeting = _current
+    if ended is not None:
+        _notify_end(ended)
+    return meeting
 
 
 def end_current_meeting() -> None:
     """Horodate la fin de la réunion courante (appelé à l'arrêt de l'app)."""
     global _current
     with _current_lock:
-        if _current is not None:
-            _store_locked().end(_current.id)
+        ended = _current.id if _current is not None else None
+        if ended is not None:
+            _store_locked().end(ended)
             _current = None
+    if ended is not None:
+        _notify_end(ended)
 
 
 def reset_for_tests() -> None:
@@ -226,3 +263,4 @@ def reset_for_tests() -> None:
     with _current_lock:
         _current = None
         _store = None
+        _end_listeners.clear()
@@ -0,0 +1,322 @@
+"""Transcription de fichiers enregistrés, sans micro ni Qt.
+
+    python -m benji.offline reunion.wav [autre.flac ...] [--format md] [--output DIR]
+
+Le fichier est lu par blocs et passe par le même `VADProcessor` et le même
+`Transcriber` que le direct, mais **sans cadence temps réel** : chaque chunk est
+poussé dès que le précédent est traité, chaque final est décodé dès que le VAD
+le ferme. Un enregistrement d'une heure se transcrit donc en une fraction
+d'heure, au rythme des moteurs.
+
+Différences assumées avec le direct :
+
+- ni passes partielles ni finales spéculatives — personne ne les regarde, ce
+  serait du calcul jeté ;
+- pas de correction LLM : elle écrit l'historique depuis son propre thread,
+  hors de l'horodatage rejoué ici ;
+- les entrées d'historique sont horodatées à l'instant où la phrase a été dite
+  dans l'enregistrement (début estimé = date du fichier − durée), pas à
+  l'instant du décodage : l'export SRT garde ainsi les vrais écarts.
+
+Chaque fichier ouvre sa propre réunion, nommée d'après le fichier, puis est
+exporté via `benji.export.render`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+import wave
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from queue import Empty, Queue
+
+import numpy as np
+
+from benji import export, meetings
+from benji.audio.resample import resample_linear
+from benji.config import AudioConfig, STTConfig, VADConfig
+
+log = logging.getLogger(__name__)
+
+# Taille des blocs lus sur disque. Sans effet sur le résultat : le VAD reçoit
+# toujours des chunks de `AudioConfig.chunk_size`.
+_READ_BLOCK_SECONDS = 30.0
+
+
+@dataclass
+class OfflineResult:
+    path: Path
+    meeting_id: str
+    audio_seconds: float
+    elapsed_s: float
+    segments: int
+    export_path: Path | None = None
+
+    @property
+    def rtf(self) -> float:
+        """Facteur temps réel : temps de calcul / durée d'audio (< 1 = plus vite)."""
+        return self.elapsed_s / self.audio_seconds if self.audio_seconds else 0.0
+
+
+class _DiscardQueue:
+    """Puits pour `display_queue` : aucun affichage en mode fichier."""
+
+    def put(self, item, block: bool = True, timeout: float | None = None) -> None:
+        pass
+
+    def put_nowait(self, item) -> None:
+        pass
+
+
+def _read_wav_blocks(path: Path, block_frames: int) -> Iterator[tuple[np.ndarray, int]]:
+    with wave.open(str(path), "rb") as w:
+        rate, channels, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        while frames := w.readframes(block_frames):
+            raw = np.frombuffer(frames, dtype=np.uint8)
+            if width == 1:
+                data = (raw.astype(np.float32) - 128.0) / 128.0
+            elif width == 2:
+                data = raw.view("<i2").astype(np.float32) / 32768.0
+            elif width == 3:
+                b = raw.reshape(-1, 3).astype(np.int32)
+                ints = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8
+                data = ints.astype(np.float32) / 8388608.0
+            elif width == 4:
+                data = raw.view("<i4").astype(np.float32) / 2147483648.0
+            else:
+                raise ValueError(f"WAV {width * 8} bits non supporté : {path}")
+            yield data.reshape(-1, channels).mean(axis=1), rate
+
+
+def _soundfile():
+    try:
+        import soundfile as sf
+    except ImportError:
+        return None
+    return sf
+
+
+def audio_duration(path: Path) -> float:
+    """Durée de *path* en secondes, lue dans l'en-tête sans décoder l'audio."""
+    sf = _soundfile()
+    if sf is not None:
+        info = sf.info(str(path))
+        return info.frames / info.samplerate
+    with wave.open(str(path), "rb") as w:
+        return w.getnframes() / w.getframerate()
+
+
+def read_audio_blocks(path: Path, sample_rate: int = 16000) -> Iterator[np.ndarray]:
+    """Blocs mono float32 à *sample_rate*, lus au fil de l'eau (jamais tout le fichier).
+
+    WAV PCM via la bibliothèque standard ; FLAC, OGG et WAV flottant via
+    `soundfile` s'il est installé.
+    """
+    sf = _soundfile()
+    if sf is not None:
+        rate = sf.info(str(path)).samplerate
+        blocks = (
+            (b.mean(axis=1), rate)
+            for b in sf.blocks(str(path), blocksize=int(_READ_BLOCK_SECONDS * rate),
+                               dtype="float32", always_2d=True)
+        )
+    elif path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as w:
+            rate = w.getframerate()
+        blocks = _read_wav_blocks(path, int(_READ_BLOCK_SECONDS * rate))
+    else:
+        raise RuntimeError(
+            f"{path.suffix} nécessite le paquet soundfile (pip install soundfile) ; "
+            "seul le WAV PCM est lu sans dépendance."
+        )
+    for data, rate in blocks:
+        yield resample_linear(np.ascontiguousarray(data, dtype=np.float32), rate, sample_rate)
+
+
+class _Clock:
+    """Horodatage rejoué : instant de l'enregistrement pour un indice d'échantillon."""
+
+    def __init__(self, started_at: datetime, sample_rate: int):
+        self.started_at = started_at
+        self.sample_rate = sample_rate
+        self.segment_start = 0  # indice du premier échantillon du final en cours
+
+    def now(self) -> datetime:
+        return self.started_at + timedelta(seconds=self.segment_start / self.sample_rate)
+
+
+class _StampedHistory:
+    """Passe-plat vers l'historique qui date chaque entrée selon l'enregistrement."""
+
+    def __init__(self, history, clock: _Clock):
+        self._history = history
+        self._clock = clock
+
+    def add(self, text: str, speaker: str | None = None, meeting_id: str | None = None,
+            voice: int | None = None):
+        self._history.add(text, speaker=speaker, meeting_id=meeting_id,
+                          timestamp=self._clock.now(), voice=voice)
+
+    def __getattr__(self, name):
+        return getattr(self._history, name)
+
+
+def transcribe_file(
+    path: Path,
+    vad,
+    transcriber,
+    *,
+    started_at: datetime | None = None,
+    export_format: str | None = "md",
+    output_dir: Path | None = None,
+) -> OfflineResult:
+    """Transcrit *path* aussi vite que les moteurs le permettent.
+
+    `vad` et `transcriber` sont construits par l'appelant (cf. `build_pipeline`)
+    et réutilisés d'un fichier à l'autre : les modèles ne sont chargés qu'une
+    fois pour tout un lot. `vad.transcribe_queue` doit être une `Queue` non
+    bornée — le VAD ne doit jamais attendre le STT, qui tourne sur ce même thread.
+    """
+    sample_rate = vad.sample_rate
+    chunk_size = vad.audio_config.chunk_size
+    # Lecture, rééchantillonnage et décodage sont tous comptés dans le RTF.
+    t0 = time.monotonic()
+    blocks = _iter_chunks(read_audio_blocks(path, sample_rate), chunk_size)
+    if started_at is None:
+        # Date de fin d'enregistrement ≈ date du fichier : on remonte sa durée,
+        # lue dans l'en-tête — le fichier n'est jamais chargé en entier.
+        started_at = datetime.fromtimestamp(path.stat().st_mtime) - timedelta(
+            seconds=audio_duration(path)
+        )
+
+    clock = _Clock(started_at, sample_rate)
+    history = transcriber.history
+    transcriber.history = _StampedHistory(history, clock)
+    meeting = meetings.start_meeting(path.stem)
+    segments = 0
+    fed = 0
+
+    def drain() -> int:
+        done = 0
+        while True:
+            try:
+                item = vad.transcribe_queue.get_nowait()
+            except Empty:
+                return done
+            if not item["is_final"] or item.get("speculative"):
+                continue
+            # Le final vient d'être fermé : il se termine au dernier échantillon
+            # poussé (silence de fin compris).
+            clock.segment_start = max(0, fed - len(item["audio"]))
+            transcriber._run_segment(item["audio"], True)
+            done += 1
+
+    try:
+        for chunk in blocks:
+            vad.process_chunk(chunk)
+            fed += chunk_size
+            segments += drain()
+        if vad.is_speaking:
+            vad._flush_segment(is_final=True)
+            segments += drain()
+    finally:
+        transcriber.history = history
+        meetings.end_current_meeting()
+    elapsed = time.monotonic() - t0
+
+    result = OfflineResult(path, meeting.id, fed / sample_rate, elapsed, segments)
+    if export_format:
+        entries = history.get_for_meeting(meeting.id)
+        out = (output_dir or path.parent) / f"{path.stem}.{export_format}"
+        # 0600 comme l'historique : c'est le contenu de la réunion.
+        fd = os.open(out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(export.render(entries, export_format))
+        result.export_path = out
+    return result
+
+
+def _iter_chunks(blocks: Iterator[np.ndarray], chunk_size: int) -> Iterator[np.ndarray]:
+    """Redécoupe des blocs de taille quelconque en chunks VAD ; la fin est
+    complétée de silence plutôt que perdue."""
+    pending = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        pending = np.concatenate([pending, block]) if len(pending) else block
+        n = len(pending) // chunk_size * chunk_size
+        for i in range(0, n, chunk_size):
+            yield pending[i : i + chunk_size]
+        pending = pending[n:]
+    if len(pending):
+        tail = np.zeros(chunk_size, dtype=np.float32)
+        tail[: len(pending)] = pending
+        yield tail
+
+
+def build_pipeline(stt_config: STTConfig, stats=None):
+    """VAD + Transcriber réglés pour le mode fichier (sans partielles ni LLM).
+
+    Pas de délestage non plus : rien n'y attend, un fichier peut bien prendre
+    le temps du moteur configuré.
+    """
+    from benji.audio.vad import VADProcessor
+    from benji.stt.transcriber import Transcriber
+
+    audio_cfg = AudioConfig()
+    vad = VADProcessor(
+        Queue(), Queue(), audio_cfg,
+        VADConfig(partial_interval_ms=0, speculative_final_ms=0), stats=stats,
+    )
+    transcriber = Transcriber(
+        vad.transcribe_queue, _DiscardQueue(), replace(stt_config, llm_correction=False, final_shedding=False),
+        stats=stats, sample_rate=audio_cfg.sample_rate,
+    )
+    return vad, transcriber
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benji.offline",
+        description="Transcrit des enregistrements sans cadence temps réel.",
+    )
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--format", choices=export.SUPPORTED_FORMATS, default="md")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="dossier des exports (défaut : à côté de chaque fichier)")
+    parser.add_argument("--language", default=None, help="langue forcée (défaut : fr)")
+    parser.add_argument("--final-engine", choices=("whisper", "parakeet"), default=None)
+    args = parser.parse_args(argv)
+
+    from benji.logging_config import setup_logging
+    from benji.stats import SessionStats
+
+    setup_logging()
+    stt = STTConfig()
+    if args.language:
+        stt.language = args.language
+    if args.final_engine:
+        stt.final_engine = args.final_engine
+    stats = SessionStats()
+    vad, transcriber = build_pipeline(stt, stats=stats)
+
+    failed = 0
+    for path in args.files:
+        try:
+            r = transcribe_file(path, vad, transcriber,
+                                export_format=args.format, output_dir=args.output)
+        except Exception as e:
+            log.error("%s : échec (%s)", path, e)
+            failed += 1
+            continue
+        print(f"{path.name} : {r.audio_seconds:.0f} s d'audio en {r.elapsed_s:.0f} s "
+              f"(RTF {r.rtf:.2f}) · {r.segments} segments → {r.export_path}")
+    print(stats.format_footer())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
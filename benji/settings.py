@@ -49,6 +49,7 @@ PREFS: tuple[PrefSpec, ...] = (
     PrefSpec("system_audio", "audio", "system_audio", bool, restart=True),
     PrefSpec("system_audio_device", "audio", "system_audio_device", str,
              nullable=True, restart=True),
+    PrefSpec("system_audio_separate", "audio", "system_audio_separate", bool, restart=True),
     # --- Affichage (application live) ---
     PrefSpec("font_family", "ui", "font_family", str),
     PrefSpec("font_size", "ui", "font_size", int),
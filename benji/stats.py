@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
+import json
 import math
 import threading
-from collections import Counter, deque
+import time
+from collections import Counter, defaultdict, deque
 from datetime import datetime
+from pathlib import Path
+
+# Stages of a latency trace, in pipeline order: (name, start stamp, end stamp).
+# Stamps are time.monotonic() values set along the way — capture by the
+# SampleRing, vad_* by the VADProcessor, stt_* by the Transcriber, shown by the
+# DisplayBus once the message has been handed to the widgets.
+TRACE_STAGES = (
+    ("audio_queue", "capture", "vad_in"),
+    ("vad", "vad_in", "vad_out"),
+    ("transcribe_queue", "vad_out", "stt_in"),
+    ("decode", "stt_in", "stt_out"),
+    ("display", "stt_out", "shown"),
+    ("total", "capture", "shown"),
+)
 
 
 class SessionStats:
-    def __init__(self, max_latency_samples: int = 500):
+    def __init__(self, max_latency_samples: int = 500, max_traces: int = 2000):
         self.session_start = datetime.now()
+        self._monotonic_start = time.monotonic()
         self._lock = threading.Lock()
         self._segments = 0
         self._audio_seconds = 0.0
@@ -18,6 +35,24 @@ class SessionStats:
         self._partial_latencies_ms: deque[float] = deque(maxlen=max_latency_samples)
         self._partial_count = 0
         self._drops: Counter[str] = Counter()
+        self._vad_chunks = 0
+        self._vad_skipped = 0
+        self._speculation_hits = 0
+        self._speculation_misses = 0
+        self._decode_cache_hits = 0
+        self._decode_cache_misses = 0
+        self._partial_interval_ms: float | None = None
+        self._partial_rtf: float | None = None
+        self._final_engine: str | None = None
+        self._final_engine_changes = 0
+        self._correction_cache_hits = 0
+        self._correction_cache_misses = 0
+        self._max_latency_samples = max_latency_samples
+        # (kind, stage) -> recent durations; kind is "partial" or "final".
+        self._stage_ms: defaultdict[tuple[str, str], deque[float]] = defaultdict(
+            lambda: deque(maxlen=self._max_latency_samples)
+        )
+        self._traces: deque[dict] = deque(maxlen=max_traces)
 
     def record_drop(self, reason: str) -> None:
         """Count an event where audio (or a transcription) was lost.
@@ -29,6 +64,54 @@ class SessionStats:
         with self._lock:
             self._drops[reason] += 1
 
+    def record_vad_chunk(self, skipped: bool) -> None:
+        """Count a chunk seen by the VAD; `skipped` = gated as digital silence,
+        no ONNX inference run."""
+        with self._lock:
+            self._vad_chunks += 1
+            if skipped:
+                self._vad_skipped += 1
+
+    def record_speculation(self, hit: bool) -> None:
+        """Count a speculative final: `hit` = reused as the final, else wasted
+        because speech resumed."""
+        with self._lock:
+            if hit:
+                self._speculation_hits += 1
+            else:
+                self._speculation_misses += 1
+
+    def record_decode_cache(self, hit: bool) -> None:
+        """Count a final that could reuse the last partial's decode: `hit` =
+        same speech, backend skipped."""
+        with self._lock:
+            if hit:
+                self._decode_cache_hits += 1
+            else:
+                self._decode_cache_misses += 1
+
+    def record_partial_cadence(self, interval_ms: float, rtf: float | None) -> None:
+        """Latest partial interval chosen by the PartialCadence controller, and
+        the rolling real-time factor of partial passes it was derived from."""
+        with self._lock:
+            self._partial_interval_ms = interval_ms
+            self._partial_rtf = rtf
+
+    def record_final_engine(self, label: str) -> None:
+        """The load shedder moved the final pass to engine *label*."""
+        with self._lock:
+            self._final_engine = label
+            self._final_engine_changes += 1
+
+    def record_correction_cache(self, hit: bool) -> None:
+        """Count a short final looked up in the CorrectionCache: `hit` = its
+        correction was remembered, LLM skipped."""
+        with self._lock:
+            if hit:
+                self._correction_cache_hits += 1
+            else:
+                self._correction_cache_misses += 1
+
     def record_segment(
         self,
         audio_seconds: float,
@@ -44,16 +127,76 @@ class SessionStats:
                 self._partial_count += 1
                 self._partial_latencies_ms.append(latency_ms)
 
+    def record_stage(self, kind: str, stage: str, ms: float) -> None:
+        """File one duration for *stage* of a *kind* ("partial", "final", ...)
+        segment; reported with the trace stages in snapshot()["stages"]."""
+        with self._lock:
+            self._stage_ms[(kind, stage)].append(ms)
+
+    def record_trace(self, trace: dict, shown: float | None = None) -> None:
+        """Close a segment's latency trace and file its per-stage durations.
+
+        Called when the message carrying *trace* has reached the screen. A stage
+        whose stamps are missing (e.g. a segment fed without a capture time) is
+        simply not recorded.
+        """
+        trace["shown"] = time.monotonic() if shown is None else shown
+        kind = trace.get("kind", "final")
+        with self._lock:
+            for stage, start, end in TRACE_STAGES:
+                if trace.get(start) is not None and trace.get(end) is not None:
+                    self._stage_ms[(kind, stage)].append((trace[end] - trace[start]) * 1000)
+            self._traces.append(trace)
+
+    def export_chrome_trace(self, path: Path) -> int:
+        """Write the recent traces as Chrome trace-event JSON (chrome://tracing,
+        Perfetto). One row per stage, one slice per segment. Returns the number
+        of traces written."""
+        with self._lock:
+            traces = list(self._traces)
+        events = []
+        rows = [stage for stage, _, _ in TRACE_STAGES if stage != "total"]
+        for tid, stage in enumerate(rows):
+            events.append({"ph": "M", "name": "thread_name", "pid": 1, "tid": tid,
+                           "args": {"name": stage}})
+        for trace in traces:
+            for tid, (stage, start, end) in enumerate(TRACE_STAGES[: len(rows)]):
+                if trace.get(start) is None or trace.get(end) is None:
+                    continue
+                events.append({
+                    "ph": "X", "name": trace.get("kind", "final"), "cat": stage,
+                    "pid": 1, "tid": tid,
+                    "ts": (trace[start] - self._monotonic_start) * 1e6,
+                    "dur": (trace[end] - trace[start]) * 1e6,
+                    "args": {"sample": trace.get("sample")},
+                })
+        Path(path).write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+        return len(traces)
+
     @staticmethod
-    def _percentiles(values: deque[float]) -> tuple[float, float]:
+    def _percentile(s: list[float], p: float) -> float:
         # Rang le plus proche : index = ceil(p × n) - 1. Avec `int()` au lieu de
         # `ceil()`, le p95 tombait d'un cran (un p80 sur 5 échantillons) et
         # masquait justement les pires latences — celles qu'on veut voir.
+        return s[max(0, math.ceil(len(s) * p) - 1)] if s else 0.0
+
+    @classmethod
+    def _percentiles(cls, values: deque[float]) -> tuple[float, float]:
         s = sorted(values)
-        n = len(s)
-        if n == 0:
+        if not s:
             return 0.0, 0.0
-        return s[n // 2], s[max(0, math.ceil(n * 0.95) - 1)]
+        return s[len(s) // 2], cls._percentile(s, 0.95)
+
+    def _stage_breakdown(self) -> dict:
+        out: dict[str, dict] = {}
+        for (kind, stage), values in self._stage_ms.items():
+            s = sorted(values)
+            out.setdefault(kind, {})[stage] = {
+                "p50": s[len(s) // 2] if s else 0.0,
+                "p95": self._percentile(s, 0.95),
+                "p99": self._percentile(s, 0.99),
+            }
+        return out
 
     def snapshot(self) -> dict:
         with self._lock:
@@ -70,6 +213,19 @@ class SessionStats:
                 "partial_latency_p50_ms": pp50,
                 "partial_latency_p95_ms": pp95,
                 "drops": dict(self._drops),
+                "vad_chunks": self._vad_chunks,
+                "vad_skipped": self._vad_skipped,
+                "speculation_hits": self._speculation_hits,
+                "speculation_misses": self._speculation_misses,
+                "decode_cache_hits": self._decode_cache_hits,
+                "decode_cache_misses": self._decode_cache_misses,
+                "partial_interval_ms": self._partial_interval_ms,
+                "partial_rtf": self._partial_rtf,
+                "final_engine": self._final_engine,
+                "final_engine_changes": self._final_engine_changes,
+                "correction_cache_hits": self._correction_cache_hits,
+                "correction_cache_misses": self._correction_cache_misses,
+                "stages": self._stage_breakdown(),
             }
 
     def format_footer(self) -> str:
@@ -85,6 +241,21 @@ class SessionStats:
                 f" · partial×{s['partials']} "
                 f"p50={s['partial_latency_p50_ms']:.0f}ms p95={s['partial_latency_p95_ms']:.0f}ms"
             )
+            if s["partial_interval_ms"] is not None:
+                line += f" every {s['partial_interval_ms']:.0f}ms"
+        if s["vad_skipped"]:
+            line += f" · VAD skipped {s['vad_skipped']}/{s['vad_chunks']}"
+        spec = s["speculation_hits"] + s["speculation_misses"]
+        if spec:
+            line += f" · speculative finals {s['speculation_hits']}/{spec}"
+        cached = s["decode_cache_hits"] + s["decode_cache_misses"]
+        if cached:
+            line += f" · final reused partial {s['decode_cache_hits']}/{cached}"
+        if s["final_engine_changes"]:
+            line += f" · final on {s['final_engine']} ({s['final_engine_changes']} switches)"
+        memo = s["correction_cache_hits"] + s["correction_cache_misses"]
+        if memo:
+            line += f" · corrections remembered {s['correction_cache_hits']}/{memo}"
         if s["drops"]:
             drops_str = ", ".join(f"{k}={v}" for k, v in sorted(s["drops"].items()))
             line += f" · drops[{drops_str}]"
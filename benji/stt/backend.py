@@ -133,6 +133,40 @@ class ParakeetBackend:
             yield from words_from_result(result)
 
 
+# Seuils du repli en température, ceux de `mlx_whisper.transcribe` : un
+# décodage trop répétitif (compression) ou trop peu sûr (logprob) est retenté
+# plus chaud, sauf si la fenêtre est du silence : no_speech élevé *et*
+# logprob faible, comme `mlx_whisper.transcribe` — un no_speech élevé seul ne
+# dispense pas une boucle d'hallucination (compression) de son repli.
+_WHISPER_TEMPERATURES = (0.0, 0.2, 0.4)
+_COMPRESSION_RATIO_THRESHOLD = 2.4
+_LOGPROB_THRESHOLD = -1.0
+_NO_SPEECH_THRESHOLD = 0.6
+
+
+def _needs_fallback(result) -> bool:
+    if (result.no_speech_prob > _NO_SPEECH_THRESHOLD
+            and result.avg_logprob < _LOGPROB_THRESHOLD):
+        return False  # silence : un décodage plus chaud n'y trouvera rien de mieux
+    return (result.compression_ratio > _COMPRESSION_RATIO_THRESHOLD
+            or result.avg_logprob < _LOGPROB_THRESHOLD)
+
+
+def decode_with_fallback(decode, segment, ladder) -> tuple[object, int]:
+    """Décode *segment* avec chaque option de *ladder* jusqu'à un résultat
+    acceptable ; rend (résultat, nombre de replis).
+
+    Fonction pure autour de `decode(segment, options)` : elle se teste sans
+    modèle.
+    """
+    result = None
+    for retries, options in enumerate(ladder):
+        result = decode(segment, options)
+        if not _needs_fallback(result):
+            return result, retries
+    return result, len(ladder) - 1
+
+
 class WhisperBackend:
     """Whisper via mlx-whisper, **langue figée à la construction**.
 
@@ -143,37 +177,98 @@ class WhisperBackend:
     Ne sert que sur la passe finale, d'où la chaîne de repli en température : un
     décodage glouton raté est retenté plus chaud, ce qu'on ne peut pas se
     permettre sur une partielle mais qui vaut le coup sur du définitif.
+
+    Le modèle est chargé et ses poids matérialisés **ici**, comme pour
+    Parakeet : `mlx_whisper.transcribe` le résolvait à chaque appel par son
+    cache de module (un seul modèle à la fois — alterner deux tailles les
+    rechargeait tour à tour), et la première vraie finale payait le
+    chargement. Les options de décodage, fixes, sont construites une fois ; la
+    fenêtre de 30 s est décodée directement par `model.decode`. Un segment du
+    VAD (≤ 8 s) tient dans une seule fenêtre : la recherche de coupure par
+    horodatage de `transcribe` n'a pas lieu d'être.
+
+    `windows` / `fallbacks` comptent les fenêtres décodées et celles qui ont
+    dû être retentées plus chaud.
     """
 
     name = "whisper"
 
     def __init__(self, model_size: str = "medium", language: str | None = "fr"):
-        import mlx_whisper
+        import mlx.core as mx
+        from mlx_whisper.decoding import DecodingOptions
+        from mlx_whisper.load_models import load_model
+        from mlx_whisper.tokenizer import get_tokenizer
 
-        self._mlx = mlx_whisper
         self.repo = _MLX_WHISPER_MODELS.get(
             model_size, f"mlx-community/whisper-{model_size}-mlx"
         )
         self.language = language
         log.info("Chargement de Whisper '%s' (langue : %s)...", self.repo, language or "auto")
+        self.model = load_model(self.repo, dtype=mx.float16)
+        # Même raison que ParakeetBackend : lier les poids au thread appelant.
+        mx.eval(self.model.parameters())
+        self._get_tokenizer = get_tokenizer
+        # Tokenizer fixe quand la langue l'est ; sinon choisi par fenêtre,
+        # d'après la langue détectée au décodage.
+        self._tokenizer = get_tokenizer(
+            self.model.is_multilingual, num_languages=self.model.num_languages,
+            language=language, task="transcribe",
+        ) if language else None
+        # À température nulle, décodage glouton ; au-delà, un seul tirage.
+        self._ladder = tuple(
+            DecodingOptions(language=language, temperature=t, fp16=True)
+            for t in _WHISPER_TEMPERATURES
+        )
+        self.windows = 0
+        self.fallbacks = 0
+        log.info("Whisper prêt")
 
     def transcribe(self, audio) -> Iterator[dict]:
+        import mlx.core as mx
+        from mlx_whisper.audio import (
+            HOP_LENGTH,
+            N_FRAMES,
+            N_SAMPLES,
+            SAMPLE_RATE,
+            log_mel_spectrogram,
+            pad_or_trim,
+        )
+        from mlx_whisper.timing import add_word_timestamps
+
         if audio is None or len(audio) == 0:
             return
-        result = self._mlx.transcribe(
-            audio,
-            path_or_hf_repo=self.repo,
-            language=self.language,
-            word_timestamps=True,
-            condition_on_previous_text=False,
-            no_speech_threshold=0.6,
-            logprob_threshold=-1.0,
-            compression_ratio_threshold=2.4,
-            temperature=(0.0, 0.2, 0.4),
-            verbose=None,
-        )
-        for seg in result.get("segments", []):
-            for w in seg.get("words", []) or []:
+        mel = log_mel_spectrogram(audio, n_mels=self.model.dims.n_mels, padding=N_SAMPLES)
+        content_frames = mel.shape[-2] - N_FRAMES
+        last_speech = 0.0
+        # Fenêtres de 30 s bout à bout : une seule pour un segment du VAD.
+        for seek in range(0, content_frames, N_FRAMES):
+            frames = min(N_FRAMES, content_frames - seek)
+            segment = pad_or_trim(mel[seek : seek + frames], N_FRAMES, axis=-2).astype(mx.float16)
+            result, retries = decode_with_fallback(self.model.decode, segment, self._ladder)
+            self.windows += 1
+            if retries:
+                self.fallbacks += 1
+                log.debug("Whisper : repli à T=%.1f (%d/%d fenêtres)",
+                          result.temperature, self.fallbacks, self.windows)
+            if (result.no_speech_prob > _NO_SPEECH_THRESHOLD
+                    and result.avg_logprob <= _LOGPROB_THRESHOLD):
+                continue  # fenêtre de silence
+            tokenizer = self._tokenizer or self._get_tokenizer(
+                self.model.is_multilingual, num_languages=self.model.num_languages,
+                language=result.language, task="transcribe",
+            )
+            tokens = [t for t in result.tokens if t < tokenizer.eot]
+            if not tokens:
+                continue
+            offset = seek * HOP_LENGTH / SAMPLE_RATE
+            seg = {"seek": seek, "tokens": tokens, "start": offset,
+                   "end": offset + frames * HOP_LENGTH / SAMPLE_RATE}
+            add_word_timestamps(
+                segments=[seg], model=self.model, tokenizer=tokenizer, mel=segment,
+                num_frames=frames, last_speech_timestamp=last_speech,
+            )
+            last_speech = seg["end"]
+            for w in seg.get("words", []):
                 text = (w.get("word") or "").strip()
                 if text:
                     yield {"text": text, "start": w.get("start"), "end": w.get("end")}
@@ -0,0 +1,77 @@
+"""Cadence des passes partielles réglée sur le coût mesuré du moteur.
+
+`VADConfig.partial_interval_ms` fixait une passe toutes les 400 ms quelle que
+soit la machine : sur un M4 Pro, Parakeet décode en ~60 ms et le direct aurait
+pu se rafraîchir deux fois plus souvent ; sur un M1 de base en pleine visio (ou
+bridé thermiquement), une passe dépasse l'intervalle et le thread STT ne fait
+plus que des partielles, au détriment des finales qui attendent derrière.
+
+Le `Transcriber` verse ici la durée de chaque passe partielle ; le VAD lit
+l'intervalle courant avant d'en déclencher une. L'intervalle vise une
+occupation du thread STT de `target_occupancy` :
+
+    intervalle = latence moyenne d'une passe / occupation visée
+
+la latence étant une moyenne glissante exponentielle (un pic isolé ne fait pas
+décrocher la cadence, une machine qui ralentit pour de bon est suivie en
+quelques passes), bornée par `[min_ms, max_ms]`. Le facteur temps réel (RTF)
+des passes est suivi de la même façon, pour `SessionStats`.
+
+Une seule instance sert tous les flux d'un pipeline : le micro et le système
+parlent rarement en même temps, leurs passes se partagent le même budget.
+"""
+
+from __future__ import annotations
+
+from benji.config import VADConfig
+
+# Poids de la dernière passe dans les moyennes glissantes : ~5 passes
+# (2 s à la cadence par défaut) pour suivre un changement de régime.
+_ALPHA = 0.3
+
+
+class PartialCadence:
+    def __init__(self, initial_ms: float, target_occupancy: float = 0.5,
+                 min_ms: float = 200, max_ms: float = 2000, stats=None):
+        if not 0 < target_occupancy <= 1:
+            raise ValueError("target_occupancy doit être dans ]0, 1]")
+        self.target_occupancy = target_occupancy
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.stats = stats
+        # Lu par le thread VAD, écrit par le thread STT : une affectation de
+        # float, atomique, suffit — pas de verrou sur le chemin du VAD.
+        self.interval_ms = min(max(float(initial_ms), min_ms), max_ms)
+        self.latency_ms: float | None = None
+        self.rtf: float | None = None
+        self._publish()
+
+    @classmethod
+    def from_config(cls, config: VADConfig, stats=None) -> PartialCadence | None:
+        """Contrôleur réglé par *config* ; None = cadence fixe (désactivé, ou
+        partielles coupées)."""
+        if not config.partial_adaptive or config.partial_interval_ms <= 0:
+            return None
+        return cls(config.partial_interval_ms, config.partial_target_occupancy,
+                   config.partial_interval_min_ms, config.partial_interval_max_ms,
+                   stats=stats)
+
+    def record(self, latency_ms: float, audio_seconds: float) -> None:
+        """Verse la durée d'une passe partielle sur *audio_seconds* d'audio décodé."""
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += _ALPHA * (latency_ms - self.latency_ms)
+        if audio_seconds > 0:
+            rtf = latency_ms / 1000 / audio_seconds
+            self.rtf = rtf if self.rtf is None else self.rtf + _ALPHA * (rtf - self.rtf)
+        wanted = self.latency_ms / self.target_occupancy
+        self.interval_ms = min(max(wanted, self.min_ms), self.max_ms)
+        self._publish()
+
+    def interval_samples(self, sample_rate: int) -> int:
+        return int(self.interval_ms / 1000 * sample_rate)
+
+    def _publish(self) -> None:
+        if self.stats is not None:
+            self.stats.record_partial_cadence(self.interval_ms, self.rtf)
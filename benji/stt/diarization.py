@@ -1,17 +1,24 @@
 """Speaker labeling backends.
 
 Two implementations:
-- `SpeakerTagger` (pitch): F0 autocorrelation + 2-speaker clustering. No deps,
+- `SpeakerTagger` (pitch): YIN F0 estimate + 2-speaker clustering. No deps,
   works offline on Apple Silicon, but unreliable when voices have similar pitch.
 - `PyannoteSpeakerTagger`: pyannote.audio speaker embeddings + cosine clustering.
   Real diarization quality, supports >2 speakers. Requires `pyannote.audio` and
   an HF token (env `HF_TOKEN`) for first-time model download.
+
+`SlidingWindowDiarizer` wraps the latter to find speaker turns *within* a
+segment, from cached fixed-hop window embeddings. `ProcessDiarizer`
+(diarization_worker.py) serves either from a child process.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Protocol
 
 import numpy as np
@@ -23,49 +30,119 @@ class DiarizationBackend(Protocol):
     def label(self, audio: np.ndarray, sample_rate: int = 16000) -> str | None: ...
 
 
+# YIN (de Cheveigné & Kawahara, 2002), trame par trame. Une trame couvre
+# l'intégration (≥ deux périodes de la voix la plus grave) plus le décalage
+# maximal ; l'autocorrélation de toutes les trames passe par une seule FFT.
+_YIN_THRESHOLD = 0.15  # premier creux de la CMNDF retenu comme période
+_YIN_VOICED = 0.4  # creux au-delà duquel la trame est jugée non voisée
+_YIN_HOP_S = 0.025
+_YIN_MAX_S = 2.0  # au-delà, le centre du segment suffit à situer la voix
+
+
 def _estimate_f0(audio: np.ndarray, sample_rate: int = 16000,
-                 fmin: float = 70.0, fmax: float = 400.0) -> float | None:
-    """Return median F0 estimate in Hz, or None if unvoiced / too short."""
+                 fmin: float = 70.0, fmax: float = 400.0) -> tuple[float, float] | None:
+    """F0 du segment en Hz et confiance dans [0, 1] ; None si muet ou trop court.
+
+    F0 = médiane des trames voisées. Confiance = netteté moyenne de la
+    périodicité (1 - creux de la CMNDF) sur toutes les trames non muettes, une
+    trame non voisée comptant zéro : une voix tenue approche 1, du bruit ou un
+    souffle reste près de 0.
+    """
     if len(audio) < sample_rate // 4:  # <250 ms
         return None
+    min_lag = max(2, int(sample_rate / fmax))
+    max_lag = int(sample_rate / fmin) + 1
+    window = 2 * max_lag
+    frame_len = window + max_lag + 1
 
-    # Take central 1 second to avoid silence at edges
-    target_len = min(len(audio), sample_rate)
+    target_len = min(len(audio), int(_YIN_MAX_S * sample_rate))
     start = (len(audio) - target_len) // 2
     segment = audio[start:start + target_len].astype(np.float32)
     segment = segment - segment.mean()
-    if np.max(np.abs(segment)) < 1e-3:
+    if len(segment) < frame_len or np.max(np.abs(segment)) < 1e-3:
         return None
 
-    # Autocorrelation
-    corr = np.correlate(segment, segment, mode="full")[len(segment) - 1:]
-    min_lag = int(sample_rate / fmax)
-    max_lag = int(sample_rate / fmin)
-    if max_lag >= len(corr):
+    hop = max(1, int(_YIN_HOP_S * sample_rate))
+    frames = np.lib.stride_tricks.sliding_window_view(segment, frame_len)[::hop]
+    # Trames muettes (pauses entre les mots) écartées avant tout calcul.
+    energy = np.sqrt(np.mean(frames ** 2, axis=1))
+    frames = frames[energy >= 0.1 * energy.max()]
+
+    # Fonction de différence d(τ) = Σ (x[j] - x[j+τ])², j ∈ [0, window) :
+    # deux énergies glissantes moins deux fois la corrélation croisée.
+    n_fft = 1 << int(np.ceil(np.log2(frame_len + window)))
+    spectrum = np.fft.rfft(frames, n_fft)
+    head = np.fft.rfft(frames[:, :window], n_fft)
+    corr = np.fft.irfft(spectrum * np.conj(head), n_fft)[:, : max_lag + 1]
+    squares = np.concatenate(
+        [np.zeros((len(frames), 1)), np.cumsum(frames ** 2, axis=1)], axis=1)
+    lags = np.arange(max_lag + 1)
+    shifted = squares[:, lags + window] - squares[:, lags]
+    diff = np.maximum(squares[:, [window]] + shifted - 2 * corr, 0.0)
+
+    # Différence moyenne normalisée cumulée (CMNDF) : d'(τ) = d(τ) · τ / Σ d.
+    cumulative = np.cumsum(diff[:, 1:], axis=1)
+    cmndf = np.ones_like(diff)
+    cmndf[:, 1:] = diff[:, 1:] * lags[1:] / np.maximum(cumulative, 1e-12)
+
+    # Premier creux sous le seuil plutôt que le plus profond : les multiples de
+    # la période creusent presque autant, et le minimum donnerait l'octave en
+    # dessous. Sur une trame bruitée, le seuil suit le minimum de la trame.
+    search = cmndf[:, min_lag:max_lag]
+    threshold = np.maximum(_YIN_THRESHOLD, search.min(axis=1) + 0.1)
+    tau = np.argmax(search < threshold[:, None], axis=1)
+    # Du premier passage sous le seuil, on descend jusqu'au fond du creux.
+    rows = np.arange(len(frames))
+    last = search.shape[1] - 1
+    while True:
+        following = np.minimum(tau + 1, last)
+        step = (tau < last) & (search[rows, following] < search[rows, tau])
+        if not step.any():
+            break
+        tau = tau + step
+    dip = search[rows, tau]
+    voiced = dip < _YIN_VOICED
+    if not voiced.any():
         return None
-    window = corr[min_lag:max_lag]
-    peak = int(np.argmax(window)) + min_lag
-    if corr[peak] < 0.3 * corr[0]:  # low periodicity → unvoiced
-        return None
-    return sample_rate / peak
+
+    # Interpolation parabolique autour du creux : précision sous l'échantillon.
+    tau = tau[voiced] + min_lag
+    left, mid, right = (cmndf[voiced, tau - 1], cmndf[voiced, tau],
+                        cmndf[voiced, np.minimum(tau + 1, max_lag)])
+    curvature = left - 2 * mid + right
+    offset = np.divide(0.5 * (left - right), curvature,
+                       out=np.zeros_like(curvature), where=curvature > 0)
+    f0 = float(np.median(sample_rate / (tau + np.clip(offset, -0.5, 0.5))))
+    confidence = float(np.sum(1.0 - dip[voiced]) / len(frames))
+    return f0, confidence
 
 
 class SpeakerTagger:
-    """Assigns A/B labels based on F0 clustering with a rolling reference."""
+    """Assigns A/B labels based on F0 clustering with a rolling reference.
+
+    La confiance de l'estimation décide de ce qu'un segment a le droit de
+    faire : net, il crée un locuteur ou fait glisser sa référence ; flou
+    (souffle, rire, « hm »), il ne peut que rejoindre un locuteur connu assez
+    proche. Sans hauteur exploitable, aucun label plutôt que celui du segment
+    précédent — qui n'était, une fois sur deux, pas le bon.
+    """
 
-    def __init__(self, f0_gap_hz: float = 40.0):
+    def __init__(self, f0_gap_hz: float = 40.0, min_confidence: float = 0.4):
         self.f0_gap_hz = f0_gap_hz
+        self.min_confidence = min_confidence
         self._speaker_f0: dict[str, float] = {}
-        self._last_label: str | None = None
 
     def label(self, audio: np.ndarray, sample_rate: int = 16000) -> str | None:
-        f0 = _estimate_f0(audio, sample_rate)
-        if f0 is None:
-            return self._last_label  # fallback to previous speaker
+        estimate = _estimate_f0(audio, sample_rate)
+        if estimate is None:
+            return None
+        f0, confidence = estimate
+        reliable = confidence >= self.min_confidence
 
         if not self._speaker_f0:
+            if not reliable:
+                return None
             self._speaker_f0["A"] = f0
-            self._last_label = "A"
             return "A"
 
         # Find closest existing speaker
@@ -75,30 +152,162 @@ class SpeakerTagger:
         )
 
         if best_delta <= self.f0_gap_hz:
-            # Same speaker — update rolling reference (EMA)
-            prev = self._speaker_f0[best_label]
-            self._speaker_f0[best_label] = 0.8 * prev + 0.2 * f0
-            self._last_label = best_label
+            if reliable:
+                # Same speaker — update rolling reference (EMA), weighted by
+                # how clearly the pitch was heard.
+                prev = self._speaker_f0[best_label]
+                self._speaker_f0[best_label] = prev + 0.2 * confidence * (f0 - prev)
             return best_label
 
+        if not reliable:
+            return None
+
         # New speaker (cap at 2)
         if len(self._speaker_f0) < 2:
             new_label = "B" if "A" in self._speaker_f0 else "A"
             self._speaker_f0[new_label] = f0
-            self._last_label = new_label
             return new_label
 
         # Already 2 speakers — assign to closest anyway
-        self._last_label = best_label
         return best_label
 
 
+def _normalized(emb: np.ndarray) -> np.ndarray:
+    emb = np.asarray(emb, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(emb))
+    return emb / norm if norm > 0 else emb
+
+
+def _agglomerate(embeddings: np.ndarray, threshold: float, max_clusters: int) -> np.ndarray:
+    """Clustering agglomératif à lien moyen sur la similarité cosinus.
+
+    *embeddings* : lignes normalisées. Fusionne tant que deux groupes se
+    ressemblent au moins à *threshold*, puis encore jusqu'à n'en garder que
+    *max_clusters*. Rend l'indice de groupe de chaque ligne (0, 1, ...).
+    La matrice des similarités entre groupes est tenue à jour en place :
+    une fusion coûte une ligne, pas un recalcul.
+    """
+    n = len(embeddings)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    x = embeddings.astype(np.float32)
+    sim = x @ x.T
+    np.fill_diagonal(sim, -np.inf)
+    sizes = np.ones(n)
+    parent = np.arange(n)
+    clusters = n
+    while clusters > 1:
+        i, j = np.unravel_index(int(np.argmax(sim)), sim.shape)
+        if sim[i, j] < threshold and clusters <= max_clusters:
+            break
+        merged = (sizes[i] * sim[i] + sizes[j] * sim[j]) / (sizes[i] + sizes[j])
+        sim[i, :] = merged
+        sim[:, i] = merged
+        sim[i, i] = -np.inf
+        sim[j, :] = -np.inf
+        sim[:, j] = -np.inf
+        sizes[i] += sizes[j]
+        parent[parent == j] = i
+        clusters -= 1
+    return np.unique(parent, return_inverse=True)[1]
+
+
+class SpeakerClusters:
+    """Clustering des embeddings de locuteur : en ligne, puis en lot.
+
+    En ligne, chaque embedding rejoint le centroïde le plus proche — une seule
+    multiplication matricielle contre la matrice des centroïdes normalisés —
+    ou ouvre un nouveau locuteur (jusqu'à `max_speakers`). Une décision prise
+    en début de réunion, sur peu de données, n'était jamais revue : chaque
+    embedding est donc gardé (float16, normalisé ; ~1 Ko pièce) sous un
+    indice, la « voix », que l'historique note à côté du locuteur.
+    `recluster` reprend les voix d'une réunion entière d'un bloc.
+    """
+
+    def __init__(self, max_speakers: int = 4, cosine_threshold: float = 0.55):
+        self.max_speakers = max_speakers
+        self.cosine_threshold = cosine_threshold
+        self.labels: list[str] = []
+        self._centroids: np.ndarray | None = None  # (locuteurs, dim), lignes normalisées
+        self._counts: list[int] = []
+        self._voices: np.ndarray | None = None  # (capacité, dim) float16
+        self._voice_labels: list[str] = []
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._voice_labels)
+
+    def _new_label(self) -> str:
+        # A, B, C, ... up to max_speakers, then numeric.
+        if self._next_id < 26:
+            label = chr(ord("A") + self._next_id)
+        else:
+            label = f"S{self._next_id}"
+        self._next_id += 1
+        return label
+
+    def assign(self, emb: np.ndarray) -> tuple[str, int]:
+        """(locuteur, voix) de *emb* : le centroïde le plus proche, ou un nouveau."""
+        emb = _normalized(emb)
+        if self._centroids is None:
+            self._centroids = emb[None, :]
+        else:
+            sims = self._centroids @ emb
+            best = int(np.argmax(sims))
+            if sims[best] >= self.cosine_threshold or len(self.labels) >= self.max_speakers:
+                n = self._counts[best] + 1
+                self._counts[best] = n
+                self._centroids[best] = _normalized(
+                    self._centroids[best] * (n - 1) / n + emb / n)
+                return self.labels[best], self._remember(emb, self.labels[best])
+            self._centroids = np.vstack([self._centroids, emb])
+        label = self._new_label()
+        self.labels.append(label)
+        self._counts.append(1)
+        return label, self._remember(emb, label)
+
+    def _remember(self, emb: np.ndarray, label: str) -> int:
+        voice = len(self._voice_labels)
+        if self._voices is None:
+            self._voices = np.zeros((64, len(emb)), dtype=np.float16)
+        elif voice == len(self._voices):
+            self._voices = np.concatenate([self._voices, np.zeros_like(self._voices)])
+        self._voices[voice] = emb
+        self._voice_labels.append(label)
+        return voice
+
+    def recluster(self, voices: list[int]) -> dict[int, str]:
+        """Nouveau locuteur de chacune des *voices*, regroupées d'un bloc.
+
+        Les groupes gardent, autant que possible, les étiquettes déjà vues à
+        l'écran : chacun reprend celle que portait la majorité de ses voix, les
+        plus gros groupes choisissant en premier.
+        """
+        voices = sorted({v for v in voices if 0 <= v < len(self._voice_labels)})
+        if not voices:
+            return {}
+        groups = _agglomerate(self._voices[voices], self.cosine_threshold, self.max_speakers)
+        members = [[v for v, g in zip(voices, groups) if g == k] for k in range(groups.max() + 1)]
+        taken: set[str] = set()
+        relabelled: dict[int, str] = {}
+        for group in sorted(members, key=len, reverse=True):
+            votes: dict[str, int] = {}
+            for v in group:
+                label = self._voice_labels[v]
+                if label not in taken:
+                    votes[label] = votes.get(label, 0) + 1
+            label = max(votes, key=votes.get) if votes else self._new_label()
+            taken.add(label)
+            relabelled.update((v, label) for v in group)
+        return relabelled
+
+
 class PyannoteSpeakerTagger:
     """Real speaker labeling using pyannote.audio embeddings + cosine clustering.
 
     For each segment we compute a 512-d embedding, then assign it to the closest
     existing centroid (cosine sim > threshold) or spawn a new speaker (up to
-    `max_speakers`). Centroids update via running mean.
+    `max_speakers`) — see SpeakerClusters.
     """
 
     def __init__(
@@ -126,28 +335,11 @@ class PyannoteSpeakerTagger:
         # `whole` averages embeddings across the full clip — what we want per segment.
         model = Model.from_pretrained(model_id, revision=model_revision, token=token)
         self._inference = Inference(model, window="whole")
-        self.max_speakers = max_speakers
-        self.cosine_threshold = cosine_threshold
-        self._centroids: dict[str, np.ndarray] = {}
-        self._counts: dict[str, int] = {}
-        self._next_id = 0
+        self.clusters = SpeakerClusters(max_speakers, cosine_threshold)
         log.info("pyannote.audio loaded ('%s')", model_id)
 
-    @staticmethod
-    def _cos(a: np.ndarray, b: np.ndarray) -> float:
-        denom = (np.linalg.norm(a) * np.linalg.norm(b)) or 1.0
-        return float(np.dot(a, b) / denom)
-
-    def _new_label(self) -> str:
-        # A, B, C, ... up to max_speakers, then numeric.
-        if self._next_id < 26:
-            label = chr(ord("A") + self._next_id)
-        else:
-            label = f"S{self._next_id}"
-        self._next_id += 1
-        return label
-
-    def label(self, audio: np.ndarray, sample_rate: int = 16000) -> str | None:
+    def embed(self, audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray | None:
+        """Embedding du clip entier ; None s'il est trop court ou en cas d'échec."""
         if len(audio) < sample_rate // 2:  # <500 ms — too short for stable embedding
             return None
         try:
@@ -155,39 +347,217 @@ class PyannoteSpeakerTagger:
             import torch
             waveform = torch.from_numpy(audio.astype(np.float32)).unsqueeze(0)
             emb = self._inference({"waveform": waveform, "sample_rate": sample_rate})
-            emb = np.asarray(emb).flatten()
+            return np.asarray(emb).flatten()
         except Exception as e:
             log.warning("pyannote inference failed: %s", e)
             return None
 
-        if not self._centroids:
-            label = self._new_label()
-            self._centroids[label] = emb
-            self._counts[label] = 1
-            return label
+    def assign(self, emb: np.ndarray) -> tuple[str, int]:
+        return self.clusters.assign(emb)
 
-        best_label, best_sim = max(
-            ((lbl, self._cos(emb, c)) for lbl, c in self._centroids.items()),
-            key=lambda x: x[1],
-        )
+    def recluster(self, voices: list[int]) -> dict[int, str]:
+        return self.clusters.recluster(voices)
 
-        if best_sim >= self.cosine_threshold or len(self._centroids) >= self.max_speakers:
-            n = self._counts[best_label] + 1
-            self._centroids[best_label] = self._centroids[best_label] * (n - 1) / n + emb / n
-            self._counts[best_label] = n
-            return best_label
+    def turns(self, audio: np.ndarray, sample_rate: int = 16000) -> list[Turn]:
+        """Un seul tour couvrant le segment (cf. SlidingWindowDiarizer)."""
+        emb = self.embed(audio, sample_rate)
+        if emb is None:
+            return []
+        speaker, voice = self.assign(emb)
+        return [Turn(0.0, len(audio) / sample_rate, speaker, voice)]
 
-        label = self._new_label()
-        self._centroids[label] = emb
-        self._counts[label] = 1
-        return label
+    def label(self, audio: np.ndarray, sample_rate: int = 16000) -> str | None:
+        emb = self.embed(audio, sample_rate)
+        return None if emb is None else self.assign(emb)[0]
+
+
+@dataclass(frozen=True)
+class Turn:
+    """Tour de parole dans un segment, en secondes depuis son début."""
+
+    start: float
+    end: float
+    speaker: str | None
+    voice: int | None = None  # embedding gardé par SpeakerClusters
+
+
+class SlidingWindowDiarizer:
+    """Tours de parole *à l'intérieur* d'un segment, par fenêtres glissantes.
+
+    Un embedding `window="whole"` par finale donnait un seul locuteur à deux
+    personnes qui se répondent sans pause, et ré-encodait les 8 s du segment
+    alors que seule la dernière seconde était nouvelle. Ici, l'audio est
+    découpé en fenêtres de `window_s` au pas de `hop_s` depuis le début du
+    tampon du VAD :
 
+    - chaque fenêtre est encodée une fois, gardée sous une empreinte de son
+      contenu : les passes partielles (`observe`) encodent les fenêtres au fil
+      de la parole, la finale retrouve les mêmes et n'encode que la fin ;
+    - une chute de similarité entre deux fenêtres disjointes marque un
+      changement de locuteur ; chaque tour reçoit l'étiquette de la moyenne de
+      ses fenêtres, via le clustering du tagger enveloppé (`assign`).
 
-def build_tagger(backend: str, max_speakers: int = 4) -> DiarizationBackend:
-    """Factory: returns a diarization tagger, falling back to pitch on error."""
+    Le travail d'embedding est ainsi borné à `window_s / hop_s` fenêtres par
+    seconde d'audio, quelle que soit la longueur des énoncés.
+    """
+
+    def __init__(self, tagger, window_s: float = 1.5, hop_s: float = 0.75,
+                 change_threshold: float = 0.5, cache_windows: int = 256):
+        if not 0 < hop_s <= window_s:
+            raise ValueError("hop_s doit être dans ]0, window_s]")
+        self.tagger = tagger  # embed(audio, sr), assign(embedding) et recluster(voix)
+        self.window_s = window_s
+        self.hop_s = hop_s
+        self.change_threshold = change_threshold
+        self.cache_windows = cache_windows
+        self._cache: OrderedDict[bytes, np.ndarray | None] = OrderedDict()
+        self.embedded = 0  # fenêtres encodées
+        self.reused = 0  # fenêtres reprises du cache
+
+    def _spans(self, n: int, sample_rate: int, final: bool) -> list[tuple[int, int]]:
+        """Fenêtres (début, fin) en échantillons. Une partielle n'encode que les
+        fenêtres complètes de la grille : la fin bouge encore."""
+        win, hop = int(self.window_s * sample_rate), int(self.hop_s * sample_rate)
+        if n < win:
+            return [(0, n)] if final and n >= sample_rate // 2 else []
+        spans = [(k, k + win) for k in range(0, n - win + 1, hop)]
+        if final and n - spans[-1][1] > hop // 2:
+            spans.append((n - win, n))  # fin du segment, alignée sur sa fin
+        return spans
+
+    def _embedding(self, audio: np.ndarray, start: int, end: int,
+                   sample_rate: int) -> np.ndarray | None:
+        window = audio[start:end]
+        # Empreinte d'un échantillon sur 16 (cf. Transcriber._cache_key) : la
+        # même parole donne la même clé dans la partielle et dans la finale.
+        key = len(window).to_bytes(4, "little") + hashlib.blake2b(
+            np.ascontiguousarray(window[::16]).tobytes(), digest_size=16
+        ).digest()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.reused += 1
+            return self._cache[key]
+        emb = self.tagger.embed(window, sample_rate)
+        if emb is not None:
+            emb = np.asarray(emb, dtype=np.float32).ravel()
+            norm = float(np.linalg.norm(emb))
+            emb = emb / norm if norm > 0 else None
+        self.embedded += 1
+        self._cache[key] = emb
+        while len(self._cache) > self.cache_windows:
+            self._cache.popitem(last=False)
+        return emb
+
+    def observe(self, audio: np.ndarray, sample_rate: int = 16000) -> None:
+        """Encode d'avance les fenêtres complètes d'un tampon partiel."""
+        for start, end in self._spans(len(audio), sample_rate, final=False):
+            self._embedding(audio, start, end, sample_rate)
+
+    def turns(self, audio: np.ndarray, sample_rate: int = 16000) -> list[Turn]:
+        """Tours de parole du segment, dans l'ordre ; [] si rien d'exploitable."""
+        spans, embeddings = [], []
+        for start, end in self._spans(len(audio), sample_rate, final=True):
+            emb = self._embedding(audio, start, end, sample_rate)
+            if emb is not None:
+                spans.append((start, end))
+                embeddings.append(emb)
+        if not embeddings:
+            return []
+
+        bounds = [0, *self._change_points(spans, embeddings), len(audio)]
+        turns: list[Turn] = []
+        for start, end in zip(bounds, bounds[1:]):
+            # Les fenêtres entièrement dans le tour, à défaut celles centrées
+            # dedans : une fenêtre à cheval mélange les deux voix.
+            inside = [e for (a, b), e in zip(spans, embeddings) if start <= a and b <= end]
+            inside = inside or [e for (a, b), e in zip(spans, embeddings)
+                                if start <= (a + b) / 2 < end]
+            if not inside:
+                continue
+            mean = np.mean(inside, axis=0)
+            speaker, voice = self.tagger.assign(mean / (np.linalg.norm(mean) or 1.0))
+            if turns and turns[-1].speaker == speaker:
+                turns[-1] = Turn(turns[-1].start, end / sample_rate, speaker, turns[-1].voice)
+            else:
+                turns.append(Turn(start / sample_rate, end / sample_rate, speaker, voice))
+        return turns
+
+    def _change_points(self, spans: list[tuple[int, int]], embeddings) -> list[int]:
+        """Changements de locuteur, en échantillons.
+
+        Deux fenêtres voisines se recouvrent de moitié : leur similarité ne
+        chute presque pas au changement. On compare donc chaque fenêtre à la
+        première qui ne la recouvre plus ; au creux de chaque passage sous
+        `change_threshold`, la frontière tombe entre les deux.
+        """
+        lag = max(1, int(np.ceil(self.window_s / self.hop_s - 1e-9)))
+        scores = [float(embeddings[i] @ embeddings[i + lag])
+                  for i in range(len(embeddings) - lag)]
+        cuts, run = [], []
+        for i, score in enumerate([*scores, 1.0]):
+            if score < self.change_threshold:
+                run.append(i)
+            elif run:
+                i = min(run, key=scores.__getitem__)
+                cuts.append((spans[i][1] + spans[i + lag][0]) // 2)
+                run = []
+        return cuts
+
+    def recluster(self, voices: list[int]) -> dict[int, str]:
+        return self.tagger.recluster(voices)
+
+    def label(self, audio: np.ndarray, sample_rate: int = 16000) -> str | None:
+        return dominant_speaker(self.turns(audio, sample_rate))
+
+
+def dominant_speaker(turns: list[Turn]) -> str | None:
+    """Locuteur qui parle le plus longtemps dans *turns*."""
+    spoken: dict[str, float] = {}
+    for turn in turns:
+        if turn.speaker is not None:
+            spoken[turn.speaker] = spoken.get(turn.speaker, 0.0) + turn.end - turn.start
+    return max(spoken, key=spoken.get) if spoken else None
+
+
+def attach_speakers(words: list[dict], turns: list[Turn]) -> list[dict]:
+    """Copie de *words* où chaque mot porte le `speaker` (et la `voice`) du
+    tour qui contient son milieu ; un mot sans horodatage prend ceux du mot
+    précédent."""
+    labelled = []
+    turn = max(turns, key=lambda t: t.end - t.start, default=None)
+    for word in words:
+        start, end = word.get("start"), word.get("end")
+        if start is not None and end is not None and turns:
+            middle = (start + end) / 2
+            turn = next((t for t in turns if middle < t.end), turns[-1])
+        labelled.append(dict(word, speaker=turn.speaker if turn else None,
+                             voice=turn.voice if turn else None))
+    return labelled
+
+
+def build_tagger(backend: str, max_speakers: int = 4, window_s: float = 0.0,
+                 hop_s: float = 0.75) -> DiarizationBackend:
+    """Factory: returns a diarization tagger, falling back to pitch on error.
+
+    *window_s* > 0 wraps pyannote in a SlidingWindowDiarizer (speaker turns
+    within a segment); 0 keeps one embedding per segment. "pyannote-process"
+    runs the same tagger in a child process (see diarization_worker).
+    """
+    if backend == "pyannote-process":
+        import functools
+
+        from benji.stt.diarization_worker import ProcessDiarizer
+
+        # L'enfant retombe lui-même sur pitch si pyannote y est introuvable.
+        return ProcessDiarizer(functools.partial(build_tagger, "pyannote", max_speakers,
+                                                 window_s, hop_s))
     if backend == "pyannote":
         try:
-            return PyannoteSpeakerTagger(max_speakers=max_speakers)
+            tagger = PyannoteSpeakerTagger(max_speakers=max_speakers)
         except Exception as e:
             log.warning("pyannote unavailable (%s), falling back to pitch", e)
+        else:
+            if window_s > 0:
+                return SlidingWindowDiarizer(tagger, window_s=window_s, hop_s=hop_s)
+            return tagger
     return SpeakerTagger()
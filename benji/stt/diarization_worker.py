@@ -0,0 +1,270 @@
+"""Diarisation dans un process à part (backend "pyannote-process").
+
+En process, l'inférence torch de pyannote partage le GIL avec la boucle STT
+MLX, le thread du VAD et Qt : son coût côté Python se lisait en gigue sur la
+latence des partielles. `ProcessDiarizer` fait tourner le tagger dans un
+process enfant et n'en garde, côté app, que l'interface (`observe`, `turns`,
+`label`, `recluster`) :
+
+- **mémoire partagée** — l'audio est recopié dans un bloc
+  `multiprocessing.shared_memory` que l'enfant lit en place ; seuls le nom du
+  bloc et la longueur passent par le pipe, jamais le tableau picklé ;
+- **asynchrone** — un appel bloque le thread du diarizer du `Transcriber` sur
+  le pipe, GIL relâché, et le décodage continue ; la finale récupère le
+  résultat avec le même délai de 5 s (cf. `Transcriber._await_speaker`) ;
+- **isolé** — un enfant qui plante ou ne répond plus dans `timeout_s` est tué
+  et relancé au prochain appel ; le segment part sans locuteur. Le clustering
+  de l'enfant perdu est perdu avec lui : les voix qu'il avait rendues sont
+  écartées du re-clustering de fin de réunion. Au-delà de `max_restarts`
+  relances, la diarisation est coupée pour la session.
+
+L'enfant est lancé en "spawn" (rien de Qt ni de MLX n'y est hérité) dès la
+construction ; tant qu'il charge son modèle, les segments partent sans
+locuteur au lieu d'attendre. Dans l'app empaquetée (PyInstaller), l'enfant
+ré-exécute le point d'entrée : `multiprocessing.freeze_support()` doit y être
+appelé en premier (cf. run.py), sans quoi il relance une seconde app.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import multiprocessing
+import signal
+import threading
+import weakref
+from collections.abc import Callable
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from benji.stt.diarization import Turn
+
+log = logging.getLogger(__name__)
+
+# Bloc partagé initial : 30 s à 16 kHz en float32, doublé au besoin.
+_INITIAL_SAMPLES = 30 * 16000
+_RECLUSTER_TIMEOUT_S = 30.0
+
+
+def _dispatch(tagger, method: str, audio: np.ndarray, sample_rate: int):
+    """Appel de *method* sur le tagger de l'enfant, quel que soit son type :
+    un tagger sans tours de parole (pitch) rend un tour couvrant le segment."""
+    if method == "observe":
+        observe = getattr(tagger, "observe", None)
+        return observe(audio, sample_rate) if observe is not None else None
+    if method == "turns" and not hasattr(tagger, "turns"):
+        label = tagger.label(audio, sample_rate)
+        return [Turn(0.0, len(audio) / sample_rate, label)] if label is not None else []
+    return getattr(tagger, method)(audio, sample_rate)
+
+
+def _serve(conn, factory: Callable[[], object]) -> None:
+    """Boucle de l'enfant : construit le tagger, annonce qu'il est prêt, puis
+    sert les requêtes une à une jusqu'à `None` ou la fermeture du pipe."""
+    # Ctrl+C vise tout le groupe de process : c'est au parent de s'arrêter
+    # proprement, et de fermer l'enfant.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    tagger = factory()
+    conn.send(("ready", type(tagger).__name__))
+    shm: shared_memory.SharedMemory | None = None
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                return
+            if request is None:
+                return
+            method, *args = request
+            try:
+                if method == "recluster":
+                    recluster = getattr(tagger, "recluster", None)
+                    result = recluster(*args) if recluster is not None else {}
+                else:
+                    name, n, sample_rate = args
+                    if shm is None or shm.name != name:
+                        if shm is not None:
+                            shm.close()
+                        shm = shared_memory.SharedMemory(name=name)
+                    # Copie : aucune vue ne doit survivre au bloc, que le parent
+                    # remplace quand il grandit.
+                    audio = np.ndarray((n,), dtype=np.float32, buffer=shm.buf).copy()
+                    result = _dispatch(tagger, method, audio, sample_rate)
+                conn.send(("ok", result))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+def _release(resources: dict) -> None:
+    """Arrête l'enfant et libère le bloc partagé (fermeture ou ramasse-miettes)."""
+    conn, proc, shm = resources.pop("conn", None), resources.pop("proc", None), resources.pop("shm", None)
+    if conn is not None:
+        try:
+            conn.send(None)
+        except (OSError, ValueError):
+            pass
+        conn.close()
+    if proc is not None:
+        proc.join(timeout=1.0)
+        if proc.is_alive():
+            proc.kill()
+            proc.join(timeout=1.0)
+    if shm is not None:
+        shm.close()
+        shm.unlink()
+
+
+class ProcessDiarizer:
+    """Tagger servi par un process enfant ; *factory* y construit le vrai
+    tagger (picklable : fonction de module ou `functools.partial`)."""
+
+    def __init__(self, factory: Callable[[], object], timeout_s: float = 5.0,
+                 max_restarts: int = 3):
+        self.factory = factory
+        self.timeout_s = timeout_s
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.backend: str | None = None  # type du tagger de l'enfant, une fois prêt
+        # Un appel à la fois : le pipe et le bloc partagé ne servent qu'une
+        # requête, comme le tagger en process qui porte un état de clustering.
+        self._lock = threading.Lock()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._resources: dict = {}
+        self._ready = False
+        self._disabled = False
+        # Voix rendues par l'enfant courant = indices locaux + _voice_base ; un
+        # enfant relancé repart de zéro, ses voix sont décalées après les autres.
+        self._voice_base = 0
+        self._voice_top = 0
+        self._finalizer = weakref.finalize(self, _release, self._resources)
+        self._start()
+
+    # --- cycle de vie de l'enfant ---
+
+    def _start(self) -> None:
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_serve, args=(child, self.factory),
+                                 name="benji-diarizer", daemon=True)
+        proc.start()
+        child.close()
+        self._resources["conn"], self._resources["proc"] = parent, proc
+        self._ready = False
+        self._voice_base = self._voice_top
+
+    def _restart(self, reason: str) -> None:
+        self._resources.pop("conn").close()
+        proc = self._resources.pop("proc")
+        proc.kill()
+        proc.join(timeout=1.0)
+        self.restarts += 1
+        if self.restarts > self.max_restarts:
+            self._disabled = True
+            log.error("Diarisation coupée : worker en échec %d fois (%s)", self.restarts, reason)
+            return
+        log.warning("Worker de diarisation relancé (%s) — locuteurs renumérotés", reason)
+        self._start()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Attend que l'enfant ait chargé son tagger ; False à l'expiration."""
+        with self._lock:
+            return self._poll_ready(timeout)
+
+    def _poll_ready(self, timeout: float | None) -> bool:
+        if self._ready:
+            return True
+        if self._disabled:
+            return False
+        conn = self._resources["conn"]
+        try:
+            if not conn.poll(timeout):
+                return False
+            kind, self.backend = conn.recv()
+        except (EOFError, OSError):
+            self._restart("arrêt au chargement")
+            return False
+        self._ready = kind == "ready"
+        log.info("Worker de diarisation prêt (%s)", self.backend)
+        return self._ready
+
+    def close(self) -> None:
+        with self._lock:
+            self._finalizer()
+            self._disabled = True
+
+    # --- requêtes ---
+
+    def _shared(self, audio: np.ndarray) -> tuple[str, int]:
+        """Recopie *audio* dans le bloc partagé, agrandi au besoin."""
+        shm = self._resources.get("shm")
+        if shm is None or shm.size < audio.size * 4:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            size = max(_INITIAL_SAMPLES, 1 << int(audio.size - 1).bit_length())
+            shm = self._resources["shm"] = shared_memory.SharedMemory(create=True, size=size * 4)
+        np.ndarray((audio.size,), dtype=np.float32, buffer=shm.buf)[:] = audio
+        return shm.name, audio.size
+
+    def _request(self, request: tuple, timeout: float):
+        """Envoie *request* et rend la réponse de l'enfant. Hors service ou
+        encore en chargement : None sans attendre. Lève RuntimeError si
+        l'enfant échoue, plante ou dépasse *timeout* (il est alors relancé)."""
+        if not self._poll_ready(0):
+            return None
+        conn = self._resources["conn"]
+        try:
+            conn.send(request)
+            if not conn.poll(timeout):
+                self._restart(f"pas de réponse en {timeout:.0f} s")
+                raise RuntimeError("worker de diarisation sans réponse")
+            kind, result = conn.recv()
+        except (EOFError, OSError) as e:
+            self._restart("process arrêté")
+            raise RuntimeError("worker de diarisation arrêté") from e
+        if kind == "error":
+            raise RuntimeError(result)
+        return result
+
+    def _audio_request(self, method: str, audio: np.ndarray, sample_rate: int):
+        with self._lock:
+            if self._disabled:
+                return None
+            name, n = self._shared(np.asarray(audio, dtype=np.float32).ravel())
+            result = self._request((method, name, n, sample_rate), self.timeout_s)
+            if method == "turns" and result:
+                result = [self._global(turn) for turn in result]
+            return result
+
+    def _global(self, turn: Turn) -> Turn:
+        if turn.voice is None:
+            return turn
+        voice = turn.voice + self._voice_base
+        self._voice_top = max(self._voice_top, voice + 1)
+        return dataclasses.replace(turn, voice=voice)
+
+    def observe(self, audio: np.ndarray, sample_rate: int = 16000) -> None:
+        self._audio_request("observe", audio, sample_rate)
+
+    def turns(self, audio: np.ndarray, sample_rate: int = 16000) -> list[Turn] | None:
+        return self._audio_request("turns", audio, sample_rate)
+
+    def label(self, audio: np.ndarray, sample_rate: int = 16000) -> str | None:
+        return self._audio_request("label", audio, sample_rate)
+
+    def recluster(self, voices: list[int]) -> dict[int, str]:
+        """Comme SpeakerClusters.recluster, sur les seules voix de l'enfant
+        courant : celles d'un enfant perdu n'ont plus d'embedding."""
+        with self._lock:
+            if self._disabled:
+                return {}
+            base = self._voice_base
+            local = [v - base for v in voices if v >= base]
+            if not local:
+                return {}
+            speakers = self._request(("recluster", local), _RECLUSTER_TIMEOUT_S) or {}
+            return {v + base: speaker for v, speaker in speakers.items()}
+
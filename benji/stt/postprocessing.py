@@ -1,32 +1,139 @@
-"""Nettoyage appliqué au texte sorti du moteur, après la passe finale."""
+"""Nettoyage appliqué au texte sorti du moteur, après la passe finale.
+
+Les règles propres à une langue vivent dans la table `LANGUAGES` ; chaque
+expression est compilée une fois, au chargement du module ou, pour les règles
+d'une langue, à sa première utilisation (cf. `_word_fixes`). Un lot de textes
+(historique retraité d'un bloc) passe par `postprocess_many`.
+"""
 
 import re
+from dataclasses import dataclass
+from functools import cache
+
+
+@dataclass(frozen=True)
+class LanguageRules:
+    # Hésitations supprimées du texte (mots entiers, sans casse).
+    hesitations: tuple[str, ...] = ()
+    # Rebuts du moteur (cf. HALLUCINATION_PATTERNS), en minuscules.
+    hallucinations: tuple[str, ...] = ()
+    # Mots réécrits tels quels : `exact_words` à la casse près, `words` sans casse.
+    exact_words: tuple[tuple[str, str], ...] = ()
+    words: tuple[tuple[str, str], ...] = ()
+
 
 # Rebuts classiques des modèles entraînés sur des corpus de sous-titres, émis
 # sur du silence ou un signal faible. C'était le mode d'échec de Whisper ; le
-# filtre reste en place pour Parakeet — il ne coûte qu'une recherche de
-# sous-chaîne, et le jour où un moteur recrache ce boilerplate, il est déjà là.
+# filtre reste en place pour Parakeet — il ne coûte qu'une recherche dans un
+# automate, et le jour où un moteur recrache ce boilerplate, il est déjà là.
+#
+# Hésitations et rebuts de *toutes* les langues s'appliquent quelle que soit la
+# langue : la détection automatique (language=None) et les réunions mixtes
+# laissent passer l'une dans l'autre. Seuls les mots réécrits sont propres à la
+# langue demandée. NB : pas de « eh/ah/oh » — mots légitimes en français
+# (« eh bien », « ah bon »).
+LANGUAGES: dict[str, LanguageRules] = {
+    "fr": LanguageRules(
+        hesitations=("euh", "euuh", "heu", "heuu"),
+        hallucinations=(
+            "sous-titres réalisés par",
+            "sous-titres fait par",
+            "sous-titrage st'",
+            "sous-titrage société radio",
+            "sous-titres faits par",
+            "❤️ par sous-titres",
+            "amara.org",
+            "merci d'avoir regardé",
+            "merci de votre attention",
+            "merci à tous",
+            "abonnez-vous",
+            "n'oubliez pas de vous abonner",
+            "à la prochaine",
+        ),
+    ),
+    "en": LanguageRules(
+        hesitations=("uh", "uhh", "um", "umm", "hmm", "huh"),
+        hallucinations=(
+            "thanks for watching",
+            "thank you for watching",
+            "subscribe to",
+            "please subscribe",
+            "like and subscribe",
+        ),
+        exact_words=(("i", "I"),),
+        words=(("im", "I'm"), ("dont", "don't"), ("cant", "can't")),
+    ),
+}
+
 # Comparé en minuscules, points de fin retirés.
-HALLUCINATION_PATTERNS = (
-    "sous-titres réalisés par",
-    "sous-titres fait par",
-    "sous-titrage st'",
-    "sous-titrage société radio",
-    "sous-titres faits par",
-    "❤️ par sous-titres",
-    "amara.org",
-    "merci d'avoir regardé",
-    "merci de votre attention",
-    "merci à tous",
-    "abonnez-vous",
-    "n'oubliez pas de vous abonner",
-    "à la prochaine",
-    "thanks for watching",
-    "thank you for watching",
-    "subscribe to",
-    "please subscribe",
-    "like and subscribe",
-)
+HALLUCINATION_PATTERNS = tuple(p for rules in LANGUAGES.values() for p in rules.hallucinations)
+
+
+def _alternation(phrases) -> str:
+    """Alternative regex factorisée en arbre de préfixes : à chaque position,
+    le moteur ne suit que la branche du caractère lu au lieu d'essayer chaque
+    phrase — l'équivalent, en une expression, d'un automate d'Aho-Corasick
+    pour une simple recherche de présence."""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def walk(node: dict) -> str:
+        if "" in node:  # une phrase finit ici : la présence est acquise
+            return ""
+        branches = [re.escape(char) + walk(child) for char, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return walk(trie)
+
+
+_HALLUCINATION = re.compile(_alternation(HALLUCINATION_PATTERNS))
+# Sur du bruit, un modèle qui déraille boucle sur le même token.
+_REPETITION = re.compile(r"\b(\w{2,})\b(?:\W+\1\b){3,}", re.IGNORECASE)
+
+_HESITATIONS = "|".join(h for rules in LANGUAGES.values() for h in rules.hesitations)
+_HESITATION = re.compile(rf"\b(?:{_HESITATIONS})\b", re.IGNORECASE)
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.!?;:])")
+# Espace après la ponctuation — sauf entre deux chiffres, pour ne pas casser
+# les nombres (« 2,5 », « 3.14 »).
+_SPACE_AFTER_PUNCT = re.compile(r"((?<!\d)[,.!?;:]|[,.!?;:](?!\d))\s*")
+# Apostrophes et traits d'union recollés (« qu ' on », « est - ce ») ; la
+# lettre de droite reste hors du match pour pouvoir ouvrir le suivant
+# (« n ' est - ce »).
+_JOINER = re.compile(r"([a-z])\s*(['-])\s*(?=[a-z])", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+# Ponctuation orpheline en tête après suppression d'une hésitation
+# (« Euh, oui » → « , oui ») : retirée avant de capitaliser.
+_LEADING_PUNCT = re.compile(r"^[\s,;:]+")
+_SENTENCE_START = re.compile(r"([.!?])(\s+)(\w)")
+
+
+def _capitalize(match: re.Match) -> str:
+    return match.group(1) + match.group(2) + match.group(3).upper()
+
+
+@cache
+def _word_fixes(language: str | None):
+    """Réécriture des mots de *language* en une passe, ou None s'il n'en a pas.
+    Compilée à la première demande, puis gardée."""
+    rules = LANGUAGES.get(language)
+    if rules is None or not (rules.exact_words or rules.words):
+        return None
+    exact = dict(rules.exact_words)
+    loose = {word.lower(): fixed for word, fixed in rules.words}
+    alternatives = [re.escape(w) for w in exact]
+    if loose:
+        alternatives.append("(?i:" + "|".join(re.escape(w) for w in loose) + ")")
+    pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
+
+    def fix(match: re.Match) -> str:
+        word = match.group()
+        return exact[word] if word in exact else loose[word.lower()]
+
+    return lambda text: pattern.sub(fix, text)
 
 
 def is_hallucination(text: str) -> bool:
@@ -35,13 +142,7 @@ def is_hallucination(text: str) -> bool:
     if not text:
         return True
     normalized = text.lower().strip().rstrip(".!?")
-    if any(pattern in normalized for pattern in HALLUCINATION_PATTERNS):
-        return True
-    # Repetition detector: any word repeated 4+ times in a row → hallucination.
-    # Sur du bruit, un modèle qui déraille boucle sur le même token.
-    if re.search(r"\b(\w{2,})\b(?:\W+\1\b){3,}", normalized, flags=re.IGNORECASE):
-        return True
-    return False
+    return bool(_HALLUCINATION.search(normalized) or _REPETITION.search(normalized))
 
 
 def postprocess_text(text: str, language: str = None) -> str:
@@ -52,63 +153,33 @@ def postprocess_text(text: str, language: str = None) -> str:
     - Capitalization after periods
     - Removal of hesitations (uh, um, etc.)
     - Proper spacing around punctuation
-    - Number formatting
+    - Language-specific word fixes (cf. LANGUAGES)
     """
     if not text or not text.strip():
         return text
+    return _postprocess(text, _word_fixes(language))
 
-    # Remove common hesitations/fillers.
-    # NB: pas de « eh/ah/oh » ici — mots légitimes en français (« eh bien »,
-    # « ah bon »).
-    hesitations = [
-        r'\b(euh|euuh|heu|heuu)\b',  # French
-        r'\b(uh|uhh|um|umm|hmm|huh)\b',  # English
-    ]
-    for pattern in hesitations:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-
-    # Fix spacing around punctuation
-    text = re.sub(r'\s+([,.!?;:])', r'\1', text)  # Remove space before punctuation
-    # Add space after punctuation — sauf entre deux chiffres, pour ne pas
-    # casser les nombres (« 2,5 », « 3.14 »).
-    text = re.sub(r'((?<!\d)[,.!?;:]|[,.!?;:](?!\d))\s*', r'\1 ', text)
-
-    # Fix French apostrophes (e.g., "qu ' on" -> "qu'on")
-    text = re.sub(r"([a-z])\s*'\s*([a-z])", r"\1'\2", text, flags=re.IGNORECASE)
 
-    # Fix hyphens (e.g., "est - ce" -> "est-ce")
-    text = re.sub(r"([a-z])\s*-\s*([a-z])", r"\1-\2", text, flags=re.IGNORECASE)
+def postprocess_many(texts, language: str = None) -> list[str]:
+    """`postprocess_text` sur un lot (historique retraité d'un bloc), les
+    règles de la langue n'étant résolues qu'une fois."""
+    fixes = _word_fixes(language)
+    return [_postprocess(t, fixes) if t and t.strip() else t for t in texts]
 
-    text = re.sub(r'\s+', ' ', text)  # Remove multiple spaces
 
-    # Ponctuation orpheline en tête après suppression d'une hésitation
-    # (« Euh, oui » → « , oui ») : on la retire avant de capitaliser.
-    text = re.sub(r'^[\s,;:]+', '', text)
-
-    # Capitalize first letter
-    text = text.strip()
+def _postprocess(text: str, fixes) -> str:
+    text = _HESITATION.sub("", text)
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _SPACE_AFTER_PUNCT.sub(r"\1 ", text)
+    text = _JOINER.sub(r"\1\2", text)
+    text = _SPACES.sub(" ", text)
+    text = _LEADING_PUNCT.sub("", text).strip()
     if text:
         text = text[0].upper() + text[1:]
-
-    # Capitalize after sentence-ending punctuation (Unicode-aware, preserve space)
-    def capitalize_after_period(match):
-        return match.group(1) + match.group(2) + match.group(3).upper()
-
-    text = re.sub(r'([.!?])(\s+)(\w)', capitalize_after_period, text, flags=re.UNICODE)
-
-    # Language-specific improvements
-    if language == 'en':
-        # Capitalize "I" pronoun
-        text = re.sub(r'\bi\b', 'I', text)
-        # Common contractions
-        text = re.sub(r"\bim\b", "I'm", text, flags=re.IGNORECASE)
-        text = re.sub(r"\bdont\b", "don't", text, flags=re.IGNORECASE)
-        text = re.sub(r"\bcant\b", "can't", text, flags=re.IGNORECASE)
-
-    # Remove trailing spaces
-    text = text.strip()
-
-    return text
+    text = _SENTENCE_START.sub(_capitalize, text)
+    if fixes is not None:
+        text = fixes(text)
+    return text.strip()
 
 
 def format_for_display(text: str) -> str:
@@ -117,9 +188,4 @@ def format_for_display(text: str) -> str:
     """
     if not text or not text.strip():
         return text
-
-    # Just clean up spacing
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-
-    return text
+    return _SPACES.sub(" ", text).strip()
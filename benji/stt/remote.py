@@ -4,7 +4,8 @@ events de transcription vers `display_queue` (cf. docs/api-contract.md §3).
 Bypasse VAD + moteur local : en mode `STTConfig.stt_provider = "remote"`, le
 backend fait la transcription (Deepgram). Le client ne fait que convertir
 l'audio en PCM 16-bit et router les events du contrat — qui parlent déjà le
-vocabulaire de `display_queue` (`vad_status`/`segment_start`/`word`/`final_text`).
+vocabulaire de `display_queue` (`vad_status`/`segment_start`/`word`/
+`partial_snapshot`/`final_text`).
 """
 
 from __future__ import annotations
@@ -20,8 +21,10 @@ import numpy as np
 
 log = logging.getLogger(__name__)
 
-# Events de transcription relayés tels quels vers l'UI.
-_RELAYED = {"vad_status", "segment_start", "word", "final_text"}
+# Events de transcription relayés tels quels vers l'UI. `partial_snapshot`
+# (hypothèse entière en un message) et `segment_start` + `word` (mot à mot)
+# sont compris l'un comme l'autre par l'overlay et l'onglet Live.
+_RELAYED = {"vad_status", "segment_start", "word", "partial_snapshot", "final_text"}
 
 
 def _http_to_ws(url: str) -> str:
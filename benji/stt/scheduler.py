@@ -0,0 +1,135 @@
+"""Ordonnanceur de `transcribe_queue` : finales prioritaires, partielles fusionnées.
+
+Une `Queue(maxsize=3)` FIFO traitait toutes les demandes de la même façon :
+
+- une finale longue (Whisper medium) laissait s'empiler les partielles de
+  l'énoncé suivant, décodées ensuite une à une alors qu'elles étaient déjà
+  périmées ;
+- pleine, la queue faisait attendre le VAD jusqu'à 2 s sur une finale, puis
+  la jetait (`transcribe_queue_full`) : du texte perdu pour de bon.
+
+Ici chaque demande a sa file :
+
+- **finales** : FIFO, servies avant tout le reste, jamais refusées ;
+- **spéculatives** (cf. `VADProcessor._speculate`) : une seule en attente par
+  source, la plus récente gagne ;
+- **partielles** : une seule en attente par source (≈ par segment en cours), la
+  plus récente remplace la précédente sans perdre sa place dans le tour.
+
+L'arrivée d'une finale périme ce qui attend encore pour la même source : elle
+décode le segment entier. L'ordonnanceur imite la face de `Queue` dont se
+servent le VAD et le `Transcriber` (`put`, `put_nowait`, `get`, `get_nowait`,
+`empty`, `qsize`, `put(None)` pour l'arrêt) ; l'attente de chaque demande est
+versée dans `SessionStats` (étape `queue_wait`, par type).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+def _kind(item: dict) -> str:
+    if not item["is_final"]:
+        return "partial"
+    return "speculative" if item.get("speculative") else "final"
+
+
+class TranscribeScheduler:
+    def __init__(self, stats=None):
+        self.stats = stats
+        self._cond = threading.Condition()
+        # Entrées : (instant de dépôt, demande).
+        self._finals: deque[tuple[float, dict]] = deque()
+        self._speculative: OrderedDict[str | None, tuple[float, dict]] = OrderedDict()
+        self._partials: OrderedDict[str | None, tuple[float, dict]] = OrderedDict()
+        self._closed = False
+        self.coalesced = 0  # demandes remplacées ou rendues caduques avant décodage
+        self.last_wait_ms: float | None = None  # attente de la dernière demande servie
+
+    # --- producteur (VAD) ---
+
+    def put(self, item, block: bool = True, timeout: float | None = None) -> None:
+        """Dépose *item* sans jamais bloquer ni refuser ; None = fin de flux,
+        rendue une fois les finales en attente servies."""
+        with self._cond:
+            if item is None:
+                self._closed = True
+            else:
+                self._add(item)
+            self._cond.notify()
+
+    def put_nowait(self, item) -> None:
+        self.put(item, block=False)
+
+    def _add(self, item: dict) -> None:
+        now = time.monotonic()
+        source = item.get("source")
+        kind = _kind(item)
+        if kind == "final":
+            # Le segment entier va être décodé : ce qui attend pour lui est caduc.
+            self._drop(self._partials, source)
+            self._drop(self._speculative, source)
+            self._finals.append((now, item))
+            return
+        if kind == "speculative":
+            self._drop(self._partials, source)
+            slots = self._speculative
+        else:
+            slots = self._partials
+        if source in slots:
+            # La plus récente gagne, à la place de l'ancienne dans le tour.
+            self.coalesced += 1
+            slots[source] = (slots[source][0], item)
+        else:
+            slots[source] = (now, item)
+
+    def _drop(self, slots: OrderedDict, source) -> None:
+        if slots.pop(source, None) is not None:
+            self.coalesced += 1
+
+    # --- consommateur (Transcriber) ---
+
+    def get(self, block: bool = True, timeout: float | None = None) -> dict | None:
+        """Rend la demande la plus prioritaire ; None une fois clos et vidé des
+        finales. Lève `queue.Empty` si rien n'arrive avant *timeout*."""
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                entry = self._pop()
+                if entry is not None:
+                    break
+                if self._closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    raise queue.Empty
+                self._cond.wait(remaining)
+        queued_at, item = entry
+        self.last_wait_ms = (time.monotonic() - queued_at) * 1000
+        if self.stats is not None:
+            self.stats.record_stage(_kind(item), "queue_wait", self.last_wait_ms)
+        return item
+
+    def get_nowait(self) -> dict | None:
+        return self.get(block=False)
+
+    def _pop(self) -> tuple[float, dict] | None:
+        if self._finals:
+            return self._finals.popleft()
+        if self._closed:
+            # À l'arrêt, seules les finales comptent : le reste n'a plus d'écran.
+            return None
+        for slots in (self._speculative, self._partials):
+            if slots:
+                return slots.popitem(last=False)[1]
+        return None
+
+    def qsize(self) -> int:
+        with self._cond:
+            return len(self._finals) + len(self._speculative) + len(self._partials)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
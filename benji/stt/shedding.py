@@ -0,0 +1,118 @@
+"""Délestage du moteur final quand le thread STT ne suit plus.
+
+Whisper medium tient la cadence d'une réunion sur un Mac au repos ; sur un M1
+de base qui fait tourner la visio, ou bridé thermiquement après une heure, une
+finale peut coûter plus que l'audio qu'elle couvre. Les finales s'empilent
+alors dans `transcribe_queue`, leur latence grimpe sans fin et, avec une queue
+bornée, des segments finissent jetés. Mieux vaut un final français un peu moins
+bon qu'un segment perdu.
+
+`LoadShedder` suit, pour chaque finale, son attente en queue et son facteur
+temps réel (durée du décodage / durée de l'audio) et descend d'un barreau
+l'échelle des moteurs dès que l'un des deux dépasse son seuil sur deux finales
+de suite. Le RTF d'une finale courte ne compte pas : Whisper décode une
+fenêtre fixe de 30 s quelle que soit la durée de l'audio, et deux « Oui. »
+d'affilée dépassent le seuil file vide — seules les finales d'au moins
+`min_rtf_audio_s` le mesurent vraiment.
+
+    whisper medium → whisper small → parakeet (le moteur des partielles)
+
+Il remonte d'un barreau quand la file s'est vidée — `recover_after` finales
+de suite servies presque sans attente — et au plus une fois par `cooldown_s` :
+le moteur plus lourd vient de prouver qu'il ne tenait pas, on ne le rappelle
+pas à la première accalmie. Le `Transcriber` charge chaque moteur au premier
+besoin et le garde chaud ensuite (cf. `Transcriber._final_engine`).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from benji.config import STTConfig
+
+
+@dataclass(frozen=True)
+class Rung:
+    engine: str  # "whisper" ou "parakeet"
+    model_size: str | None = None
+
+    @property
+    def label(self) -> str:
+        return self.engine if self.model_size is None else f"{self.engine} {self.model_size}"
+
+
+def engine_ladder(config: STTConfig) -> list[Rung]:
+    """Barreaux du moteur configuré au plus léger ; un seul si rien à délester."""
+    if config.final_engine != "whisper":
+        return [Rung("parakeet")]
+    rungs = [Rung("whisper", config.final_model_size)]
+    for size in config.final_shedding_sizes:
+        if size != config.final_model_size:
+            rungs.append(Rung("whisper", size))
+    rungs.append(Rung("parakeet"))
+    return rungs
+
+
+class LoadShedder:
+    def __init__(
+        self,
+        rungs: list[Rung],
+        shed_queue_wait_ms: float = 2000.0,
+        shed_rtf: float = 0.6,
+        min_rtf_audio_s: float = 5.0,
+        recover_queue_wait_ms: float = 300.0,
+        recover_after: int = 8,
+        cooldown_s: float = 60.0,
+        clock=time.monotonic,
+    ):
+        self.rungs = rungs
+        self.shed_queue_wait_ms = shed_queue_wait_ms
+        self.shed_rtf = shed_rtf
+        self.min_rtf_audio_s = min_rtf_audio_s
+        self.recover_queue_wait_ms = recover_queue_wait_ms
+        self.recover_after = recover_after
+        self.cooldown_s = cooldown_s
+        self._clock = clock
+        self.level = 0  # indice du barreau courant, 0 = moteur configuré
+        self._overloaded = 0  # finales en surcharge d'affilée
+        self._calm = 0  # finales servies sans attente d'affilée
+        self._changed_at = clock()
+
+    @property
+    def rung(self) -> Rung:
+        return self.rungs[self.level]
+
+    def observe(self, queue_wait_ms: float | None, rtf: float | None,
+                audio_s: float | None = None) -> Rung | None:
+        """Verse les mesures d'une finale de *audio_s* secondes ; rend le
+        nouveau barreau en cas de changement, None sinon. Une mesure absente
+        (queue sans horodatage, décodage repris d'un cache) ne pèse ni dans un
+        sens ni dans l'autre ; le RTF d'une finale plus courte que
+        `min_rtf_audio_s` non plus."""
+        if audio_s is not None and audio_s < self.min_rtf_audio_s:
+            rtf = None
+        overloaded = (
+            (queue_wait_ms is not None and queue_wait_ms > self.shed_queue_wait_ms)
+            or (rtf is not None and rtf > self.shed_rtf)
+        )
+        if overloaded:
+            self._calm = 0
+            self._overloaded += 1
+            if self._overloaded >= 2 and self.level < len(self.rungs) - 1:
+                return self._move(+1)
+            return None
+        self._overloaded = 0
+        if queue_wait_ms is not None and queue_wait_ms < self.recover_queue_wait_ms:
+            self._calm += 1
+        if (self.level > 0 and self._calm >= self.recover_after
+                and self._clock() - self._changed_at >= self.cooldown_s):
+            return self._move(-1)
+        return None
+
+    def _move(self, step: int) -> Rung:
+        self.level += step
+        self._overloaded = 0
+        self._calm = 0
+        self._changed_at = self._clock()
+        return self.rung
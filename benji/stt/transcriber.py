@@ -1,19 +1,67 @@
+import hashlib
 import logging
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from queue import Full, Queue
+from queue import Empty, Full, Queue
 
 import numpy as np
 
 from benji.config import STTConfig
 
 log = logging.getLogger(__name__)
+from benji import meetings
 from benji.history import TranscriptionHistory
 from benji.stats import SessionStats
 from benji.stt.backend import build_backend, build_final_backend
-from benji.stt.diarization import build_tagger
+from benji.stt.diarization import (
+    PyannoteSpeakerTagger,
+    SlidingWindowDiarizer,
+    attach_speakers,
+    build_tagger,
+    dominant_speaker,
+)
+from benji.stt.diarization_worker import ProcessDiarizer
 from benji.stt.postprocessing import is_hallucination, postprocess_text
+from benji.stt.scheduler import TranscribeScheduler
+from benji.stt.shedding import LoadShedder, Rung, engine_ladder
+
+# Taggers qui rendent des tours de parole porteurs de voix (cf. _label_speaker).
+_TURN_TAGGERS = (SlidingWindowDiarizer, PyannoteSpeakerTagger, ProcessDiarizer)
+
+
+def _shift(t: float | None, offset_s: float) -> float | None:
+    return None if t is None else t + offset_s
+
+
+# Finales corrigées ensemble au plus (cf. _corrector_loop) : borne la taille
+# du prompt, donc la latence de la correction de la plus ancienne.
+_CORRECTION_BATCH = 8
+
+
+def _snapshot(words: list[dict], committed: int, source: str | None = None) -> dict:
+    """Message d'affichage d'une hypothèse entière : un seul `put` par passe.
+
+    Les `committed` premiers mots sont acquis (cf. _run_partial) ; le reste
+    peut encore changer. Un `word` par mot remplissait `display_queue`
+    (maxsize=10) dès la onzième parole d'une partielle, et le thread STT
+    attendait alors que l'UI, qui la vide toutes les 16 ms, lui fasse de la
+    place.
+
+    `source` = flux d'où vient l'hypothèse (plusieurs flux segmentés côte à
+    côte) : l'UI n'efface les partielles que sur un abandon du même flux.
+    """
+    msg = {
+        "type": "partial_snapshot",
+        "committed": committed,
+        "words": [
+            {"text": w["text"], "start": w.get("start"), "end": w.get("end")}
+            for w in words
+        ],
+    }
+    if source is not None:
+        msg["source"] = source
+    return msg
 
 
 class Transcriber:
@@ -24,13 +72,22 @@ class Transcriber:
         config: STTConfig = None,
         stats: SessionStats | None = None,
         sample_rate: int = 16000,
+        cadence=None,
+        correction_cache=None,
     ):
         self.transcribe_queue = transcribe_queue
+        # A TranscribeScheduler already keeps only the newest partial: nothing
+        # it hands out is stale. A plain Queue needs the skip in run(). Only the
+        # scheduler times how long each request waited (see _shed_load).
+        self._scheduled = isinstance(transcribe_queue, TranscribeScheduler)
+        self._skip_stale = not self._scheduled
         self.display_queue = display_queue
         self.config = config or STTConfig()
         self.history = TranscriptionHistory()
         self.stats = stats
         self.sample_rate = sample_rate
+        # PartialCadence shared with the VAD: fed the cost of every partial pass.
+        self.cadence = cadence
 
         # État de streaming par segment (LocalAgreement-2 sur les passes
         # partielles). On re-décode le tampon **entier** à chaque passe et on
@@ -42,8 +99,25 @@ class Transcriber:
         # n'accepte aucun prompt ; décoder tout est donc à la fois plus simple et
         # plus juste — le modèle voit l'énoncé complet au lieu d'une tranche
         # amputée de son début.
+        #
+        # Sur un énoncé long, ce travail croît pourtant comme le carré de sa
+        # durée. `partial_tail_decode` rétablit une variante sans prompt : seule
+        # la queue est décodée, à partir d'un peu avant la fin du dernier mot
+        # figé (cf. _tail_offset_s), puis recollée au préfixe (cf. _stitch).
         self._committed_words: list[dict] = []
         self._prev_words_norm: list[str] = []
+        # Flux multiples (VAD multi-flux, cf. MultiStreamVADProcessor) : leurs
+        # partielles s'entrelacent dans la queue. L'état ci-dessus est celui de
+        # la source courante ; celui des autres est garé ici.
+        self._source: str | None = None
+        self._parked_partials: dict[str | None, tuple[list[dict], list[str]]] = {}
+        # Finale spéculative décodée d'avance, par source : (id VAD, mots bruts,
+        # RTF de son décodage — repris par le délestage si elle sert).
+        self._speculations: dict[str | None, tuple[int, list[dict], float | None]] = {}
+        # Dernier décodage complet d'une partielle, par source : (clé, mots).
+        # Quand le moteur final est celui des partielles et que la finale ne
+        # fait qu'ajouter du silence, ses mots sont repris tels quels.
+        self._decode_cache: dict[str | None, tuple[tuple, list[dict]]] = {}
 
         # Async LLM correction: raw finals are shown immediately, then corrected
         # off-thread (see _corrector_loop) so the STT loop never blocks on the LLM.
@@ -52,6 +126,14 @@ class Transcriber:
         self._segment_seq: int = 0
         self._correction_queue: Queue | None = None
         self._corrector_thread: threading.Thread | None = None
+        # Écritures du correcteur vs lecture des voix en fin de réunion (cf.
+        # _recluster_voices).
+        self._history_lock = threading.Lock()
+        # CorrectionCache devant le LLM : les énoncés courts déjà corrigés
+        # (« Oui. », « D'accord. ») n'y repassent pas.
+        self.correction_cache = correction_cache
+        if correction_cache is not None:
+            self.history.caches.append(correction_cache)
 
         # Diarisation optionnelle (pitch ou pyannote). Le tagger n'a besoin que
         # de l'audio : on le lance *en parallèle* du décodage final au lieu de
@@ -59,15 +141,23 @@ class Transcriber:
         # un état de clustering et ne doit jamais tourner sur deux segments à la
         # fois ; le join a lieu avant de rendre la main, donc pas de recouvrement.
         self._diarizer_pool: ThreadPoolExecutor | None = None
+        # Pré-calcul des fenêtres pendant les partielles (SlidingWindowDiarizer) :
+        # au plus un en vol, une finale ne doit jamais attendre derrière une pile.
+        self._observing = None
         self.tagger = (
             build_tagger(
                 self.config.diarization_backend,
                 max_speakers=self.config.diarization_max_speakers,
+                window_s=self.config.diarization_window_s,
+                hop_s=self.config.diarization_hop_s,
             )
             if self.config.diarization
             else None
         )
 
+        # Fin de réunion : ré-étiquetage de son historique (pyannote seulement).
+        meetings.on_meeting_end(self._recluster_meeting)
+
         # Deux moteurs, un par type de passe (cf. benji/stt/backend.py) : le
         # direct privilégie la latence, le final la garantie de langue.
         self.backend = build_backend(self.config.model)
@@ -80,6 +170,15 @@ class Transcriber:
             "Moteurs prêts — partielles : %s · finale : %s",
             self.backend.name, self.final_backend.name,
         )
+        # Délestage de la passe finale (cf. benji/stt/shedding.py). Les moteurs
+        # des autres barreaux sont chargés au premier besoin, puis gardés
+        # chauds : une remontée ne recharge rien.
+        self._shedder: LoadShedder | None = None
+        self._final_engines: dict[Rung, object] = {}
+        ladder = engine_ladder(self.config)
+        if self.config.final_shedding and len(ladder) > 1:
+            self._shedder = LoadShedder(ladder)
+            self._final_engines[ladder[0]] = self.final_backend
 
     def warmup(self) -> None:
         """Décodage à blanc pour amortir la compilation des noyaux Metal.
@@ -88,22 +187,72 @@ class Transcriber:
         chargement (`mx.eval` des poids) : ce préchauffage-ci ne sert plus qu'à
         payer la compilation avant la première vraie phrase, pas après.
         """
-        silence = np.zeros(self.sample_rate, dtype=np.float32)
         for backend in {id(self.backend): self.backend,
                         id(self.final_backend): self.final_backend}.values():
-            try:
-                t0 = time.monotonic()
-                for _ in backend.transcribe(silence):
-                    pass
-                log.info("Préchauffage de %s en %.0f ms",
-                         backend.name, (time.monotonic() - t0) * 1000)
-            except Exception as e:
-                log.warning("Préchauffage de %s ignoré : %s", backend.name, e)
+            self._warm(backend)
+
+    def _warm(self, backend) -> None:
+        silence = np.zeros(self.sample_rate, dtype=np.float32)
+        try:
+            t0 = time.monotonic()
+            for _ in backend.transcribe(silence):
+                pass
+            log.info("Préchauffage de %s en %.0f ms",
+                     backend.name, (time.monotonic() - t0) * 1000)
+        except Exception as e:
+            log.warning("Préchauffage de %s ignoré : %s", backend.name, e)
+
+    def _final_engine(self, rung: Rung):
+        """Moteur du barreau *rung*, chargé et préchauffé au premier appel.
+
+        Appelé depuis le thread STT, comme le constructeur : les moteurs MLX se
+        lient au stream du thread qui les charge (cf. ParakeetBackend).
+        """
+        engine = self._final_engines.get(rung)
+        if engine is None:
+            engine = build_final_backend(
+                rung.engine, rung.model_size, self.config.language
+            ) or self.backend
+            if engine is not self.backend:
+                self._warm(engine)
+            self._final_engines[rung] = engine
+        return engine
+
+    def _shed_load(self, queue_wait_ms: float | None, rtf: float | None,
+                   audio_s: float | None = None) -> None:
+        """Verse les mesures d'une finale au délesteur ; change de moteur final
+        s'il le décide."""
+        if self._shedder is None:
+            return
+        before, level = self._shedder.rung, self._shedder.level
+        rung = self._shedder.observe(queue_wait_ms, rtf, audio_s)
+        if rung is None:
+            return
+        wait = "n/a" if queue_wait_ms is None else f"{queue_wait_ms:.0f} ms"
+        ratio = "n/a" if rtf is None else f"{rtf:.2f}"
+        if self._shedder.level > level:
+            log.warning("STT en retard (attente %s, RTF %s) : passe finale %s → %s",
+                        wait, ratio, before.label, rung.label)
+        else:
+            log.info("File résorbée : passe finale %s → %s", before.label, rung.label)
+        self.final_backend = self._final_engine(rung)
+        if self.stats is not None:
+            self.stats.record_final_engine(rung.label)
 
     def _reset_partial_state(self) -> None:
         self._committed_words = []
         self._prev_words_norm = []
 
+    def _switch_source(self, source: str | None) -> None:
+        """Gare l'état d'accord de la source courante et reprend celui de *source*."""
+        if source == self._source:
+            return
+        self._parked_partials[self._source] = (self._committed_words, self._prev_words_norm)
+        self._committed_words, self._prev_words_norm = self._parked_partials.pop(
+            source, ([], [])
+        )
+        self._source = source
+
     @staticmethod
     def _norm(text: str) -> str:
         """Normalize a word for cross-partial agreement comparison.
@@ -137,7 +286,21 @@ class Transcriber:
         gain = min(target / peak, 8.0)  # Cap gain at 8x to limit noise blow-up
         return (audio * gain).astype(np.float32, copy=False)
 
-    def _run_partial(self, audio: np.ndarray) -> None:
+    def _cache_key(self, backend, audio: np.ndarray, speech_end: int | None) -> tuple:
+        """Identité d'un décodage : moteur + parole du tampon, silence final exclu.
+
+        *speech_end* (fourni par le VAD) borne la parole ; l'empreinte porte
+        sur un échantillon sur 16 de cette portion — de quoi distinguer deux
+        tampons du même flux pour le coût d'un hachage de quelques Ko.
+        """
+        end = len(audio) if speech_end is None else min(speech_end, len(audio))
+        digest = hashlib.blake2b(
+            np.ascontiguousarray(audio[:end:16]).tobytes(), digest_size=16
+        ).digest()
+        return id(backend), end, digest
+
+    def _run_partial(self, audio: np.ndarray, trace: dict | None = None,
+                     speech_end: int | None = None) -> None:
         """Re-décode le tampon entier et stabilise l'affichage par LocalAgreement-2.
 
         Le préfixe sur lequel deux passes successives tombent d'accord est
@@ -150,11 +313,30 @@ class Transcriber:
         déroutant que de laisser une petite erreur que la passe finale corrigera.
         """
         start_t = time.monotonic()
+        raw = audio
+        self._observe_speakers(raw)
         audio = self._apply_agc(audio)
-        if len(audio) < int(0.3 * self.sample_rate):
+        offset_s = self._tail_offset_s()
+        offset = int(offset_s * self.sample_rate)
+        if len(audio) - offset < int(0.3 * self.sample_rate):
             return  # trop court pour valoir une passe
 
-        words = list(self.backend.transcribe(audio))
+        if offset:
+            tail = [
+                dict(w, start=_shift(w.get("start"), offset_s), end=_shift(w.get("end"), offset_s))
+                for w in self.backend.transcribe(audio[offset:])
+            ]
+            words = self._stitch(self._committed_words, tail)
+        else:
+            words = list(self.backend.transcribe(audio))
+            if words and self.final_backend is self.backend:
+                self._decode_cache[self._source] = (
+                    self._cache_key(self.backend, raw, speech_end), words
+                )
+        if self.cadence is not None:
+            # Même une passe sans mot a occupé le thread : elle compte.
+            self.cadence.record((time.monotonic() - start_t) * 1000,
+                                (len(audio) - offset) / self.sample_rate)
         if not words:
             return
 
@@ -165,12 +347,12 @@ class Transcriber:
         self._prev_words_norm = norm
 
         # Redessine l'instantané : préfixe acquis, puis meilleure hypothèse.
-        self.display_queue.put({"type": "segment_start"})
-        for w in self._committed_words + words[len(self._committed_words):]:
-            self.display_queue.put({
-                "type": "word", "text": w["text"],
-                "start": w.get("start"), "end": w.get("end"),
-            })
+        committed = len(self._committed_words)
+        msg = _snapshot(self._committed_words + words[committed:], committed, self._source)
+        if trace is not None:
+            trace["stt_out"] = time.monotonic()
+            msg["trace"] = trace
+        self.display_queue.put(msg)
 
         if self.stats is not None:
             latency_ms = (time.monotonic() - start_t) * 1000
@@ -178,14 +360,110 @@ class Transcriber:
                 len(audio) / self.sample_rate, latency_ms, is_final=False
             )
 
-    def _run_segment(self, audio: np.ndarray, is_final: bool):
+    def _tail_offset_s(self) -> float:
+        """Début de la tranche à décoder en mode queue seule (0 = tout le tampon).
+
+        On repart `partial_tail_overlap_s` avant la fin du dernier mot figé :
+        le modèle retrouve un peu de contexte, et un mot figé coupé en deux par
+        la tranche est recouvert en entier (cf. _stitch).
+        """
+        if not self.config.partial_tail_decode or not self._committed_words:
+            return 0.0
+        end = self._committed_words[-1].get("end")
+        if end is None:
+            return 0.0  # moteur sans horodatage : pas de point d'ancrage sûr
+        return max(0.0, end - self.config.partial_tail_overlap_s)
+
+    def _stitch(self, committed: list[dict], tail: list[dict]) -> list[dict]:
+        """Recolle les mots d'une tranche au préfixe figé, sans doublon.
+
+        La tranche recouvre la fin du préfixe : ses mots qui finissent avant la
+        fin du dernier mot figé sont des redites (ou des fragments du mot coupé
+        par la tranche) et tombent ; puis les premiers mots restants qui répètent
+        la fin du préfixe — un mot à cheval, daté un peu plus tard — aussi.
+        """
+        if not committed:
+            return tail
+        # Demi-mot de tolérance : deux passes ne datent pas un mot à l'identique.
+        boundary = committed[-1]["end"] - 0.1
+        fresh = [w for w in tail if w.get("end") is None or w["end"] > boundary]
+        prefix = [self._norm(w["text"]) for w in committed]
+        new = [self._norm(w["text"]) for w in fresh]
+        overlap = 0
+        for k in range(min(len(prefix), len(new)), 0, -1):
+            if prefix[-k:] == new[:k]:
+                overlap = k
+                break
+        return committed + fresh[overlap:]
+
+    def _run_segment(self, audio: np.ndarray, is_final: bool, trace: dict | None = None,
+                     speculation: int | None = None, speech_end: int | None = None,
+                     queue_wait_ms: float | None = None):
+        """Passe partielle, ou finale. Pour une finale, *speculation* est l'id de
+        la finale spéculative dont le VAD garantit qu'elle couvre la même parole :
+        si elle a été décodée, ses mots sont repris tels quels (cf. _speculate).
+        À défaut, les mots de la dernière partielle sont repris si elle a décodé
+        exactement la même parole avec le même moteur (cf. _cache_key).
+        *queue_wait_ms* et le RTF d'un vrai décodage nourrissent le délestage."""
         if not is_final:
-            self._run_partial(audio)
+            self._run_partial(audio, trace, speech_end)
             return
 
         start_t = time.monotonic()
-        audio = self._apply_agc(audio)
-
+        cached = self._decode_cache.pop(self._source, None)
+        spec_id, words, rtf = self._speculations.pop(self._source, (None, None, None))
+        if speculation is not None and spec_id == speculation:
+            if self.stats is not None:
+                self.stats.record_speculation(hit=True)
+        else:
+            if spec_id is not None and self.stats is not None:
+                # La parole a repris après la spéculation : décodage perdu.
+                self.stats.record_speculation(hit=False)
+            words = rtf = None
+            if cached is not None:
+                key, cached_words = cached
+                hit = key == self._cache_key(self.final_backend, audio, speech_end)
+                words = cached_words if hit else None
+                if self.stats is not None:
+                    self.stats.record_decode_cache(hit)
+        # Le locuteur n'est étiqueté qu'ici, jamais à la spéculation : le
+        # clustering a un état, une spéculation perdue l'aurait déjà nourri.
+        result, decode_rtf = self._decode_final(audio, stream=True, words=words)
+        rtf = decode_rtf if decode_rtf is not None else rtf
+        self._finish_final(result, len(audio), start_t, trace)
+        self._shed_load(queue_wait_ms, rtf, len(audio) / self.sample_rate)
+
+    def _speculate(self, audio: np.ndarray, speculation: int) -> None:
+        """Décode d'avance une finale spéculative, sans rien afficher.
+
+        Le VAD l'émet dès le début du silence de fin (`speculative_final_ms`),
+        bien avant de fermer le segment : le décodage tient dans l'attente des
+        `silence_duration_ms`. Les mots bruts sont gardés pour la source
+        courante ; la vraie finale les reprend si la parole n'a pas repris
+        entre-temps, et n'étiquette le locuteur qu'à ce moment-là.
+        """
+        words, rtf = self._transcribe_final(audio)
+        self._speculations[self._source] = (speculation, words, rtf)
+
+    def _transcribe_final(self, audio: np.ndarray) -> tuple[list[dict], float | None]:
+        """Mots du moteur final et RTF de ce seul appel (cf. _shed_load)."""
+        decode_t = time.monotonic()
+        words = list(self.final_backend.transcribe(self._apply_agc(audio)))
+        rtf = (time.monotonic() - decode_t) / (len(audio) / self.sample_rate) if len(audio) else None
+        return words, rtf
+
+    def _decode_final(self, audio: np.ndarray, stream: bool, words: list[dict] | None = None
+                      ) -> tuple[dict | None, float | None]:
+        """Décodage final + post-traitement + locuteur : (résultat, RTF).
+        Résultat None = aucun mot ; RTF du seul appel au moteur (l'attente du
+        locuteur n'y entre pas), None sans décodage.
+
+        *audio* est le tampon brut : le diarizer le voit tel quel (mêmes
+        fenêtres que pendant les partielles, cf. _observe_speakers), le moteur
+        après AGC. *stream* : affiche les mots bruts dès la fin du décodage,
+        avant le post-traitement et le locuteur. *words* : mots déjà décodés
+        (cache, spéculation), le moteur n'est alors pas appelé.
+        """
         # Diarisation lancée AVANT le décodage : elle ne dépend que de l'audio.
         # Enchaînée après, son coût (embedding pyannote) s'ajoutait tel quel au
         # délai avant affichage du texte final ; en parallèle, il est absorbé par
@@ -196,22 +474,16 @@ class Transcriber:
                 self._label_speaker, audio, self.sample_rate
             )
 
-        self.display_queue.put({"type": "segment_start"})
-        words: list[dict] = []
-        for word in self.final_backend.transcribe(audio):
-            words.append(word)
-            self.display_queue.put({
-                "type": "word",
-                "text": word["text"],
-                "start": word.get("start"),
-                "end": word.get("end"),
-            })
+        rtf = None
+        if words is None:
+            words, rtf = self._transcribe_final(audio)
+        if stream:
+            self.display_queue.put(_snapshot(words, len(words), self._source))
 
         if not words:
             if speaker_future is not None:
                 speaker_future.cancel()
-            self._reset_partial_state()
-            return
+            return None, rtf
 
         full_text = postprocess_text(
             " ".join(w["text"] for w in words), language=self.config.language
@@ -219,35 +491,75 @@ class Transcriber:
         if is_hallucination(full_text):
             if speaker_future is not None:
                 speaker_future.cancel()
+            return {"words": words, "text": full_text, "speaker": None,
+                    "hallucination": True}, rtf
+
+        # Étiquette de locuteur (best-effort). Champ structuré, jamais collé dans
+        # le texte, pour que l'UI puisse le colorer par locuteur.
+        speaker = self._await_speaker(speaker_future)
+        turns = voice = None
+        if isinstance(speaker, list):
+            # Tours de parole : chaque mot prend le locuteur du sien, et un
+            # segment où deux personnes se répondent est rendu en plusieurs.
+            words = attach_speakers(words, speaker)
+            speaker = dominant_speaker(speaker)
+            voice = next((w["voice"] for w in words if w["speaker"] == speaker), None)
+            turns = self._split_turns(words)
+        return {"words": words, "text": full_text, "speaker": speaker, "voice": voice,
+                "turns": turns, "hallucination": False}, rtf
+
+    def _split_turns(self, words: list[dict]
+                     ) -> list[tuple[str | None, str, int | None]] | None:
+        """(locuteur, texte post-traité, voix) par tour ; None s'il n'y en a qu'un."""
+        runs: list[tuple[str | None, list[str], int | None]] = []
+        for word in words:
+            if runs and runs[-1][0] == word["speaker"]:
+                runs[-1][1].append(word["text"])
+            else:
+                runs.append((word["speaker"], [word["text"]], word.get("voice")))
+        if len(runs) < 2:
+            return None
+        return [
+            (speaker, postprocess_text(" ".join(texts), language=self.config.language), voice)
+            for speaker, texts, voice in runs
+        ]
+
+    def _finish_final(self, result: dict | None, samples: int, start_t: float,
+                      trace: dict | None) -> None:
+        if result is None:
+            self._reset_partial_state()
+            return
+        if result["hallucination"]:
             # Tell the overlay to drop the streamed (hallucinated) words instead
             # of leaving them on screen.
-            self.display_queue.put({"type": "final_text", "text": "", "drop": True})
+            self._drop_partials()
             self._reset_partial_state()
             return
 
-        # Étiquette de locuteur (best-effort). Champ structuré, jamais collé dans
-        # le texte, pour que l'UI puisse le colorer par locuteur.
-        speaker = self._await_speaker(speaker_future)
-
-        if self.config.llm_correction:
-            # Show the raw transcription immediately, then correct it off-thread
-            # and emit a replacement once ready — the STT loop never blocks on the
-            # LLM. History is written by the corrector (stores the corrected text).
-            self._segment_seq += 1
-            self._emit_final(full_text, speaker, seq=self._segment_seq)
-            self._enqueue_correction(full_text, speaker, self._segment_seq)
-        else:
-            # Replace the streamed (raw) overlay text with the post-processed one.
-            self._emit_final(full_text, speaker)
-            # DEBUG et pas INFO : le log est persisté sur disque et joint aux
-            # rapports de bug — le contenu transcrit ne doit pas y fuiter.
-            log.debug('%s"%s"', f"[{speaker}] " if speaker else "", full_text)
-            self.history.add(full_text, speaker=speaker)
+        # Un segment à plusieurs tours de parole devient une finale par tour.
+        for speaker, full_text, voice in (
+            result.get("turns") or [(result["speaker"], result["text"], result.get("voice"))]
+        ):
+            if self.config.llm_correction:
+                # Show the raw transcription immediately, then correct it off-thread
+                # and emit a replacement once ready — the STT loop never blocks on the
+                # LLM. History is written by the corrector (stores the corrected text).
+                self._segment_seq += 1
+                self._emit_final(full_text, speaker, seq=self._segment_seq, trace=trace)
+                self._enqueue_correction(full_text, speaker, self._segment_seq, voice)
+            else:
+                # Replace the streamed (raw) overlay text with the post-processed one.
+                self._emit_final(full_text, speaker, trace=trace)
+                # DEBUG et pas INFO : le log est persisté sur disque et joint aux
+                # rapports de bug — le contenu transcrit ne doit pas y fuiter.
+                log.debug('%s"%s"', f"[{speaker}] " if speaker else "", full_text)
+                self.history.add(full_text, speaker=speaker, voice=voice)
+            trace = None  # une trace par segment, portée par son premier tour
 
         # Stats
         if self.stats is not None:
             latency_ms = (time.monotonic() - start_t) * 1000
-            audio_seconds = len(audio) / self.sample_rate
+            audio_seconds = samples / self.sample_rate
             self.stats.record_segment(audio_seconds, latency_ms)
 
         # Final closes the segment — partial state resets for the next utterance.
@@ -265,14 +577,72 @@ class Transcriber:
             )
         return self._diarizer_pool
 
-    def _label_speaker(self, audio, sample_rate: int):
-        """Étiquette de locuteur, best-effort : jamais fatale pour le segment."""
+    def _observe_speakers(self, audio: np.ndarray) -> None:
+        """Confie un tampon partiel au diarizer à fenêtres, s'il est libre : ses
+        fenêtres complètes seront déjà encodées quand la finale arrivera."""
+        windowed = isinstance(self.tagger, SlidingWindowDiarizer) or (
+            isinstance(self.tagger, ProcessDiarizer) and self.config.diarization_window_s > 0)
+        if not windowed:
+            return
+        if self._observing is not None and not self._observing.done():
+            return
+        self._observing = self._ensure_diarizer_pool().submit(
+            self._label_speaker, audio, self.sample_rate, observe=True
+        )
+
+    def _label_speaker(self, audio, sample_rate: int, observe: bool = False):
+        """Étiquette de locuteur, best-effort : jamais fatale pour le segment.
+
+        Avec pyannote, rend les tours de parole (list[Turn]) : ils portent la
+        voix de chaque tour, que l'historique garde pour _recluster_meeting.
+        """
         try:
+            if observe:
+                return self.tagger.observe(audio, sample_rate)
+            if isinstance(self.tagger, _TURN_TAGGERS):
+                return self.tagger.turns(audio, sample_rate)
             return self.tagger.label(audio, sample_rate)
         except Exception as e:
             log.warning("Diarisation ignorée : %s", e)
             return None
 
+    def _recluster_meeting(self, meeting_id: str) -> None:
+        """Fin de réunion : regroupe d'un bloc toutes ses voix et réécrit les
+        locuteurs de son historique (cf. SpeakerClusters.recluster).
+
+        L'étiquetage en ligne décide segment par segment, sur ce qu'il a vu
+        jusque-là ; en fin de réunion, toutes les voix sont connues. Appelé par
+        le thread qui clôt la réunion — souvent le thread Qt (« Nouvelle
+        réunion ») : rien n'y est attendu. Le calcul est confié au worker de
+        diarisation, seul à toucher au clustering, et l'historique réécrit
+        quand il a fini (cf. _relabel_meeting).
+        """
+        if not isinstance(self.tagger, _TURN_TAGGERS):
+            return
+        self._ensure_diarizer_pool().submit(
+            self._recluster_voices, meeting_id
+        ).add_done_callback(lambda future: self._relabel_meeting(meeting_id, future))
+
+    def _recluster_voices(self, meeting_id: str) -> tuple[int, dict[int, str]]:
+        # Sous _history_lock : une correction encore en file pour cette réunion
+        # est écrite soit avant (sa voix est lue ici), soit après, et sans voix
+        # (cf. _corrector_loop) — jamais avec une voix que relabel ignorerait.
+        with self._history_lock:
+            voices = [e["voice"] for e in self.history.get_for_meeting(meeting_id)
+                      if "voice" in e]
+        return len(voices), self.tagger.recluster(voices) if voices else {}
+
+    def _relabel_meeting(self, meeting_id: str, future) -> None:
+        try:
+            count, speakers = future.result()
+            if not count:
+                return
+            changed = self.history.relabel(meeting_id, speakers)
+        except Exception as e:
+            log.warning("Re-clustering de fin de réunion abandonné (%s)", e)
+            return
+        log.info("Fin de réunion : %d voix regroupées, %d locuteurs corrigés", count, changed)
+
     def _await_speaker(self, future, timeout: float = 5.0):
         """Récupère l'étiquette calculée en parallèle du décodage.
 
@@ -288,63 +658,102 @@ class Transcriber:
             log.warning("Diarisation abandonnée (%s) — segment sans locuteur", e)
             return None
 
+    def _drop_partials(self) -> None:
+        """Efface de l'UI les mots streamés du segment de la source courante."""
+        msg: dict = {"type": "final_text", "text": "", "drop": True}
+        if self._source is not None:
+            msg["source"] = self._source
+        self.display_queue.put(msg)
+
     def _emit_final(self, text: str, speaker: str | None, *, seq: int | None = None,
-                    corrected: bool = False) -> None:
+                    corrected: bool = False, trace: dict | None = None) -> None:
         """Push a final_text message to the overlay.
 
         `seq` tags the segment so an async correction can be matched back to it;
         `corrected` marks the replacement so the overlay only applies it while the
-        same segment is still displayed.
+        same segment is still displayed. `trace` is the segment's latency trace
+        (see SessionStats.record_trace), stamped here with the end of decoding.
         """
         msg: dict = {"type": "final_text", "text": text}
         if speaker:
             msg["speaker"] = speaker
+        if self._source is not None and not corrected:
+            # Une correction arrive d'un autre thread, la source courante a pu
+            # changer : elle est retrouvée par `seq`, pas par source.
+            msg["source"] = self._source
         if seq is not None:
             msg["seq"] = seq
         if corrected:
             msg["corrected"] = True
+        if trace is not None:
+            trace["stt_out"] = time.monotonic()
+            msg["trace"] = trace
         self.display_queue.put(msg)
 
     def _ensure_corrector(self) -> None:
         if self._corrector_thread is not None and self._corrector_thread.is_alive():
             return
-        self._correction_queue = Queue(maxsize=8)
+        self._correction_queue = Queue(maxsize=4 * _CORRECTION_BATCH)
         self._corrector_thread = threading.Thread(
             target=self._corrector_loop, daemon=True, name="STT-corrector"
         )
         self._corrector_thread.start()
 
-    def _enqueue_correction(self, text: str, speaker: str | None, seq: int) -> None:
+    def _enqueue_correction(self, text: str, speaker: str | None, seq: int,
+                            voice: int | None = None) -> None:
         self._ensure_corrector()
         try:
-            self._correction_queue.put_nowait((seq, text, speaker))
+            self._correction_queue.put_nowait(
+                (seq, text, speaker, voice, meetings.current_meeting().id))
         except Full:
             # Corrector saturated: keep the raw text (already displayed) and
             # persist it now so history has exactly one entry for this segment.
             log.warning("LLM corrector saturated; kept raw text")
-            self.history.add(text, speaker=speaker)
+            self.history.add(text, speaker=speaker, voice=voice)
 
     def _corrector_loop(self) -> None:
         """Background worker: correct queued finals and emit replacements.
 
-        Persists the corrected (or unchanged) text to history so there is exactly
-        one entry per segment — the STT loop deliberately skips history.add when
-        correction is enabled.
+        Drains every final waiting in the queue (up to `_CORRECTION_BATCH`) and
+        corrects them in one generation (see `correct_batch`); each result is
+        matched back to its segment by `seq`. Persists the corrected (or
+        unchanged) text to history so there is exactly one entry per segment —
+        the STT loop deliberately skips history.add when correction is enabled.
         """
-        from benji.llm.corrector import correct
-        while True:
+        from benji.llm.corrector import correct_batch
+        stopping = False
+        while not stopping:
             item = self._correction_queue.get()
             if item is None:
                 break
-            seq, text, speaker = item
+            batch = [item]
+            while len(batch) < _CORRECTION_BATCH:
+                try:
+                    item = self._correction_queue.get_nowait()
+                except Empty:
+                    break
+                if item is None:
+                    stopping = True  # corrige d'abord ce qui est déjà pris
+                    break
+                batch.append(item)
+            texts = [item[1] for item in batch]
             try:
-                corrected = correct(text, language=self.config.language)
+                corrected = correct_batch(texts, language=self.config.language,
+                                          cache=self.correction_cache)
             except Exception as e:
                 log.warning("LLM correction skipped: %s", e)
-                corrected = text
-            self.history.add(corrected, speaker=speaker)
-            log.debug('%s"%s"', f"[{speaker}] " if speaker else "", corrected)
-            self._emit_final(corrected, speaker, seq=seq, corrected=True)
+                corrected = texts
+            if self.correction_cache is not None:
+                self.correction_cache.save()
+            for (seq, _, speaker, voice, meeting_id), text in zip(batch, corrected):
+                with self._history_lock:
+                    # La réunion du segment est finie : son re-clustering a déjà
+                    # lu ses voix, celle-ci ne serait jamais ré-étiquetée.
+                    if meeting_id != meetings.current_meeting_id():
+                        voice = None
+                    self.history.add(text, speaker=speaker, meeting_id=meeting_id, voice=voice)
+                log.debug('%s"%s"', f"[{speaker}] " if speaker else "", text)
+                self._emit_final(text, speaker, seq=seq, corrected=True)
 
     def run(self):
         log.info("Transcription started (incremental streaming)")
@@ -354,10 +763,23 @@ class Transcriber:
                 break
             audio = item["audio"]
             is_final = item["is_final"]
-            if not is_final and not self.transcribe_queue.empty():
+            speculative = item.get("speculative", False)
+            # Une partielle ou une spéculation déjà suivie d'un élément plus
+            # récent est périmée : on saute à la suite.
+            if (self._skip_stale and (not is_final or speculative)
+                    and not self.transcribe_queue.empty()):
                 continue
+            self._switch_source(item.get("source"))
+            trace = item.get("trace")
+            if trace is not None:
+                trace["stt_in"] = time.monotonic()
             try:
-                self._run_segment(audio, is_final)
+                if speculative:
+                    self._speculate(audio, item["speculation"])
+                else:
+                    wait = self.transcribe_queue.last_wait_ms if self._scheduled else None
+                    self._run_segment(audio, is_final, trace, item.get("speculation"),
+                                      item.get("speech_end"), queue_wait_ms=wait)
             except Exception:
                 # A single bad segment should not kill the STT loop.
                 log.exception("STT segment failed (final=%s, %.2fs); skipping",
@@ -366,11 +788,17 @@ class Transcriber:
                     self.stats.record_drop("stt_error")
                 # Ensure the overlay doesn't keep partial words from a failed segment.
                 try:
-                    self.display_queue.put({"type": "final_text", "text": "", "drop": True})
+                    self._drop_partials()
                 except Exception:
                     pass
                 # Reset streaming state so the next segment starts clean.
                 self._reset_partial_state()
         if self._diarizer_pool is not None:
-            self._diarizer_pool.shutdown(wait=False)
+            # À l'arrêt, la dernière réunion vient d'être close : son
+            # re-clustering est peut-être encore en file. On l'attend avant de
+            # fermer le worker, sinon il trouverait la diarisation coupée et ses
+            # locuteurs resteraient ceux de l'étiquetage en ligne.
+            self._diarizer_pool.shutdown(wait=True)
+        if isinstance(self.tagger, ProcessDiarizer):
+            self.tagger.close()
         log.info("Transcription stopped")
@@ -17,9 +17,12 @@ log = logging.getLogger(__name__)
 class DisplayBus(QObject):
     event = pyqtSignal(object)  # le signal porte un dict ou un str
 
-    def __init__(self, queue: Queue, poll_ms: int = 16, parent=None):
+    def __init__(self, queue: Queue, poll_ms: int = 16, parent=None, stats=None):
         super().__init__(parent)
         self._queue = queue
+        # SessionStats (optionnel) : les messages porteurs d'une trace de
+        # latence y sont clos une fois remis aux widgets.
+        self._stats = stats
         # Note: QTimer must not have `self` as parent in PyQt6 6.10+ due to a
         # regression where emitting a signal inside a child-QTimer callback raises
         # "native Qt signal is not callable". Keeping an explicit reference prevents GC.
@@ -56,6 +59,8 @@ class DisplayBus(QObject):
             if item is None:
                 continue
             self._emit_safe(item)
+            if self._stats is not None and isinstance(item, dict) and "trace" in item:
+                self._stats.record_trace(item["trace"])
 
     def _emit_safe(self, item) -> None:
         try:
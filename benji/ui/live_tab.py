@@ -38,6 +38,12 @@ _MAX_CORRECTABLE = 24
 _MAX_ITEMS = 500
 
 
+def _append_word(text: str, word: str) -> str:
+    """Ajoute un mot à la ligne partielle, sans espace avant la ponctuation."""
+    sep = "" if (not text or text.endswith(" ") or word.startswith((".", ",", "!", "?", ";", ":"))) else " "
+    return (text + sep + word).strip()
+
+
 class _EmptyState(QWidget):
     """Écran d'accueil du Live : forme d'onde + invitation à parler."""
 
@@ -79,6 +85,9 @@ class LiveTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._partial_text: str = ""
+        # Flux (micro, système) de la partielle affichée : un abandon venu
+        # d'un autre flux ne l'efface pas.
+        self._partial_source: str | None = None
         self._user_scrolled_up = False
         # État de regroupement du transcript.
         self._last_speaker: str | None = None
@@ -164,12 +173,23 @@ class LiveTab(QWidget):
             text = item.get("text", "")
             if not text:
                 return
-            sep = "" if (not self._partial_text or self._partial_text.endswith(" ") or text.startswith((".", ",", "!", "?", ";", ":"))) else " "
-            self._partial_text = (self._partial_text + sep + text).strip()
+            self._partial_text = _append_word(self._partial_text, text)
             self.partial.set_text(self._partial_text)
+        elif msg_type == "partial_snapshot":
+            # Hypothèse entière d'un coup : on la redessine, sans cumul.
+            partial = ""
+            for word in item.get("words") or []:
+                if word.get("text"):
+                    partial = _append_word(partial, word["text"])
+            self._partial_text = partial
+            self._partial_source = item.get("source")
+            self.partial.set_text(partial)
         elif msg_type == "final_text":
             text = item.get("text", "")
             drop = item.get("drop", False)
+            source = item.get("source")
+            if drop and source and self._partial_source and source != self._partial_source:
+                return
             if drop or not text:
                 self._partial_text = ""
                 self.partial.set_text("")
@@ -97,6 +97,9 @@ class SubtitleOverlay(QWidget):
         # Seq of the on-screen final segment awaiting an async LLM correction.
         # A late correction only replaces the text if this still matches.
         self._pending_correction_seq = None
+        # Flux (micro, système) du texte affiché : un abandon venu d'un autre
+        # flux ne l'efface pas.
+        self._shown_source = None
 
         # Window flags (cross-platform)
         self.setWindowFlags(
@@ -443,6 +446,27 @@ class SubtitleOverlay(QWidget):
             if not self._shutting_down:
                 log.exception("Error in _update_text")
 
+    def _start_segment(self):
+        # Reset internal buffer but keep label visible until first word arrives
+        self.current_text = []
+        # A new utterance is starting: any late async correction for the
+        # previous final no longer applies to what's on screen.
+        self._pending_correction_seq = None
+        # Between utterances (faded out), re-evaluate which screen is
+        # active so subtitles follow the user to another monitor.
+        if self.windowOpacity() == 0.0 or not self.isVisible():
+            self._position_window()
+
+    def _show_partial(self):
+        self.label.setTextFormat(Qt.TextFormat.PlainText)
+        self.label.setText(" ".join(self.current_text))
+        self._reposition()
+        # Reset fade timer only when actual words arrive, not on segment_start
+        # This lets the previous text remain visible while the model transcribes
+        self.fade_anim.stop()
+        self.setWindowOpacity(1.0)
+        self.hide_timer.start(self.config.display_duration_ms)
+
     @pyqtSlot(dict)
     def _update_word(self, message: dict):
         """Streaming mode: add words progressively."""
@@ -452,32 +476,26 @@ class SubtitleOverlay(QWidget):
             msg_type = message.get("type")
 
             if msg_type == "segment_start":
-                # Reset internal buffer but keep label visible until first word arrives
-                self.current_text = []
-                # A new utterance is starting: any late async correction for the
-                # previous final no longer applies to what's on screen.
-                self._pending_correction_seq = None
-                # Between utterances (faded out), re-evaluate which screen is
-                # active so subtitles follow the user to another monitor.
-                if self.windowOpacity() == 0.0 or not self.isVisible():
-                    self._position_window()
+                self._start_segment()
             elif msg_type == "word":
-                # Add new word
+                # Add new word (legacy per-word protocol, e.g. remote backend)
                 self.current_text.append(message["text"])
-                full_text = " ".join(self.current_text)
-                self.label.setTextFormat(Qt.TextFormat.PlainText)
-                self.label.setText(full_text)
-                self._reposition()
-                # Reset fade timer only when actual words arrive, not on segment_start
-                # This lets the previous text remain visible while the model transcribes
-                self.fade_anim.stop()
-                self.setWindowOpacity(1.0)
-                self.hide_timer.start(self.config.display_duration_ms)
+                self._show_partial()
+            elif msg_type == "partial_snapshot":
+                # Whole hypothesis in one message: redraw it from scratch.
+                self._start_segment()
+                self._shown_source = message.get("source")
+                self.current_text = [w["text"] for w in message.get("words") or []]
+                if self.current_text:
+                    self._show_partial()
             elif msg_type == "final_text":
                 # Replace the streamed (raw) text with the post-processed/corrected
                 # final version. If `drop` is set, the segment was a hallucination —
                 # clear the overlay immediately instead of leaving garbage on screen.
                 if message.get("drop"):
+                    source = message.get("source")
+                    if source and self._shown_source and source != self._shown_source:
+                        return
                     self.current_text = []
                     self.label.setText("")
                     self.fade_anim.stop()
@@ -493,6 +511,7 @@ class SubtitleOverlay(QWidget):
                 else:
                     # Fresh final: remember it so its correction can replace it.
                     self._pending_correction_seq = seq
+                    self._shown_source = message.get("source")
                 text = message.get("text") or ""
                 self.current_text = text.split() if text else []
                 speaker = message.get("speaker")
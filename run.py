@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
+import multiprocessing
+
 from benji.main import main
 
 if __name__ == "__main__":
+    # Bundle PyInstaller : un process lancé en "spawn" (diarisation
+    # "pyannote-process", cf. benji/stt/diarization_worker.py) ré-exécute ce
+    # point d'entrée ; sans ceci il relancerait une seconde app.
+    multiprocessing.freeze_support()
     main()
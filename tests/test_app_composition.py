@@ -254,3 +254,33 @@ def test_parakeet_est_charge_et_prechauffe_sur_le_thread_principal(monkeypatch):
     assert seen["prechauffe"] is main, "Parakeet préchauffé hors du thread principal"
     assert app.transcriber is not None
     assert app.history is app.transcriber.history
+
+
+def test_system_audio_separate_uses_the_multi_stream_vad(monkeypatch):
+    from benji.config import AudioConfig
+
+    _stub_qt_free_pipeline(monkeypatch)
+    monkeypatch.setattr("benji.app.MultiStreamVADProcessor", lambda *a, **kw: "multi-vad")
+    monkeypatch.setattr(
+        "benji.audio.loopback.select_loopback",
+        lambda devices, preferred=None: type("D", (), {"name": "BlackHole 2ch"})(),
+    )
+
+    class FakeSystemCapture:
+        def __init__(self, name, sample_rate=16000):
+            self.ring = None
+
+        def start(self):
+            return True
+
+    monkeypatch.setattr("benji.audio.system_capture.SystemAudioCapture", FakeSystemCapture)
+    monkeypatch.setattr("sounddevice.query_devices", lambda: _fake_devices("BlackHole 2ch"))
+
+    app = BenjiApplication(
+        AppConfigs(audio=AudioConfig(system_audio=True, system_audio_separate=True))
+    )
+    app._build_pipeline()
+
+    assert app.vad == "multi-vad"
+    assert app.mixer.separate is True
+    assert app.audio_queue.block_size == 2 * app.cfg.audio.chunk_size
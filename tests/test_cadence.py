@@ -0,0 +1,60 @@
+"""Cadence adaptative des passes partielles."""
+
+import pytest
+
+from benji.config import VADConfig
+from benji.stats import SessionStats
+from benji.stt.cadence import PartialCadence
+
+
+def test_interval_keeps_the_stt_thread_at_the_target_occupancy():
+    cadence = PartialCadence(400, target_occupancy=0.5)
+    for _ in range(20):
+        cadence.record(150, audio_seconds=3.0)
+    # 150 ms par passe à 50 % d'occupation : une passe toutes les 300 ms.
+    assert cadence.interval_ms == pytest.approx(300)
+    assert cadence.rtf == pytest.approx(0.05)
+    assert cadence.interval_samples(16000) == 4800
+
+
+def test_fast_machine_speeds_up_and_slow_one_backs_off_within_bounds():
+    fast = PartialCadence(400, min_ms=200, max_ms=2000)
+    for _ in range(20):
+        fast.record(40, audio_seconds=3.0)
+    assert fast.interval_ms == 200
+
+    slow = PartialCadence(400, min_ms=200, max_ms=2000)
+    for _ in range(20):
+        slow.record(1500, audio_seconds=3.0)
+    assert slow.interval_ms == 2000
+
+
+def test_a_single_spike_does_not_derail_the_cadence():
+    cadence = PartialCadence(400)
+    for _ in range(10):
+        cadence.record(150, audio_seconds=3.0)
+    cadence.record(1500, audio_seconds=3.0)
+    assert cadence.interval_ms < 1500 / 0.5
+    for _ in range(15):
+        cadence.record(150, audio_seconds=3.0)
+    assert cadence.interval_ms == pytest.approx(300, rel=0.05)
+
+
+def test_current_interval_is_published_in_the_session_snapshot():
+    stats = SessionStats()
+    assert stats.snapshot()["partial_interval_ms"] is None
+    cadence = PartialCadence(400, stats=stats)
+    assert stats.snapshot()["partial_interval_ms"] == 400
+    cadence.record(300, audio_seconds=2.0)
+    snap = stats.snapshot()
+    assert snap["partial_interval_ms"] == pytest.approx(600)
+    assert snap["partial_rtf"] == pytest.approx(0.15)
+    stats.record_segment(2.0, 300, is_final=False)
+    assert "every 600ms" in stats.format_footer()
+
+
+def test_from_config_is_off_for_a_fixed_cadence_or_without_partials():
+    assert PartialCadence.from_config(VADConfig(partial_adaptive=False)) is None
+    assert PartialCadence.from_config(VADConfig(partial_interval_ms=0)) is None
+    cadence = PartialCadence.from_config(VADConfig(partial_interval_min_ms=100))
+    assert (cadence.interval_ms, cadence.min_ms) == (400, 100)
@@ -53,3 +53,17 @@ def test_pause_closes_stream_and_resume_reopens(monkeypatch):
 
     capture.resume()  # idempotent : pas de double ouverture
     assert opened == [True]
+
+
+def test_callback_writes_into_a_sample_ring_without_copy():
+    from benji.audio.ring import SampleRing
+
+    stats = SessionStats()
+    ring = SampleRing(block_size=4, capacity_blocks=1)
+    capture = AudioCapture(ring, stats=stats)
+
+    capture._callback(np.ones((4, 1), dtype=np.float32), 4, None, None)
+    capture._callback(np.ones((4, 1), dtype=np.float32), 4, None, None)  # anneau plein
+
+    assert ring.qsize() == 1
+    assert stats.snapshot()["drops"] == {"audio_queue_full": 1}
@@ -0,0 +1,124 @@
+"""Mémo des corrections : clé normalisée, éviction LRU, persistance 0600."""
+
+import os
+import stat
+
+import pytest
+
+from benji.config import STTConfig
+from benji.llm.correction_cache import CorrectionCache, normalize
+from benji.stats import SessionStats
+
+
+def test_normalize_ignores_case_spacing_and_the_final_period_only():
+    assert normalize("  Oui. ") == normalize("oui") == normalize("OUI .") == "oui"
+    assert normalize("Ok,   merci.") == "ok, merci"
+    # Ce qui change le sens reste dans la clé.
+    assert normalize("Oui ?") == "oui ?"
+    assert normalize("Oui !") == "oui !"
+    assert normalize("D'accord…") == "d'accord…"
+    assert normalize("D'accord...") == "d'accord..."
+
+
+def test_hit_miss_and_language_are_part_of_the_key():
+    stats = SessionStats()
+    cache = CorrectionCache(max_entries=4, stats=stats)
+    cache.put("oui", "fr", "Oui.")
+
+    assert cache.get("Oui.", "fr") == "Oui."
+    assert cache.get("oui", "en") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+    snap = stats.snapshot()
+    assert (snap["correction_cache_hits"], snap["correction_cache_misses"]) == (1, 1)
+    assert "corrections remembered 1/2" in stats.format_footer()
+
+
+def test_a_question_is_never_served_the_statement():
+    cache = CorrectionCache(max_entries=4)
+    cache.put("Oui.", "fr", "Oui.")
+    cache.put("Vraiment ?", "fr", "Vraiment ?")
+
+    assert cache.get("Oui ?", "fr") is None
+    assert cache.get("vraiment.", "fr") is None
+
+
+def test_least_recently_served_entry_is_evicted():
+    cache = CorrectionCache(max_entries=2)
+    cache.put("oui", "fr", "Oui.")
+    cache.put("non", "fr", "Non.")
+    cache.get("oui", "fr")  # « non » devient le plus ancien
+    cache.put("merci", "fr", "Merci.")
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get("non", "fr") is None
+    assert cache.get("oui", "fr") == "Oui."
+
+
+def test_long_sentences_are_neither_cached_nor_counted():
+    cache = CorrectionCache(max_entries=4, max_chars=10)
+    long = "on va regarder le budget du trimestre"
+    cache.put(long, "fr", long.capitalize())
+
+    assert cache.get(long, "fr") is None
+    assert len(cache) == 0
+    assert cache.misses == 0
+
+
+def test_persisted_in_0600_and_reloaded_in_lru_order(tmp_path):
+    path = tmp_path / "corrections.json"
+    cache = CorrectionCache(max_entries=2, path=path)
+    cache.put("oui", "fr", "Oui.")
+    cache.put("non", "fr", "Non.")
+    cache.get("oui", "fr")
+    cache.save()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    reloaded = CorrectionCache(max_entries=2, path=path)
+    assert reloaded.get("non", "fr") == "Non."
+    reloaded.put("merci", "fr", "Merci.")  # « oui » est désormais le plus ancien
+    assert reloaded.get("oui", "fr") is None
+
+
+def test_clearing_the_history_wipes_the_cache_and_its_file(tmp_path):
+    from benji.history import TranscriptionHistory
+
+    path = tmp_path / "corrections.json"
+    cache = CorrectionCache(path=path)
+    cache.put("oui", "fr", "Oui.")
+    cache.save()
+    history = TranscriptionHistory(path=tmp_path / "history.jsonl")
+    history.caches.append(cache)
+
+    history.clear("une-reunion")
+
+    assert not path.exists()
+    assert len(cache) == 0
+    cache.save()
+    assert not path.exists()
+
+
+def test_save_is_skipped_when_nothing_changed(tmp_path):
+    path = tmp_path / "corrections.json"
+    cache = CorrectionCache(path=path)
+    cache.save()
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("content", ["{pas du json", '{"oui": "Oui."}', '[["fr", "oui"], 3]'])
+def test_unreadable_file_starts_empty(tmp_path, content):
+    path = tmp_path / "corrections.json"
+    path.write_text(content, encoding="utf-8")
+
+    assert len(CorrectionCache(path=path)) == 0
+
+
+def test_from_config_needs_llm_correction_and_a_size(tmp_path):
+    path = tmp_path / "c.json"
+    assert CorrectionCache.from_config(STTConfig(), path=path) is None
+    assert CorrectionCache.from_config(
+        STTConfig(llm_correction=True, llm_correction_cache=0), path=path) is None
+    cache = CorrectionCache.from_config(
+        STTConfig(llm_correction=True, llm_correction_cache_persist=False))
+    assert cache is not None and cache.path is None
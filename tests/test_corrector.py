@@ -0,0 +1,156 @@
+"""Correction LLM : consigne pré-remplie une fois, finales corrigées par lots.
+
+mlx_lm n'est jamais importé pour de vrai : un faux module enregistre ce que le
+correcteur lui demande et rend une réponse scriptée. Les « tokens » sont les
+caractères du prompt, ce qui rend les préfixes lisibles dans les assertions.
+"""
+
+import sys
+import types
+
+import pytest
+
+from benji.llm import corrector
+
+
+class _Tokenizer:
+    def apply_chat_template(self, messages, tokenize, add_generation_prompt):
+        text = "".join(f"<{m['role']}>{m['content']}</{m['role']}>" for m in messages)
+        return [ord(c) for c in text + "<assistant>"]
+
+
+def _text(tokens) -> str:
+    return "".join(chr(t) for t in tokens)
+
+
+class _KV:
+    def __init__(self):
+        self.offset = 0
+
+    def is_trimmable(self):
+        return True
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Faux modèle chargé ; `llm.reply(phrase)` fabrique la réponse."""
+    state = types.SimpleNamespace(calls=[], batches=[], prefills=[],
+                                  reply=lambda text: text.capitalize() + ".")
+
+    def user_of(tokens):
+        return _text(tokens).split("<user>")[-1].split("</user>")[0]
+
+    def generate(model, tokenizer, prompt, max_tokens, verbose, prompt_cache=None):
+        state.calls.append((_text(prompt), prompt_cache))
+        if prompt_cache is not None:
+            prompt_cache[0].offset += len(prompt) + 5  # prompt + tokens produits
+        return state.reply(user_of(prompt))
+
+    def prefill(tokens, cache):
+        state.prefills.append(_text(tokens))
+        cache[0].offset += len(tokens)
+
+    def trim(cache, n):
+        cache[0].offset -= n
+
+    module = types.ModuleType("mlx_lm")
+    module.generate = generate
+    cache_mod = types.ModuleType("mlx_lm.models.cache")
+    cache_mod.make_prompt_cache = lambda model: [_KV()]
+    cache_mod.can_trim_prompt_cache = lambda cache: all(c.is_trimmable() for c in cache)
+    cache_mod.trim_prompt_cache = trim
+    monkeypatch.setitem(sys.modules, "mlx_lm", module)
+    monkeypatch.setitem(sys.modules, "mlx_lm.models", types.ModuleType("mlx_lm.models"))
+    monkeypatch.setitem(sys.modules, "mlx_lm.models.cache", cache_mod)
+    monkeypatch.setattr(corrector, "_model", object())
+    monkeypatch.setattr(corrector, "_tokenizer", _Tokenizer())
+    monkeypatch.setattr(corrector, "_load_failed", False)
+    monkeypatch.setattr(corrector, "_prefix", None)
+    monkeypatch.setattr(corrector, "_prefill", prefill)
+    state.module = module
+    state.user_of = user_of
+    return state
+
+
+def test_instruction_is_prefilled_once_and_each_call_sends_only_its_sentence(llm):
+    out = corrector.correct_batch(["bonjour à tous", "on commence"])
+    out += [corrector.correct("merci")]
+
+    assert out == ["Bonjour à tous.", "On commence.", "Merci."]
+    assert len(llm.prefills) == 1
+    assert llm.prefills[0].startswith("<system>Tu corriges")
+    assert llm.prefills[0].endswith("<user>")
+    assert [prompt for prompt, _ in llm.calls] == [
+        "bonjour à tous</user><assistant>", "on commence</user><assistant>",
+        "merci</user><assistant>",
+    ]
+    # Le cache revient au seul préfixe après chaque phrase.
+    cache = llm.calls[0][1]
+    assert cache[0].offset == len(llm.prefills[0])
+
+
+def test_a_new_language_gets_its_own_prefix(llm):
+    corrector.correct("bonjour", language="fr")
+    corrector.correct("hello there", language="en")
+
+    assert len(llm.prefills) == 2
+    assert "en en." in llm.prefills[1]
+
+
+def test_batch_generate_decodes_every_sentence_together_when_available(llm):
+    def batch_generate(model, tokenizer, prompts, max_tokens, verbose):
+        llm.batches.append([llm.user_of(p) for p in prompts])
+        return types.SimpleNamespace(texts=[llm.user_of(p).upper() for p in prompts])
+
+    llm.module.batch_generate = batch_generate
+
+    out = corrector.correct_batch(["bonjour à tous", "ok", "on commence"])
+
+    assert out == ["BONJOUR À TOUS", "ok", "ON COMMENCE"]
+    assert llm.batches == [["bonjour à tous", "on commence"]]
+    assert llm.calls == []
+
+
+def test_implausible_answer_keeps_the_raw_text_of_that_sentence_only(llm):
+    llm.reply = lambda text: "bla " * 40 if text == "non merci" else text + " !"
+
+    assert corrector.correct_batch(["oui oui", "non merci"]) == ["oui oui !", "non merci"]
+
+
+def test_a_failing_generation_only_costs_its_own_sentence(llm):
+    def reply(text):
+        if text == "deux":
+            raise RuntimeError("Metal")
+        return text.upper()
+
+    llm.reply = reply
+
+    assert corrector.correct_batch(["un un", "deux", "trois"]) == ["UN UN", "deux", "TROIS"]
+    assert llm.calls[0][1][0].offset == len(llm.prefills[0])  # cache rogné malgré l'erreur
+
+
+def test_a_remembered_sentence_skips_the_model(llm):
+    from benji.llm.correction_cache import CorrectionCache
+
+    cache = CorrectionCache(max_entries=8)
+    assert corrector.correct_batch(["oui oui", "d'accord"], cache=cache) == ["Oui oui.", "D'accord."]
+    llm.calls.clear()
+
+    out = corrector.correct_batch(["Oui oui.", "on commence", "d'accord"], cache=cache)
+
+    assert out == ["Oui oui.", "On commence.", "D'accord."]
+    assert [prompt for prompt, _ in llm.calls] == ["on commence</user><assistant>"]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_a_failed_generation_is_not_remembered(llm):
+    from benji.llm.correction_cache import CorrectionCache
+
+    def reply(text):
+        raise RuntimeError("Metal")
+
+    llm.reply = reply
+    cache = CorrectionCache(max_entries=8)
+
+    assert corrector.correct("merci", cache=cache) == "merci"
+    assert len(cache) == 0
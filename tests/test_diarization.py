@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from benji.stt.diarization import SpeakerTagger, _estimate_f0
 
@@ -8,11 +9,21 @@ def _sine(freq: float, duration_s: float = 1.0, sample_rate: int = 16000) -> np.
     return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
 
 
+def _voice(f0: float, duration_s: float = 1.0, noise: float = 0.0, seed: int = 0,
+           sample_rate: int = 16000) -> np.ndarray:
+    """Fondamentale + 7 harmoniques décroissantes, phases aléatoires, bruit blanc."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sample_rate * duration_s)) / sample_rate
+    audio = sum((0.6 / k) * np.sin(2 * np.pi * k * f0 * t + rng.uniform(0, 2 * np.pi))
+                for k in range(1, 9))
+    return (audio + noise * rng.standard_normal(len(t))).astype(np.float32)
+
+
 def test_estimate_f0_on_sine():
     audio = _sine(150.0)
     est = _estimate_f0(audio)
     assert est is not None
-    assert abs(est - 150.0) < 10
+    assert abs(est[0] - 150.0) < 10
 
 
 def test_estimate_f0_on_silence():
@@ -20,6 +31,50 @@ def test_estimate_f0_on_silence():
     assert _estimate_f0(audio) is None
 
 
+@pytest.mark.parametrize("f0", [75.0, 95.0, 120.0, 150.0, 190.0, 240.0, 300.0, 380.0])
+@pytest.mark.parametrize("noise", [0.0, 0.2])
+def test_estimate_f0_on_harmonic_voices(f0, noise):
+    est, confidence = _estimate_f0(_voice(f0, noise=noise))
+    # Ni octave au-dessus (harmonique 2) ni octave en dessous (double période).
+    assert est == pytest.approx(f0, rel=0.02)
+    assert confidence > 0.8
+
+
+def test_estimate_f0_missing_fundamental():
+    # Téléphone, micro bas de gamme : la fondamentale est filtrée, seules les
+    # harmoniques restent — la période, elle, ne change pas.
+    t = np.arange(16000) / 16000
+    audio = sum(np.sin(2 * np.pi * k * 120.0 * t) for k in range(2, 7)).astype(np.float32)
+    est, _ = _estimate_f0(audio)
+    assert est == pytest.approx(120.0, rel=0.02)
+
+
+def test_estimate_f0_is_the_median_of_voiced_frames():
+    # Deux mots séparés par une pause, l'un un peu plus aigu : la pause ne
+    # compte pas, la médiane tombe entre les deux.
+    audio = np.concatenate([_voice(140.0, 0.6), np.zeros(8000, np.float32), _voice(150.0, 0.6)])
+    est, confidence = _estimate_f0(audio)
+    assert 138.0 <= est <= 152.0
+    assert confidence > 0.8
+
+
+def test_estimate_f0_noise_has_no_pitch():
+    rng = np.random.default_rng(0)
+    noise = (0.3 * rng.standard_normal(16000)).astype(np.float32)
+    est = _estimate_f0(noise)
+    assert est is None or est[1] < 0.2
+
+
+def test_estimate_f0_confidence_drops_with_noise():
+    confidences = [_estimate_f0(_voice(150.0, noise=n))[1] for n in (0.0, 0.2, 0.4)]
+    assert confidences == sorted(confidences, reverse=True)
+    assert confidences[0] > 0.95
+
+
+def test_estimate_f0_too_short():
+    assert _estimate_f0(_voice(150.0, duration_s=0.2)) is None
+
+
 def test_speaker_tagger_two_voices():
     tagger = SpeakerTagger(f0_gap_hz=30.0)
     low = _sine(120.0)
@@ -37,3 +92,155 @@ def test_speaker_tagger_same_voice_stable():
     a2 = _sine(160.0)  # slight drift, same speaker
     assert tagger.label(a1) == "A"
     assert tagger.label(a2) == "A"
+
+
+def test_speaker_tagger_does_not_guess_without_a_pitch():
+    tagger = SpeakerTagger()
+    assert tagger.label(_sine(120.0)) == "A"
+    assert tagger.label(np.zeros(16000, dtype=np.float32)) is None
+
+
+def test_speaker_tagger_low_confidence_joins_but_never_creates_a_speaker():
+    tagger = SpeakerTagger(f0_gap_hz=30.0, min_confidence=0.9)
+    noisy_low, noisy_high = _voice(120.0, noise=0.4), _voice(220.0, noise=0.4)
+    assert _estimate_f0(noisy_high)[1] < 0.9
+
+    assert tagger.label(noisy_low) is None  # pas de premier locuteur sur un doute
+    assert tagger.label(_voice(120.0)) == "A"
+    assert tagger.label(noisy_low) == "A"  # assez proche : rejoint A
+    assert tagger.label(noisy_high) is None  # loin de A : pas de B inventé
+    assert tagger.label(_voice(220.0)) == "B"
+
+
+# --- SlidingWindowDiarizer : tours de parole dans un segment ---
+
+
+class _SignTagger:
+    """Faux pyannote : la voix A est un signal positif, B un signal négatif ;
+    l'« embedding » d'une fenêtre est la part de chaque voix."""
+
+    def __init__(self):
+        self.embedded: list[int] = []
+
+    def embed(self, audio, sample_rate=16000):
+        self.embedded.append(len(audio))
+        return np.array([np.mean(audio > 0), np.mean(audio < 0)])
+
+    def assign(self, emb):
+        self.assigned = getattr(self, "assigned", 0) + 1
+        return "AB"[int(np.argmax(emb))], self.assigned - 1
+
+
+def _speakers(*turns: tuple[str, float], seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    parts = []
+    for speaker, seconds in turns:
+        level = np.abs(rng.standard_normal(int(seconds * 16000))) + 0.01
+        parts.append(level if speaker == "A" else -level)
+    return np.concatenate(parts).astype(np.float32)
+
+
+def test_sliding_diarizer_splits_back_to_back_speakers():
+    from benji.stt.diarization import SlidingWindowDiarizer
+
+    diarizer = SlidingWindowDiarizer(_SignTagger())
+    turns = diarizer.turns(_speakers(("A", 3.0), ("B", 3.0)))
+
+    assert [t.speaker for t in turns] == ["A", "B"]
+    assert turns[0].start == 0.0 and turns[-1].end == 6.0
+    assert turns[0].end == pytest.approx(3.0, abs=0.4)
+    assert diarizer.label(_speakers(("A", 2.0), ("B", 4.0), seed=1)) == "B"
+
+
+def test_sliding_diarizer_single_speaker_and_short_segments():
+    from benji.stt.diarization import SlidingWindowDiarizer
+
+    diarizer = SlidingWindowDiarizer(_SignTagger())
+
+    assert [t.speaker for t in diarizer.turns(_speakers(("A", 5.0)))] == ["A"]
+    assert [t.speaker for t in diarizer.turns(_speakers(("B", 0.8)))] == ["B"]  # < une fenêtre
+    assert diarizer.turns(_speakers(("A", 0.3))) == []
+
+
+def test_partial_windows_are_reused_by_the_final():
+    from benji.stt.diarization import SlidingWindowDiarizer
+
+    tagger = _SignTagger()
+    diarizer = SlidingWindowDiarizer(tagger, window_s=1.5, hop_s=0.75)
+    audio = _speakers(("A", 3.0), ("B", 3.0))
+
+    diarizer.observe(audio[: int(4.5 * 16000)])  # partielle : fenêtres 0 à 3 s
+    assert len(tagger.embedded) == 5
+    diarizer.observe(audio[: int(4.8 * 16000)])  # même grille, rien de neuf
+    assert len(tagger.embedded) == 5
+
+    diarizer.turns(audio)  # finale : seules les fenêtres à 3,75 s et 4,5 s manquent
+    assert len(tagger.embedded) == 7
+    assert diarizer.reused == 10  # 5 à la seconde partielle, 5 à la finale
+
+
+def test_attach_speakers_uses_word_midpoints():
+    from benji.stt.diarization import Turn, attach_speakers, dominant_speaker
+
+    turns = [Turn(0.0, 1.0, "A"), Turn(1.0, 3.0, "B")]
+    words = [{"text": "oui", "start": 0.2, "end": 0.6},
+             {"text": "alors", "start": 0.8, "end": 1.1},  # milieu 0,95 s : A
+             {"text": "non", "start": None, "end": None},  # sans horodatage : comme le précédent
+             {"text": "bon", "start": 1.5, "end": 1.9}]
+
+    assert [w["speaker"] for w in attach_speakers(words, turns)] == ["A", "A", "A", "B"]
+    assert dominant_speaker(turns) == "B"
+    assert "speaker" not in words[0]  # copie, l'original est intact
+
+
+def _unit(*values: float) -> np.ndarray:
+    v = np.zeros(8, dtype=np.float32)
+    v[: len(values)] = values
+    return v
+
+
+def test_speaker_clusters_assign_and_store_voices():
+    from benji.stt.diarization import SpeakerClusters
+
+    clusters = SpeakerClusters(max_speakers=2, cosine_threshold=0.8)
+    assert clusters.assign(_unit(1, 0)) == ("A", 0)
+    assert clusters.assign(_unit(1, 0.1)) == ("A", 1)
+    assert clusters.assign(_unit(0, 1)) == ("B", 2)
+    assert clusters.assign(_unit(-1, 0))[0] in ("A", "B")  # plafond atteint : plus proche
+
+    for _ in range(100):  # le stockage double sa capacité au besoin
+        clusters.assign(_unit(0, 1))
+    assert len(clusters) == 104
+    assert clusters._voices.dtype == np.float16
+    assert len(clusters._voices) >= 104
+
+
+def test_recluster_revises_an_early_decision():
+    from benji.stt.diarization import SpeakerClusters
+
+    clusters = SpeakerClusters(max_speakers=4, cosine_threshold=0.5)
+    # A parle seul d'abord ; la première phrase de B, ambiguë, lui ressemble
+    # assez pour être rangée chez A. La suite de B ouvre ensuite son locuteur.
+    clusters.assign(_unit(1, 0))
+    assert clusters.assign(_unit(0.6, 0.8)) == ("A", 1)
+    for _ in range(5):
+        clusters.assign(_unit(1, 0))
+        clusters.assign(_unit(0, 1))
+    assert clusters._voice_labels[3] == "B"
+
+    speakers = clusters.recluster(list(range(len(clusters))))
+
+    assert speakers[1] == "B"  # vue avec toute la réunion, elle rejoint B
+    assert speakers[0] == "A" and speakers[3] == "B"  # les étiquettes affichées restent
+    assert set(speakers.values()) == {"A", "B"}
+    assert clusters.recluster([]) == {}
+    assert clusters.recluster([999]) == {}
+
+
+def test_agglomerate_caps_the_number_of_groups():
+    from benji.stt.diarization import _agglomerate
+
+    x = np.eye(4, dtype=np.float32)
+    assert len(set(_agglomerate(x, 0.9, max_clusters=4))) == 4
+    assert len(set(_agglomerate(x, 0.9, max_clusters=2))) == 2
+    assert list(_agglomerate(np.repeat(x[:1], 3, axis=0), 0.9, 4)) == [0, 0, 0]
@@ -0,0 +1,119 @@
+"""Diarisation hors process : aller-retour par mémoire partagée, plantage et
+blocage de l'enfant, renumérotation des voix après relance.
+
+L'enfant est un vrai process ("spawn") ; son tagger est un factice de ce module,
+qui lit l'audio reçu : le premier échantillon sert de commande (9 = plantage,
+7 = blocage).
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from benji.stt.diarization import Turn
+from benji.stt.diarization_worker import ProcessDiarizer
+
+
+class _EchoTagger:
+    def __init__(self):
+        self.voices = 0
+
+    def _check(self, audio):
+        if audio[0] == 9:
+            os._exit(1)
+        if audio[0] == 7:
+            time.sleep(60)
+
+    def label(self, audio, sample_rate=16000):
+        self._check(audio)
+        return "A" if audio.mean() > 0 else "B"
+
+    def turns(self, audio, sample_rate=16000):
+        self.voices += 1
+        return [Turn(0.0, len(audio) / sample_rate, self.label(audio), self.voices - 1)]
+
+    def recluster(self, voices):
+        return {v: f"R{v}" for v in voices}
+
+
+class _LabelOnly:
+    def label(self, audio, sample_rate=16000):
+        return f"{len(audio)}"
+
+
+@pytest.fixture
+def worker():
+    diarizer = ProcessDiarizer(_EchoTagger, timeout_s=1.0)
+    assert diarizer.wait_ready(timeout=30)
+    yield diarizer
+    diarizer.close()
+
+
+def _tone(value: float, seconds: float = 1.0) -> np.ndarray:
+    return np.full(int(seconds * 16000), value, dtype=np.float32)
+
+
+def test_le_tagger_de_l_enfant_repond_via_la_memoire_partagee(worker):
+    assert worker.backend == "_EchoTagger"
+    assert worker.label(_tone(0.5)) == "A"
+    assert worker.label(_tone(-0.5, 45.0)) == "B"  # plus long que le bloc initial : il grandit
+    assert worker.turns(_tone(0.5, 2.0)) == [Turn(0.0, 2.0, "A", 0)]
+    assert worker.recluster([0, 5]) == {0: "R0", 5: "R5"}
+
+
+def test_un_enfant_plante_ou_bloque_est_relance(worker):
+    assert worker.turns(_tone(0.5)) == [Turn(0.0, 1.0, "A", 0)]
+    assert worker.turns(_tone(0.5))[0].voice == 1
+
+    with pytest.raises(RuntimeError):
+        worker.label(_tone(9.0))  # plantage
+    assert worker.restarts == 1
+    assert worker.wait_ready(timeout=30)
+    # Nouvel enfant, clustering neuf : ses voix viennent après celles d'avant,
+    # qui ne sont plus re-clusterisables.
+    assert worker.turns(_tone(0.5))[0].voice == 2
+    assert worker.recluster([0, 1, 2]) == {2: "R0"}
+
+    t0 = time.monotonic()
+    with pytest.raises(RuntimeError):
+        worker.label(_tone(7.0))  # blocage : abandonné au délai
+    assert time.monotonic() - t0 < 5
+    assert worker.restarts == 2
+    assert worker.wait_ready(timeout=30)
+    assert worker.label(_tone(-0.5)) == "B"
+
+
+def test_trop_de_relances_coupe_la_diarisation():
+    diarizer = ProcessDiarizer(_EchoTagger, timeout_s=1.0, max_restarts=0)
+    assert diarizer.wait_ready(timeout=30)
+    with pytest.raises(RuntimeError):
+        diarizer.label(_tone(9.0))
+    assert diarizer.label(_tone(0.5)) is None
+    assert diarizer.recluster([0]) == {}
+    diarizer.close()
+
+
+def test_un_tagger_sans_tours_rend_un_tour_par_segment():
+    diarizer = ProcessDiarizer(_LabelOnly)
+    try:
+        assert diarizer.turns(_tone(0.5)) is None  # encore en chargement : sans attendre
+        assert diarizer.wait_ready(timeout=30)
+        assert diarizer.turns(_tone(0.5, 0.5)) == [Turn(0.0, 0.5, "8000")]
+        assert diarizer.observe(_tone(0.5)) is None
+    finally:
+        diarizer.close()
+
+
+def test_build_tagger_lance_pyannote_dans_un_process():
+    from benji.stt.diarization import build_tagger
+
+    diarizer = build_tagger("pyannote-process", max_speakers=2)
+    try:
+        assert isinstance(diarizer, ProcessDiarizer)
+        assert diarizer.wait_ready(timeout=60)
+        # Sans pyannote ici, l'enfant retombe sur pitch comme le ferait l'app.
+        assert diarizer.backend in ("SlidingWindowDiarizer", "SpeakerTagger")
+    finally:
+        diarizer.close()
@@ -55,3 +55,19 @@ def test_none_sentinel_ignored(app):
 
     assert received == [{"type": "word", "text": "x"}]
     bus.stop()
+
+
+def test_traced_messages_close_their_trace_in_stats(app):
+    from benji.stats import SessionStats
+
+    q: Queue = Queue()
+    stats = SessionStats()
+    bus = DisplayBus(q, poll_ms=5, stats=stats)
+    bus.start()
+
+    q.put({"type": "final_text", "text": "ok", "trace": {"kind": "final", "stt_out": 0.0}})
+    q.put({"type": "word", "text": "sans trace"})
+    app.wait(50)
+
+    assert set(stats.snapshot()["stages"]["final"]) == {"display"}
+    bus.stop()
@@ -122,3 +122,22 @@ def test_migration_depuis_le_cache_legacy(isolated_home):
 
     assert [e["text"] for e in history.get_recent()] == ["réunion d'avant"]
     assert not (legacy_dir / "history.jsonl").exists()
+
+
+def test_relabel_reecrit_les_locuteurs_d_une_seule_reunion(history):
+    first = meetings.current_meeting()
+    history.add("un", speaker="A", voice=0)
+    history.add("deux", speaker="A", voice=1)
+    history.add("sans voix", speaker="A")
+    other = meetings.start_meeting()
+    history.add("ailleurs", speaker="A", voice=2)
+
+    assert history.relabel(first.id, {0: "A", 1: "B", 2: "B"}) == 1
+
+    mine = history.get_for_meeting(first.id)
+    assert [e.get("speaker") for e in mine] == ["A", "B", "A"]
+    assert not any("voice" in e for e in mine)
+    assert history.get_for_meeting(other.id)[0]["speaker"] == "A"
+    assert history.get_for_meeting(other.id)[0]["voice"] == 2
+    assert stat.S_IMODE(os.stat(history.history_file).st_mode) == 0o600
+    assert history.relabel(first.id, {1: "C"}) == 0  # plus aucune voix : rien à réécrire
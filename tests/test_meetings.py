@@ -107,3 +107,42 @@ def test_end_current_meeting_horodate_la_fin():
 
     assert meetings.store().get(meeting.id).ended_at is not None
     assert meetings.current_meeting_id() is None
+
+
+def test_fin_de_reunion_previent_les_abonnes():
+    ended: list[str] = []
+
+    class Listener:
+        def on_end(self, meeting_id):
+            ended.append(meeting_id)
+
+    listener = Listener()
+    meetings.on_meeting_end(listener.on_end)
+
+    first = meetings.current_meeting()
+    second = meetings.start_meeting()
+    meetings.end_current_meeting()
+    meetings.end_current_meeting()  # plus de réunion courante : rien
+    assert ended == [first.id, second.id]
+
+    del listener  # référence faible : l'abonné disparu ne reçoit plus rien
+    meetings.start_meeting()
+    meetings.end_current_meeting()
+    assert len(ended) == 2
+
+
+def test_un_abonne_en_echec_n_empeche_pas_les_autres():
+    ended: list[str] = []
+
+    def broken(meeting_id):
+        raise RuntimeError("abonné en panne")
+
+    def record(meeting_id):
+        ended.append(meeting_id)
+
+    meetings.on_meeting_end(broken)
+    meetings.on_meeting_end(record)
+    meeting = meetings.current_meeting()
+    meetings.end_current_meeting()
+
+    assert ended == [meeting.id]
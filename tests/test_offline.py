@@ -0,0 +1,121 @@
+"""Transcription de fichiers (`benji.offline`).
+
+Un WAV synthétique est rejoué à travers un vrai `VADProcessor` (Silero simulé)
+et un vrai `Transcriber` (backend scripté) : on vérifie le découpage, les
+entrées d'historique horodatées selon l'enregistrement et l'export.
+"""
+
+import json
+import os
+import wave
+from datetime import datetime, timedelta
+from queue import Queue
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import benji.stt.transcriber as transcriber_mod
+from benji import offline
+from benji.audio.vad import VADProcessor
+from benji.config import AudioConfig, STTConfig, VADConfig
+from benji.history import TranscriptionHistory
+
+SR = 16000
+CHUNK = 512
+
+
+def _write_wav(path, samples: np.ndarray, rate: int = SR, channels: int = 1):
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    if channels > 1:
+        pcm = np.repeat(pcm[:, None], channels, axis=1)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+
+
+class _ScriptedBackend:
+    name = "fake"
+
+    def __init__(self, texts):
+        self._texts = list(texts)
+
+    def transcribe(self, audio):
+        yield {"text": self._texts.pop(0), "start": 0.0, "end": len(audio) / SR}
+
+
+def _pipeline(monkeypatch, tmp_path, speech_series, texts):
+    backend = _ScriptedBackend(texts)
+    monkeypatch.setattr(transcriber_mod, "build_backend", lambda *a, **kw: backend)
+    monkeypatch.setattr(transcriber_mod, "build_final_backend", lambda *a, **kw: None)
+    vad_cfg = VADConfig(partial_interval_ms=0, min_speech_duration_ms=0)
+    with patch("benji.audio.vad._download_model", return_value="/dev/null"), \
+         patch("benji.audio.vad.SileroVADOnnx") as MockModel:
+        MockModel.return_value.side_effect = iter(speech_series)
+        MockModel.return_value.reset_state = lambda: None
+        vad = VADProcessor(Queue(), Queue(), AudioConfig(), vad_cfg, None)
+    t = transcriber_mod.Transcriber(
+        vad.transcribe_queue, offline._DiscardQueue(),
+        STTConfig(diarization=False), stats=None, sample_rate=SR,
+    )
+    t.history = TranscriptionHistory(path=tmp_path / "history.jsonl")
+    return vad, t
+
+
+def test_read_audio_blocks_resamples_and_downmixes(tmp_path):
+    path = tmp_path / "stereo.wav"
+    _write_wav(path, np.full(48000, 0.5, dtype=np.float32), rate=48000, channels=2)
+
+    with patch.dict("sys.modules", {"soundfile": None}):
+        audio = np.concatenate(list(offline.read_audio_blocks(path)))
+
+    assert len(audio) == SR
+    assert np.allclose(audio, 0.5, atol=1e-3)
+
+
+def test_transcribe_file_writes_stamped_history_and_export(monkeypatch, tmp_path):
+    # 2 s de parole, 2 s de silence, 2 s de parole, 1 s de silence.
+    n = SR // CHUNK  # chunks par seconde
+    series = [0.9] * (2 * n) + [0.1] * (2 * n) + [0.9] * (2 * n) + [0.1] * n
+    path = tmp_path / "reunion.wav"
+    _write_wav(path, np.full(len(series) * CHUNK, 0.01, dtype=np.float32))
+    vad, t = _pipeline(monkeypatch, tmp_path, series, ["Bonjour à tous.", "On commence."])
+    started = datetime(2026, 3, 2, 9, 0, 0)
+
+    with patch.dict("sys.modules", {"soundfile": None}):
+        result = offline.transcribe_file(path, vad, t, started_at=started, export_format="srt")
+
+    assert result.segments == 2
+    assert result.audio_seconds == pytest.approx(len(series) * CHUNK / SR)
+    assert result.rtf > 0
+    entries = [json.loads(line) for line in (tmp_path / "history.jsonl").read_text().splitlines()]
+    assert [e["text"] for e in entries] == ["Bonjour à tous.", "On commence."]
+    assert {e["meeting"] for e in entries} == {result.meeting_id}
+    stamps = [datetime.fromisoformat(e["timestamp"]) for e in entries]
+    # Le premier final commence au début du fichier, le second ~4 s plus tard
+    # (à la fenêtre de pré-parole près).
+    assert stamps[0] == started
+    assert timedelta(seconds=3.5) <= stamps[1] - started <= timedelta(seconds=4.1)
+    # Le Transcriber retrouve son historique d'origine.
+    assert not isinstance(t.history, offline._StampedHistory)
+
+    out = result.export_path
+    assert out == tmp_path / "reunion.srt"
+    assert "Bonjour à tous." in out.read_text(encoding="utf-8")
+    assert os.stat(out).st_mode & 0o777 == 0o600
+
+
+def test_speech_running_to_end_of_file_is_flushed(monkeypatch, tmp_path):
+    series = [0.1] * 10 + [0.9] * 40
+    path = tmp_path / "coupe.wav"
+    _write_wav(path, np.full(len(series) * CHUNK - 100, 0.01, dtype=np.float32))
+    vad, t = _pipeline(monkeypatch, tmp_path, series, ["Fin abrupte."])
+
+    with patch.dict("sys.modules", {"soundfile": None}):
+        result = offline.transcribe_file(path, vad, t, export_format=None)
+
+    assert result.segments == 1
+    assert result.export_path is None
+    assert "Fin abrupte." in (tmp_path / "history.jsonl").read_text()
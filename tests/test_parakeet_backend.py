@@ -202,3 +202,66 @@ def test_mlx_whisper_absent_ne_bloque_pas_le_demarrage(monkeypatch):
     monkeypatch.setattr(backend_mod, "WhisperBackend", _boom)
 
     assert build_final_backend("whisper", "medium", "fr") is None
+
+
+# --- repli en température de Whisper ---
+
+
+@dataclass
+class _Decoded:
+    temperature: float
+    compression_ratio: float = 1.5
+    avg_logprob: float = -0.3
+    no_speech_prob: float = 0.01
+
+
+def _decoder(*results):
+    """`decode(segment, options)` factice : rend *results* dans l'ordre."""
+    pending = list(results)
+    return lambda segment, options: pending.pop(0)
+
+
+def test_un_decodage_glouton_reussi_ne_se_retente_pas():
+    from benji.stt.backend import decode_with_fallback
+
+    result, retries = decode_with_fallback(_decoder(_Decoded(0.0)), None, ("t0", "t2"))
+
+    assert (result.temperature, retries) == (0.0, 0)
+
+
+def test_un_decodage_repetitif_ou_incertain_est_retente_plus_chaud():
+    from benji.stt.backend import decode_with_fallback
+
+    decode = _decoder(_Decoded(0.0, compression_ratio=3.1), _Decoded(0.2, avg_logprob=-1.4),
+                      _Decoded(0.4))
+    result, retries = decode_with_fallback(decode, None, ("t0", "t2", "t4"))
+
+    assert (result.temperature, retries) == (0.4, 2)
+
+
+def test_le_silence_ne_declenche_pas_de_repli():
+    from benji.stt.backend import decode_with_fallback
+
+    silence = _Decoded(0.0, avg_logprob=-2.0, no_speech_prob=0.9)
+    result, retries = decode_with_fallback(_decoder(silence), None, ("t0", "t2"))
+
+    assert (result, retries) == (silence, 0)
+
+
+def test_un_no_speech_eleve_n_excuse_pas_une_boucle_d_hallucination():
+    from benji.stt.backend import decode_with_fallback
+
+    # Logprob correct : ce n'est pas du silence, la répétition doit être retentée.
+    loop = _Decoded(0.0, compression_ratio=3.2, avg_logprob=-0.4, no_speech_prob=0.9)
+    result, retries = decode_with_fallback(_decoder(loop, _Decoded(0.2)), None, ("t0", "t2"))
+
+    assert (result.temperature, retries) == (0.2, 1)
+
+
+def test_le_dernier_essai_est_garde_meme_rate():
+    from benji.stt.backend import decode_with_fallback
+
+    decode = _decoder(_Decoded(0.0, compression_ratio=3.0), _Decoded(0.2, compression_ratio=2.9))
+    result, retries = decode_with_fallback(decode, None, ("t0", "t2"))
+
+    assert (result.temperature, retries) == (0.2, 1)
@@ -59,3 +59,36 @@ def test_eh_bien_preserved():
 def test_leading_hesitation_leaves_no_orphan_punctuation():
     # « Euh, oui » → suppression de l'hésitation → pas de « , oui » résiduel.
     assert postprocess_text("euh, oui") == "Oui"
+
+
+def test_chained_apostrophes_and_hyphens():
+    assert postprocess_text("n ' est - ce pas") == "N'est-ce pas"
+
+
+def test_word_fixes_follow_the_language_table():
+    from benji.stt.postprocessing import LANGUAGES
+
+    assert "en" in LANGUAGES and "fr" in LANGUAGES
+    assert postprocess_text("i dont know", language="en") == "I don't know"
+    assert postprocess_text("i dont know", language="fr") == "I dont know"
+    assert postprocess_text("i dont know", language=None) == "I dont know"
+    # Hésitations de toutes les langues, quelle que soit la langue demandée.
+    assert postprocess_text("um, oui euh bon", language="fr") == "Oui bon"
+
+
+def test_postprocess_many_matches_one_by_one():
+    from benji.stt.postprocessing import postprocess_many
+
+    texts = ["im here", "", "   ", "qu ' on parle. ok"]
+    assert postprocess_many(texts, "en") == [postprocess_text(t, "en") for t in texts]
+
+
+def test_hallucinations_and_repetitions_detected():
+    from benji.stt.postprocessing import HALLUCINATION_PATTERNS, is_hallucination
+
+    for pattern in HALLUCINATION_PATTERNS:
+        assert is_hallucination(f"Bon, {pattern.upper()}.")
+    assert is_hallucination("")
+    assert is_hallucination("merci merci merci merci")
+    assert not is_hallucination("Merci beaucoup, à tout à l'heure.")
+    assert not is_hallucination("sous-titres en anglais")
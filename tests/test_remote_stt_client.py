@@ -127,6 +127,18 @@ def test_recv_loop_relays_events_and_persists_final():
     assert history.added == [("Bonjour le monde", "A")]
 
 
+def test_recv_loop_relays_partial_snapshots():
+    snapshot = {"type": "partial_snapshot", "committed": 1,
+                "words": [{"text": "bonjour", "start": 0.0, "end": 0.4}]}
+    script = [json.dumps(snapshot), json.dumps({"type": "closed"})]
+    client, conn = _client(recv_script=script, history=FakeHistory())
+
+    client._recv_loop(conn)
+
+    assert client.display_queue.get_nowait() == snapshot
+    assert client.display_queue.empty()
+
+
 def test_recv_loop_ignores_dropped_final():
     history = FakeHistory()
     script = [
@@ -0,0 +1,104 @@
+"""SampleRing : anneau préalloué entre le callback CoreAudio et le VAD."""
+
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from benji.audio.ring import SampleRing
+
+
+def test_reads_fixed_blocks_from_arbitrary_writes():
+    ring = SampleRing(block_size=4, capacity_blocks=4)
+    ring.put_nowait(np.arange(3, dtype=np.float32))
+    with pytest.raises(queue.Empty):
+        ring.get_nowait()  # bloc incomplet : rien à lire
+    ring.put_nowait(np.arange(3, 6, dtype=np.float32))
+    assert np.array_equal(ring.get_nowait(), np.arange(4, dtype=np.float32))
+    assert ring.qsize() == 0
+
+
+def test_full_ring_drops_the_whole_write():
+    """Sémantique d'une Queue pleine : `Full`, et rien n'est écrit."""
+    ring = SampleRing(block_size=4, capacity_blocks=2)
+    ring.put_nowait(np.ones(4, dtype=np.float32))
+    ring.put_nowait(np.ones(4, dtype=np.float32) * 2)
+    with pytest.raises(queue.Full):
+        ring.put_nowait(np.ones(4, dtype=np.float32) * 3)
+    assert ring.qsize() == 2
+    assert np.all(ring.get_nowait() == 1)
+    assert np.all(ring.get_nowait() == 2)
+
+
+def test_block_is_held_until_the_next_get():
+    """La vue rendue n'est pas écrasée tant que le lecteur ne l'a pas rendue."""
+    ring = SampleRing(block_size=4, capacity_blocks=2)
+    ring.put_nowait(np.ones(4, dtype=np.float32))
+    view = ring.get_nowait()
+    ring.put_nowait(np.full(4, 2, dtype=np.float32))
+    with pytest.raises(queue.Full):
+        ring.put_nowait(np.full(4, 3, dtype=np.float32))  # emplacement prêté
+    assert np.all(view == 1)
+    ring.get_nowait()  # rend le premier bloc
+    ring.put_nowait(np.full(4, 3, dtype=np.float32))
+
+
+def test_writes_wrap_around_the_buffer():
+    ring = SampleRing(block_size=4, capacity_blocks=2)
+    ring.put_nowait(np.arange(6, dtype=np.float32))
+    ring.get_nowait()
+    with pytest.raises(queue.Empty):
+        ring.get_nowait()  # rend [0:4] ; [4:6] restent en attente
+    ring.put_nowait(np.arange(6, 12, dtype=np.float32))  # franchit la fin du tampon
+    assert np.array_equal(ring.get_nowait(), np.arange(4, 8, dtype=np.float32))
+    assert np.array_equal(ring.get_nowait(), np.arange(8, 12, dtype=np.float32))
+
+
+def test_put_none_closes_after_remaining_blocks():
+    ring = SampleRing(block_size=4, capacity_blocks=2)
+    ring.put_nowait(np.ones(4, dtype=np.float32))
+    ring.put(None)
+    assert ring.get() is not None
+    assert ring.get() is None
+
+
+def test_get_times_out_when_starved():
+    ring = SampleRing(block_size=4, capacity_blocks=2)
+    with pytest.raises(queue.Empty):
+        ring.get(timeout=0.01)
+
+
+def test_producer_and_consumer_threads_see_every_sample_in_order():
+    ring = SampleRing(block_size=512, capacity_blocks=8)
+    total = 512 * 200
+    data = np.arange(total, dtype=np.float32)
+
+    def produce():
+        for i in range(0, total, 512):
+            while True:
+                try:
+                    ring.put_nowait(data[i : i + 512])
+                    break
+                except queue.Full:
+                    threading.Event().wait(0.001)
+        ring.put(None)
+
+    t = threading.Thread(target=produce)
+    t.start()
+    seen = []
+    while (block := ring.get(timeout=5.0)) is not None:
+        seen.append(block.copy())
+    t.join()
+    assert np.array_equal(np.concatenate(seen), data)
+
+
+def test_each_block_carries_its_index_and_capture_stamp():
+    ring = SampleRing(block_size=4, capacity_blocks=3)
+    ring.put_nowait(np.zeros(4, dtype=np.float32), stamp=10.0)
+    ring.put_nowait(np.zeros(4, dtype=np.float32), stamp=11.0)
+
+    ring.get_nowait()
+    assert (ring.last_index, ring.last_stamp) == (0, 10.0)
+    ring.get_nowait()
+    assert (ring.last_index, ring.last_stamp) == (4, 11.0)
@@ -0,0 +1,95 @@
+"""Ordonnanceur de transcribe_queue : priorité aux finales, partielles fusionnées."""
+
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from benji.stats import SessionStats
+from benji.stt.scheduler import TranscribeScheduler
+
+
+def _item(kind: str, source=None, tag=0) -> dict:
+    item = {"audio": np.zeros(tag + 1, dtype=np.float32), "is_final": kind != "partial"}
+    if kind == "speculative":
+        item["speculative"] = True
+    if source is not None:
+        item["source"] = source
+    return item
+
+
+def _drain(s: TranscribeScheduler) -> list[tuple[bool, int]]:
+    out = []
+    while not s.empty():
+        item = s.get_nowait()
+        out.append((item["is_final"], len(item["audio"]) - 1))
+    return out
+
+
+def test_newest_partial_replaces_the_pending_one():
+    s = TranscribeScheduler()
+    for tag in range(5):
+        s.put(_item("partial", tag=tag))
+
+    assert _drain(s) == [(False, 4)]
+    assert s.coalesced == 4
+
+
+def test_finals_are_served_first_and_never_refused():
+    s = TranscribeScheduler()
+    s.put(_item("partial", source="mic", tag=9))
+    for tag in range(10):  # bien au-delà de l'ancienne borne de 3
+        s.put_nowait(_item("final", source="system", tag=tag))
+
+    assert _drain(s) == [(True, t) for t in range(10)] + [(False, 9)]
+
+
+def test_final_makes_pending_work_for_its_source_obsolete():
+    s = TranscribeScheduler()
+    s.put(_item("partial", source="mic", tag=1))
+    s.put(_item("speculative", source="mic", tag=2))
+    s.put(_item("partial", source="system", tag=3))
+    s.put(_item("final", source="mic", tag=4))
+
+    assert _drain(s) == [(True, 4), (False, 3)]
+
+
+def test_partials_of_each_source_keep_their_turn():
+    s = TranscribeScheduler()
+    s.put(_item("partial", source="mic", tag=1))
+    s.put(_item("partial", source="system", tag=2))
+    s.put(_item("partial", source="mic", tag=3))  # remplace, sans passer derrière
+
+    assert _drain(s) == [(False, 3), (False, 2)]
+
+
+def test_close_delivers_pending_finals_then_none():
+    s = TranscribeScheduler()
+    s.put(_item("partial", tag=1))
+    s.put(_item("final", tag=2))
+    s.put(None)
+
+    assert s.get()["is_final"]
+    assert s.get() is None
+
+
+def test_get_times_out_and_wakes_on_put():
+    s = TranscribeScheduler()
+    with pytest.raises(queue.Empty):
+        s.get(timeout=0.01)
+
+    threading.Timer(0.02, s.put, args=(_item("final"),)).start()
+    assert s.get(timeout=2.0)["is_final"]
+
+
+def test_queue_wait_is_recorded_per_kind():
+    stats = SessionStats()
+    s = TranscribeScheduler(stats=stats)
+    s.put(_item("final"))
+    s.put(_item("partial"))
+    s.get()
+    s.get()
+
+    stages = stats.snapshot()["stages"]
+    assert "queue_wait" in stages["final"] and "queue_wait" in stages["partial"]
@@ -0,0 +1,155 @@
+"""Délestage du moteur final quand les finales prennent du retard."""
+
+from queue import Queue
+
+import numpy as np
+
+import benji.stt.transcriber as transcriber_mod
+from benji.config import STTConfig
+from benji.stats import SessionStats
+from benji.stt.shedding import LoadShedder, Rung, engine_ladder
+from benji.stt.transcriber import Transcriber
+
+LADDER = [Rung("whisper", "medium"), Rung("whisper", "small"), Rung("parakeet")]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ladder_follows_the_configured_engine():
+    assert engine_ladder(STTConfig()) == LADDER
+    assert engine_ladder(STTConfig(final_model_size="small")) == LADDER[1:]
+    assert engine_ladder(STTConfig(final_engine="parakeet")) == [Rung("parakeet")]
+    assert LADDER[0].label == "whisper medium"
+
+
+def test_two_overloaded_finals_in_a_row_step_down_one_rung():
+    shedder = LoadShedder(LADDER)
+    assert shedder.observe(3000, 0.2) is None  # un pic isolé ne suffit pas
+    assert shedder.observe(100, 0.2) is None
+    assert shedder.observe(100, 0.9) is None
+    assert shedder.observe(2500, None) == Rung("whisper", "small")
+    assert shedder.observe(3000, None) is None
+    assert shedder.observe(3000, None) == Rung("parakeet")
+    # Plus bas que le moteur des partielles, il n'y a rien.
+    assert shedder.observe(3000, 2.0) is None
+    assert shedder.observe(3000, 2.0) is None
+    assert shedder.level == 2
+
+
+def test_short_finals_with_a_high_rtf_but_no_backlog_do_not_shed():
+    # Whisper décode 30 s de fenêtre pour un « Oui. » : son RTF ne dit rien.
+    shedder = LoadShedder(LADDER)
+    for _ in range(4):
+        assert shedder.observe(50, 1.5, audio_s=0.8) is None
+    assert shedder.level == 0
+    assert shedder.observe(50, 0.9, audio_s=6.0) is None
+    assert shedder.observe(50, 0.9, audio_s=6.0) == Rung("whisper", "small")
+
+
+def test_steps_back_up_once_the_backlog_clears_and_the_cooldown_passed():
+    clock = Clock()
+    shedder = LoadShedder(LADDER, recover_after=3, cooldown_s=60, clock=clock)
+    shedder.observe(3000, None)
+    shedder.observe(3000, None)
+    assert shedder.level == 1
+
+    for _ in range(5):
+        assert shedder.observe(50, 0.1) is None  # file vide, mais trop tôt
+    clock.now = 61
+    assert shedder.observe(50, 0.1) == Rung("whisper", "medium")
+    assert shedder.level == 0
+
+
+def test_missing_measures_count_neither_way():
+    clock = Clock()
+    shedder = LoadShedder(LADDER, recover_after=1, cooldown_s=0, clock=clock)
+    shedder.observe(3000, None)
+    shedder.observe(3000, None)
+    assert shedder.observe(None, None) is None  # décodage repris d'un cache
+    assert shedder.level == 1
+
+
+class FakeEngine:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def transcribe(self, audio):
+        self.calls += 1
+        return iter([{"text": "bonjour", "start": 0.0, "end": 0.4}])
+
+
+def test_transcriber_switches_final_engine_lazily_and_keeps_it_warm(monkeypatch):
+    partial = FakeEngine("parakeet")
+    built = []
+
+    def build_final(engine, size, language):
+        if engine != "whisper":
+            return None  # comme le vrai : « réutilise le moteur des partielles »
+        built.append(size)
+        return FakeEngine(f"whisper-{size}")
+
+    monkeypatch.setattr(transcriber_mod, "build_backend", lambda *a, **kw: partial)
+    monkeypatch.setattr(transcriber_mod, "build_final_backend", build_final)
+    stats = SessionStats()
+    t = Transcriber(Queue(), Queue(), STTConfig(diarization=False), stats=stats)
+    t.history.add = lambda *a, **kw: None
+    medium = t.final_backend
+    assert built == ["medium"]  # les barreaux inférieurs ne sont pas chargés
+
+    for _ in range(2):
+        t._shed_load(5000, None)
+    small = t.final_backend
+    assert small.name == "whisper-small" and small.calls == 1  # préchauffé
+    for _ in range(2):
+        t._shed_load(5000, None)
+    assert t.final_backend is partial
+    assert stats.snapshot()["final_engine"] == "parakeet"
+
+    t._shedder.cooldown_s = 0
+    for _ in range(2 * t._shedder.recover_after):
+        t._shed_load(10, 0.1)
+    assert t.final_backend is medium
+    assert built == ["medium", "small"]  # remonté sans rien recharger
+
+
+def test_slow_final_decode_feeds_the_shedder(monkeypatch):
+    partial = FakeEngine("parakeet")
+    monkeypatch.setattr(transcriber_mod, "build_backend", lambda *a, **kw: partial)
+    monkeypatch.setattr(transcriber_mod, "build_final_backend",
+                        lambda e, size, lang: FakeEngine(size))
+    t = Transcriber(Queue(), Queue(), STTConfig(diarization=False))
+    t.history.add = lambda *a, **kw: None
+    seen = []
+    monkeypatch.setattr(t._shedder, "observe", lambda wait, rtf, audio_s: seen.append((wait, rtf, audio_s)))
+
+    t._run_segment(np.zeros(16000, dtype=np.float32), True, queue_wait_ms=120.0)
+    assert seen[0][0] == 120.0 and seen[0][1] is not None
+    assert seen[0][2] == 1.0  # le délesteur juge lui-même si le RTF compte
+
+
+def test_shedder_rtf_times_the_engine_only_and_survives_speculation(monkeypatch):
+    import time
+
+    partial = FakeEngine("parakeet")
+    monkeypatch.setattr(transcriber_mod, "build_backend", lambda *a, **kw: partial)
+    monkeypatch.setattr(transcriber_mod, "build_final_backend",
+                        lambda e, size, lang: FakeEngine(size))
+    t = Transcriber(Queue(), Queue(), STTConfig(diarization=False))
+    t.history.add = lambda *a, **kw: None
+    seen = []
+    monkeypatch.setattr(t._shedder, "observe", lambda wait, rtf, audio_s: seen.append(rtf))
+    # Un locuteur lent n'est pas un moteur lent.
+    t.tagger = type("SlowTagger", (), {"label": lambda self, a, sr: time.sleep(0.3) or "A"})()
+
+    t._speculate(np.zeros(16000, dtype=np.float32), speculation=1)
+    t._run_segment(np.zeros(16000, dtype=np.float32), True, speculation=1)
+
+    assert len(seen) == 1 and seen[0] is not None  # RTF de la spéculation, repris
+    assert seen[0] < 0.2
@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from benji.stats import SessionStats
 
 
@@ -26,3 +30,39 @@ def test_record_and_percentiles():
     assert snap["audio_seconds"] == 10.0
     assert 40 <= snap["latency_p50_ms"] <= 60
     assert snap["latency_p95_ms"] >= 90
+
+
+def test_record_trace_breaks_latency_down_per_stage():
+    s = SessionStats()
+    s.record_trace({"kind": "final", "capture": 10.0, "vad_in": 10.01, "vad_out": 10.6,
+                    "stt_in": 10.65, "stt_out": 10.9}, shown=10.92)
+    stages = s.snapshot()["stages"]["final"]
+    assert stages["audio_queue"]["p50"] == pytest.approx(10)
+    assert stages["vad"]["p95"] == pytest.approx(590)
+    assert stages["transcribe_queue"]["p99"] == pytest.approx(50)
+    assert stages["decode"]["p50"] == pytest.approx(250)
+    assert stages["display"]["p50"] == pytest.approx(20)
+    assert stages["total"]["p50"] == pytest.approx(920)
+
+
+def test_trace_without_capture_time_skips_the_stages_it_cannot_measure():
+    s = SessionStats()
+    s.record_trace({"kind": "partial", "stt_in": 1.0, "stt_out": 1.1}, shown=1.2)
+    assert set(s.snapshot()["stages"]["partial"]) == {"decode", "display"}
+
+
+def test_chrome_trace_export(tmp_path):
+    s = SessionStats()
+    t0 = s._monotonic_start
+    s.record_trace({"kind": "final", "sample": 16000, "capture": t0, "vad_in": t0 + 0.01,
+                    "vad_out": t0 + 0.5, "stt_in": t0 + 0.5, "stt_out": t0 + 0.7}, shown=t0 + 0.72)
+    out = tmp_path / "trace.json"
+
+    assert s.export_chrome_trace(out) == 1
+
+    events = json.loads(out.read_text())["traceEvents"]
+    slices = {e["cat"]: e for e in events if e["ph"] == "X"}
+    assert set(slices) == {"audio_queue", "vad", "transcribe_queue", "decode", "display"}
+    assert slices["decode"]["ts"] == pytest.approx(500_000)
+    assert slices["decode"]["dur"] == pytest.approx(200_000)
+    assert slices["decode"]["args"] == {"sample": 16000}
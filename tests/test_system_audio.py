@@ -281,3 +281,12 @@ def test_loopback_device_dataclass_is_frozen():
     device = LoopbackDevice(name="BlackHole 2ch", channels=2, score=100)
     with pytest.raises(Exception):
         device.name = "autre"
+
+
+def test_separate_mode_pairs_streams_without_summing():
+    mixer = make_mixer(gain=0.5)
+    mixer.separate = True
+    mixer.system.ring.write(np.full(4, 0.4, dtype=np.float32))
+    out = mixer.pair_chunk(np.full(4, 0.3, dtype=np.float32))
+    assert np.allclose(out[:4], 0.3)
+    assert np.allclose(out[4:], 0.2)
@@ -164,9 +164,12 @@ def test_laffichage_montre_le_fige_puis_lhypothese(monkeypatch):
     t._run_partial(_audio(0.6))
     t._run_partial(_audio(1.0))
 
-    words = [e["text"] for e in _drain(t.display_queue) if e.get("type") == "word"]
+    snaps = _drain(t.display_queue)
+    # Un seul message par passe, quel que soit le nombre de mots.
+    assert [e["type"] for e in snaps] == ["partial_snapshot", "partial_snapshot"]
     # Dernier instantané : les deux mots figés suivis de l'hypothèse courante.
-    assert words[-3:] == ["bonjour", "le", "monde"]
+    assert [w["text"] for w in snaps[-1]["words"]] == ["bonjour", "le", "monde"]
+    assert snaps[-1]["committed"] == 2
 
 
 def test_final_segment_postprocesses_and_resets(monkeypatch):
@@ -176,7 +179,7 @@ def test_final_segment_postprocesses_and_resets(monkeypatch):
         [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6), ("monde", 0.6, 1.0)],
     ])
     saved: list[str] = []
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: saved.append(text))
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: saved.append(text))
 
     # Pretend we were mid-stream so we can prove the reset.
     t._committed_words = [{"text": "stale", "start": 0.0, "end": 0.1}]
@@ -201,7 +204,7 @@ def test_final_segment_attaches_speaker_as_structured_field(monkeypatch):
         [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6), ("monde", 0.6, 1.0)],
     ])
     saved: list[tuple[str, str | None]] = []
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: saved.append((text, speaker)))
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: saved.append((text, speaker)))
     t.tagger = type("T", (), {"label": lambda self, a, sr: "B"})()
 
     t._run_segment(_audio(1.0), is_final=True)
@@ -215,7 +218,7 @@ def test_final_segment_attaches_speaker_as_structured_field(monkeypatch):
 def test_final_segment_omits_speaker_when_diarization_off(monkeypatch):
     # No tagger → no `speaker` key on the message at all.
     t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.4)]])
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: None)
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
     assert t.tagger is None
 
     t._run_segment(_audio(1.0), is_final=True)
@@ -231,7 +234,7 @@ def test_transcribed_text_never_logged_above_debug(monkeypatch, caplog):
     t, _ = _make(monkeypatch, [
         [("secret", 0.0, 0.4), ("bancaire", 0.4, 1.0)],
     ])
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: None)
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
 
     with caplog.at_level("INFO", logger="benji"):
         t._run_segment(_audio(1.0), is_final=True)
@@ -246,7 +249,7 @@ def test_final_segment_drops_hallucination(monkeypatch):
         [("Merci", 0.0, 0.4), ("d'avoir", 0.4, 0.8), ("regardé", 0.8, 1.2)],
     ])
     saved: list[str] = []
-    monkeypatch.setattr(t.history, "add", lambda text: saved.append(text))
+    monkeypatch.setattr(t.history, "add", lambda text, voice=None: saved.append(text))
 
     t._run_segment(_audio(1.2), is_final=True)
 
@@ -287,7 +290,7 @@ def test_diarization_runs_while_the_final_pass_decodes(monkeypatch):
     monkeypatch.setattr(transcriber_mod, "build_final_backend", lambda *a, **kw: None)
     t = Transcriber(Queue(), Queue(), STTConfig(diarization=False), stats=None, sample_rate=SR)
     t.tagger = SlowTagger()
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: None)
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
 
     t._run_segment(_audio(1.0), is_final=True)
 
@@ -308,7 +311,7 @@ def test_hanging_diarizer_does_not_wedge_the_stt_loop(monkeypatch):
 
     t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.5)]])
     t.tagger = HangingTagger()
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: None)
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
     monkeypatch.setattr(t, "_await_speaker",
                         lambda future, timeout=0.05: Transcriber._await_speaker(t, future, 0.05))
 
@@ -329,7 +332,7 @@ def test_tagger_error_is_not_fatal(monkeypatch):
     t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.5)]])
     t.tagger = BrokenTagger()
     saved = []
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: saved.append(speaker))
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: saved.append(speaker))
 
     t._run_segment(_audio(1.0), is_final=True)
 
@@ -356,7 +359,7 @@ def test_les_partielles_et_la_finale_ne_vont_pas_au_meme_moteur(monkeypatch):
         [("brouillon", 0.0, 0.5)],
         [("définitif", 0.0, 0.5)],
     )
-    monkeypatch.setattr(t.history, "add", lambda text, speaker=None: None)
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
 
     t._run_partial(_audio(1.0))
     assert len(partial_backend.calls) == 1
@@ -374,3 +377,430 @@ def test_sans_moteur_final_le_moteur_des_partielles_prend_le_relais(monkeypatch)
     t, backend = _make(monkeypatch, [[("bonjour", 0.0, 0.5)]])
 
     assert t.final_backend is t.backend
+
+
+def test_interleaved_sources_keep_separate_agreement_state(monkeypatch):
+    """VAD multi-flux : les partielles du micro et du système s'entrelacent ;
+    chaque source garde son propre préfixe figé."""
+    t, _ = _make(monkeypatch, [
+        [("bonjour", 0.0, 0.4)],
+        [("salut", 0.0, 0.4)],
+        [("bonjour", 0.0, 0.4), ("tous", 0.4, 0.8)],
+    ])
+
+    t._switch_source("mic")
+    t._run_partial(_audio(0.5))
+    t._switch_source("system")
+    t._run_partial(_audio(0.5))
+    assert t._prev_words_norm == ["salut"]
+    t._switch_source("mic")
+    t._run_partial(_audio(0.9))
+
+    assert [w["text"] for w in t._committed_words] == ["bonjour"]
+
+
+def test_every_partial_pass_feeds_the_cadence(monkeypatch):
+    from benji.stt.cadence import PartialCadence
+
+    t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.4)], []])
+    t.cadence = PartialCadence(400)
+    t._run_partial(_audio(1.0))
+    t._run_partial(_audio(2.0))  # sans mot, mais le thread a travaillé
+    assert t.cadence.rtf is not None
+    assert t.cadence.latency_ms is not None
+    assert t.cadence.interval_ms == t.cadence.min_ms  # décodage factice : instantané
+
+
+def test_trace_rides_on_the_message_that_completes_the_display(monkeypatch):
+    t, _ = _make(monkeypatch, [
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6)],
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6), ("monde", 0.6, 1.0)],
+    ])
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+
+    t._run_segment(_audio(1.0), False, {"kind": "partial", "stt_in": 1.0})
+    t._run_segment(_audio(1.2), True, {"kind": "final", "stt_in": 2.0})
+
+    traced = [m for m in _drain(t.display_queue) if "trace" in m]
+    assert [m["type"] for m in traced] == ["partial_snapshot", "final_text"]
+    assert traced[1]["text"] == "Bonjour le monde"
+    assert all("stt_out" in m["trace"] for m in traced)
+
+
+def test_run_stamps_the_trace_when_the_segment_is_dequeued(monkeypatch):
+    t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.4)]])
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+    t.transcribe_queue.put({"audio": _audio(1.0), "is_final": True,
+                            "trace": {"kind": "final", "vad_out": 0.0}})
+    t.transcribe_queue.put(None)
+
+    t.run()
+
+    final = [m for m in _drain(t.display_queue) if m.get("type") == "final_text"][0]
+    assert 0.0 < final["trace"]["stt_in"] <= final["trace"]["stt_out"]
+
+
+def test_tail_mode_decodes_only_after_the_committed_prefix(monkeypatch):
+    t, backend = _make(monkeypatch, [
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6), ("monde", 0.6, 1.0)],
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6), ("monde", 0.6, 1.0), ("entier", 1.1, 1.5)],
+        # Tranche à partir de 1.0 - 0.5 = 0.5 s : fragment de « le », « monde »
+        # recouvert, puis la suite. Horodatage relatif au début de la tranche.
+        [("e", 0.0, 0.1), ("monde", 0.15, 0.5), ("entier", 0.6, 1.0), ("ici", 1.1, 1.4)],
+    ], partial_tail_decode=True, partial_tail_overlap_s=0.5)
+
+    t._run_partial(_audio(1.2))
+    t._run_partial(_audio(1.6))
+    assert backend.calls == [int(1.2 * SR), int(1.6 * SR)]  # rien de figé : tout le tampon
+    t._run_partial(_audio(2.0))
+
+    assert backend.calls[-1] == int(2.0 * SR) - int(0.5 * SR)
+    assert t._prev_words_norm == ["bonjour", "le", "monde", "entier", "ici"]
+    assert [w["text"] for w in t._committed_words] == ["bonjour", "le", "monde", "entier"]
+    # Horodatage ramené au début du tampon.
+    assert t._committed_words[-1]["start"] == pytest.approx(1.1)
+
+
+def test_stitch_drops_a_straddling_word_repeated_by_the_tail(monkeypatch):
+    t, _ = _make(monkeypatch, [], partial_tail_decode=True)
+    committed = [{"text": "bonjour", "start": 0.0, "end": 0.4},
+                 {"text": "tout", "start": 0.5, "end": 0.9}]
+    # « tout » redaté un peu plus tard par la tranche : le temps seul ne suffit
+    # pas, la répétition textuelle le fait tomber.
+    tail = [{"text": "Tout", "start": 0.6, "end": 1.0},
+            {"text": "le", "start": 1.0, "end": 1.2}]
+
+    stitched = t._stitch(committed, tail)
+
+    assert [w["text"] for w in stitched] == ["bonjour", "tout", "le"]
+
+
+def test_full_redecode_remains_the_default(monkeypatch):
+    t, backend = _make(monkeypatch, [
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6)],
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6)],
+        [("bonjour", 0.0, 0.4), ("le", 0.4, 0.6), ("monde", 0.6, 1.0)],
+    ])
+    for seconds in (1.0, 1.5, 2.0):
+        t._run_partial(_audio(seconds))
+    assert backend.calls == [SR, int(1.5 * SR), 2 * SR]
+
+
+def test_final_reuses_the_matching_speculative_decode(monkeypatch):
+    from benji.stats import SessionStats
+
+    t, backend = _make(monkeypatch, [[("bonjour", 0.0, 0.4), ("tous", 0.4, 0.8)]])
+    t.stats = SessionStats()
+    added = []
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: added.append(text))
+
+    t._speculate(_audio(1.0), speculation=3)
+    assert _drain(t.display_queue) == []  # rien n'est montré d'avance
+    t._run_segment(_audio(1.4), True, speculation=3)
+
+    assert backend.calls == [SR]  # un seul décodage, celui de la spéculation
+    msgs = _drain(t.display_queue)
+    assert [w["text"] for w in msgs[0]["words"]] == ["bonjour", "tous"]
+    assert msgs[-1] == {"type": "final_text", "text": "Bonjour tous"}
+    assert added == ["Bonjour tous"]
+    snap = t.stats.snapshot()
+    assert (snap["speculation_hits"], snap["speculation_misses"], snap["segments"]) == (1, 0, 1)
+
+
+def test_stale_speculation_is_discarded_and_the_final_decoded(monkeypatch):
+    from benji.stats import SessionStats
+
+    t, backend = _make(monkeypatch, [
+        [("bonjour", 0.0, 0.4)],
+        [("bonjour", 0.0, 0.4), ("encore", 0.6, 1.0)],
+    ])
+    t.stats = SessionStats()
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+
+    t._speculate(_audio(0.5), speculation=1)
+    # La parole a repris : le VAD n'a pas lié la finale à la spéculation.
+    t._run_segment(_audio(1.5), True)
+
+    assert backend.calls == [int(0.5 * SR), int(1.5 * SR)]
+    final = [m for m in _drain(t.display_queue) if m["type"] == "final_text"][0]
+    assert final["text"] == "Bonjour encore"
+    assert t.stats.snapshot()["speculation_misses"] == 1
+    assert t._speculations == {}
+
+
+def test_run_skips_a_speculation_already_followed_by_its_final(monkeypatch):
+    t, backend = _make(monkeypatch, [[("bonjour", 0.0, 0.4)]])
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+    t.transcribe_queue.put({"audio": _audio(1.0), "is_final": True,
+                            "speculative": True, "speculation": 1})
+    t.transcribe_queue.put({"audio": _audio(1.5), "is_final": True, "speculation": 1})
+    t.transcribe_queue.put(None)
+
+    t.run()
+
+    assert backend.calls == [int(1.5 * SR)]
+
+
+def test_scheduler_partials_are_never_skipped_as_stale(monkeypatch):
+    import threading
+    import time
+
+    from benji.stt.scheduler import TranscribeScheduler
+
+    backend = FakeBackend([[("bonjour", 0.0, 0.4)], [("salut", 0.0, 0.4)]])
+    monkeypatch.setattr(transcriber_mod, "build_backend", lambda *a, **kw: backend)
+    monkeypatch.setattr(transcriber_mod, "build_final_backend", lambda *a, **kw: None)
+    scheduler = TranscribeScheduler()
+    t = Transcriber(scheduler, Queue(), STTConfig(diarization=False), sample_rate=SR)
+    # Deux partielles de sources différentes en attente : avec une Queue, la
+    # première serait sautée parce que la queue n'est pas vide.
+    scheduler.put({"audio": _audio(0.5), "is_final": False, "source": "mic"})
+    scheduler.put({"audio": _audio(0.5), "is_final": False, "source": "system"})
+    worker = threading.Thread(target=t.run)
+    worker.start()
+    deadline = time.monotonic() + 2.0
+    while len(backend.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    scheduler.put(None)
+    worker.join(timeout=2.0)
+
+    assert len(backend.calls) == 2
+
+
+def _speech(seconds: float, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(-0.5, 0.5, int(seconds * SR)).astype(np.float32)
+
+
+def test_final_reuses_the_last_partial_when_only_silence_was_added(monkeypatch):
+    from benji.stats import SessionStats
+
+    t, backend = _make(monkeypatch, [[("bonjour", 0.0, 0.4), ("tous", 0.4, 0.8)]],
+                       final_engine="parakeet")
+    t.stats = SessionStats()
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+    speech = _speech(1.0)
+    final_audio = np.concatenate([speech, np.zeros(int(0.6 * SR), dtype=np.float32)])
+
+    t._run_segment(speech, False, speech_end=len(speech))
+    t._run_segment(final_audio, True, speech_end=len(speech))
+
+    assert backend.calls == [SR]
+    final = [m for m in _drain(t.display_queue) if m["type"] == "final_text"][0]
+    assert final["text"] == "Bonjour tous"
+    snap = t.stats.snapshot()
+    assert (snap["decode_cache_hits"], snap["decode_cache_misses"]) == (1, 0)
+
+
+def test_final_decodes_again_when_speech_changed(monkeypatch):
+    from benji.stats import SessionStats
+
+    t, backend = _make(monkeypatch, [[("bonjour", 0.0, 0.4)], [("bonjour", 0.0, 0.4), ("tous", 0.9, 1.2)]])
+    t.stats = SessionStats()
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+    speech = _speech(1.5)
+
+    t._run_segment(speech[:SR], False, speech_end=SR)
+    t._run_segment(speech, True, speech_end=len(speech))
+
+    assert backend.calls == [SR, len(speech)]
+    assert t.stats.snapshot()["decode_cache_misses"] == 1
+
+
+def test_no_reuse_across_different_engines(monkeypatch):
+    partial_backend = FakeBackend([[("brouillon", 0.0, 0.5)]])
+    final_backend = FakeBackend([[("définitif", 0.0, 0.5)]])
+    monkeypatch.setattr(transcriber_mod, "build_backend", lambda *a, **kw: partial_backend)
+    monkeypatch.setattr(transcriber_mod, "build_final_backend", lambda *a, **kw: final_backend)
+    t = Transcriber(Queue(), Queue(), STTConfig(diarization=False), stats=None, sample_rate=SR)
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+    speech = _speech(1.0)
+
+    t._run_segment(speech, False, speech_end=SR)
+    t._run_segment(speech, True, speech_end=SR)
+
+    assert len(final_backend.calls) == 1
+
+
+def test_corrector_drains_the_queue_into_one_batch(monkeypatch):
+    import benji.llm.corrector as corrector_mod
+
+    t, _ = _make(monkeypatch, [], llm_correction=True)
+    added = []
+    monkeypatch.setattr(t.history, "add",
+                        lambda text, speaker=None, **kw: added.append((text, speaker)))
+    batches = []
+
+    def correct_batch(texts, language=None, cache=None):
+        batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    monkeypatch.setattr(corrector_mod, "correct_batch", correct_batch)
+    t._correction_queue = Queue()
+    for seq, text in enumerate(("un", "deux", "trois"), 1):
+        t._correction_queue.put((seq, text, "A" if seq == 2 else None, None, "m1"))
+    t._correction_queue.put(None)
+
+    t._corrector_loop()
+
+    assert batches == [["un", "deux", "trois"]]
+    msgs = _drain(t.display_queue)
+    assert [(m["seq"], m["text"]) for m in msgs] == [(1, "UN"), (2, "DEUX"), (3, "TROIS")]
+    assert all(m["corrected"] for m in msgs)
+    assert added == [("UN", None), ("DEUX", "A"), ("TROIS", None)]
+
+
+def test_a_final_with_two_speaker_turns_becomes_two_finals(monkeypatch):
+    from benji.stt.diarization import SlidingWindowDiarizer, Turn
+
+    t, _ = _make(monkeypatch, [
+        [("tu", 0.0, 0.3), ("viens", 0.3, 0.8), ("demain", 0.8, 1.4),
+         ("oui", 1.8, 2.1), ("bien", 2.1, 2.4), ("sûr", 2.4, 2.8)],
+    ])
+    saved: list[tuple[str, str | None]] = []
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: saved.append((text, speaker)))
+    t.tagger = SlidingWindowDiarizer(tagger=None)
+    monkeypatch.setattr(t.tagger, "turns",
+                        lambda audio, sr: [Turn(0.0, 1.6, "A"), Turn(1.6, 3.0, "B")])
+
+    t._run_segment(_audio(3.0), is_final=True, trace={"capture": 0.0})
+
+    finals = [e for e in _drain(t.display_queue) if e.get("type") == "final_text"]
+    assert [(f["text"], f["speaker"]) for f in finals] == [
+        ("Tu viens demain", "A"), ("Oui bien sûr", "B")]
+    assert "trace" in finals[0] and "trace" not in finals[1]
+    assert saved == [("Tu viens demain", "A"), ("Oui bien sûr", "B")]
+
+
+def test_partials_feed_the_window_diarizer_off_the_stt_thread(monkeypatch):
+    from benji.stt.diarization import SlidingWindowDiarizer
+
+    t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.5)]])
+    t.tagger = SlidingWindowDiarizer(tagger=None)
+    seen: list[int] = []
+    monkeypatch.setattr(t.tagger, "observe", lambda audio, sr: seen.append(len(audio)))
+
+    t._run_partial(_audio(2.0))
+    t._observing.result(timeout=2)
+
+    assert seen == [2 * SR]
+
+
+def test_meeting_end_relabels_its_history_from_the_stored_voices(monkeypatch):
+    from benji import meetings
+    from benji.stt.diarization import SlidingWindowDiarizer, Turn
+
+    t, _ = _make(monkeypatch, [[("bonjour", 0.0, 0.5)], [("salut", 0.0, 0.5)]])
+    t.tagger = SlidingWindowDiarizer(tagger=None)
+    voices = iter([0, 1])
+    monkeypatch.setattr(t.tagger, "turns",
+                        lambda audio, sr: [Turn(0.0, 1.0, "A", voice=next(voices))])
+    asked: list[list[int]] = []
+    monkeypatch.setattr(t.tagger, "recluster",
+                        lambda v: asked.append(sorted(v)) or {0: "A", 1: "B"})
+
+    meeting = meetings.current_meeting()
+    t._run_segment(_audio(1.0), is_final=True)
+    t._run_segment(_audio(1.0), is_final=True)
+    meetings.end_current_meeting()  # rend la main sans attendre le calcul
+    t._ensure_diarizer_pool().submit(lambda: None).result(timeout=5)  # worker vidé
+
+    entries = t.history.get_for_meeting(meeting.id)
+    assert asked == [[0, 1]]
+    assert [(e["text"], e["speaker"]) for e in entries] == [("Bonjour", "A"), ("Salut", "B")]
+    assert not any("voice" in e for e in entries)  # indices propres au process
+
+
+def test_meeting_end_does_not_wait_for_the_diarizer(monkeypatch):
+    import threading
+
+    from benji import meetings
+    from benji.stt.diarization import SlidingWindowDiarizer
+
+    t, _ = _make(monkeypatch, [])
+    t.tagger = SlidingWindowDiarizer(tagger=None)
+    meeting = meetings.current_meeting()
+    t.history.add("bonjour", speaker="A", voice=0)
+    release = threading.Event()
+    monkeypatch.setattr(t.tagger, "recluster", lambda v: release.wait(5) and {0: "B"})
+
+    meetings.end_current_meeting()  # le worker est bloqué : l'appel revient quand même
+    release.set()
+    t._ensure_diarizer_pool().submit(lambda: None).result(timeout=5)
+
+    assert t.history.get_for_meeting(meeting.id)[0]["speaker"] == "B"
+
+
+def test_shutdown_waits_for_the_last_meeting_recluster_before_closing_the_worker(monkeypatch):
+    import threading
+
+    from benji import meetings
+    from benji.stt.diarization_worker import ProcessDiarizer
+
+    class _SlowWorker(ProcessDiarizer):
+        def __init__(self):
+            self.closed = False
+            self.started = threading.Event()
+
+        def recluster(self, voices):
+            self.started.wait(5)
+            return {} if self.closed else {0: "B"}
+
+        def close(self):
+            self.closed = True
+
+    t, _ = _make(monkeypatch, [])
+    t.tagger = worker = _SlowWorker()
+    meeting = meetings.current_meeting()
+    t.history.add("bonjour", speaker="A", voice=0)
+    relabelled: list[dict] = []
+    relabel = t.history.relabel
+    monkeypatch.setattr(t.history, "relabel",
+                        lambda mid, speakers: relabelled.append(speakers) or relabel(mid, speakers))
+
+    meetings.end_current_meeting()  # comme BenjiApplication.shutdown, avant le None
+    t.transcribe_queue.put(None)
+    threading.Timer(0.1, worker.started.set).start()
+    t.run()
+
+    assert relabelled == [{0: "B"}]
+    assert worker.closed
+    assert t.history.get_for_meeting(meeting.id)[0]["speaker"] == "B"
+
+
+def test_a_correction_landing_after_its_meeting_ended_drops_its_voice(monkeypatch):
+    import benji.llm.corrector as corrector_mod
+    from benji import meetings
+
+    t, _ = _make(monkeypatch, [], llm_correction=True)
+    monkeypatch.setattr(corrector_mod, "correct_batch",
+                        lambda texts, language=None, cache=None: list(texts))
+    first = meetings.current_meeting()
+    t._correction_queue = Queue()
+    t._correction_queue.put((1, "avant", "A", 0, first.id))
+    meetings.start_meeting()
+    t._correction_queue.put((2, "pendant", "A", 1, meetings.current_meeting().id))
+    t._correction_queue.put(None)
+
+    t._corrector_loop()
+
+    ended = t.history.get_for_meeting(first.id)
+    assert [(e["text"], e.get("voice")) for e in ended] == [("avant", None)]
+    assert t.history.get_for_meeting(meetings.current_meeting().id)[0]["voice"] == 1
+
+
+def test_speculation_never_feeds_the_speaker_clustering(monkeypatch):
+    t, backend = _make(monkeypatch, [[("bonjour", 0.0, 0.4)], [("bonjour", 0.0, 0.4)],
+                                     [("bonjour", 0.0, 0.4), ("encore", 0.6, 1.0)]])
+    monkeypatch.setattr(t.history, "add", lambda text, speaker=None, voice=None: None)
+    labelled: list[int] = []
+    t.tagger = type("Tagger", (), {"label": lambda self, a, sr: labelled.append(len(a)) or "A"})()
+
+    t._speculate(_audio(1.0), speculation=1)
+    assert labelled == []
+    t._run_segment(_audio(1.4), True, speculation=1)  # reprise : étiquetée une fois
+    assert labelled == [int(1.4 * SR)]
+
+    t._speculate(_audio(0.5), speculation=2)
+    t._run_segment(_audio(1.5), True)  # perdue : seule la vraie finale compte
+    assert labelled == [int(1.4 * SR), int(1.5 * SR)]
+    assert len(backend.calls) == 3
@@ -1,6 +1,8 @@
 """VAD state-transition tests with a mocked Silero model."""
 
-from queue import Queue
+import threading
+import time
+from queue import Full, Queue
 from unittest.mock import patch
 
 import numpy as np
@@ -12,8 +14,9 @@ from benji.config import AudioConfig, VADConfig
 
 @pytest.fixture
 def chunks():
-    # 512-sample chunks of silence (Silero VAD expected size)
-    return [np.zeros(512, dtype=np.float32) for _ in range(40)]
+    # 512-sample chunks of faint room noise (Silero VAD expected size). Not
+    # exact zeros: those are digital silence and never reach the model.
+    return [np.full(512, 0.01, dtype=np.float32) for _ in range(40)]
 
 
 def _make_vad(speech_series, audio_cfg=None, vad_cfg=None):
@@ -26,6 +29,7 @@ def _make_vad(speech_series, audio_cfg=None, vad_cfg=None):
     vad_cfg = vad_cfg or VADConfig(
         partial_interval_ms=0,  # disable partials by default for deterministic tests
         min_speech_duration_ms=0,
+        speculative_final_ms=0,
     )
 
     with patch("benji.audio.vad._download_model", return_value="/dev/null"), \
@@ -78,6 +82,22 @@ def test_partial_emitted_during_speech(chunks):
     assert any(not it["is_final"] for it in items)
 
 
+def test_cadence_controller_sets_the_partial_interval(chunks):
+    from benji.stt.cadence import PartialCadence
+
+    cfg = VADConfig(partial_interval_ms=64, min_speech_duration_ms=0,
+                    silence_duration_ms=5000, max_speech_duration_s=60.0)
+    counts = []
+    for interval_ms in (64, 320):
+        vad, tx_q, _ = _make_vad([0.9] * 40, vad_cfg=cfg)
+        vad.cadence = PartialCadence(interval_ms, min_ms=0)
+        for c in chunks:
+            vad.process_chunk(c)
+        counts.append(tx_q.qsize())
+    # 40 chunks de 32 ms : ~1,3 s de parole, une passe par intervalle.
+    assert counts[0] >= 4 * counts[1] > 0
+
+
 def test_max_duration_forces_flush(chunks):
     series = [0.9] * 200
     cfg = VADConfig(
@@ -91,3 +111,367 @@ def test_max_duration_forces_flush(chunks):
         vad.process_chunk(c)
     assert not tx_q.empty()
     assert tx_q.get()["is_final"] is True
+
+
+def test_run_keeps_speech_audio_read_from_a_sample_ring():
+    """Les chunks lus dans l'anneau sont des vues : le VAD doit copier ce
+    qu'il garde, sinon le segment final contient l'audio réécrit depuis."""
+    from benji.audio.ring import SampleRing
+
+    series = [0.9] * 4 + [0.1] * 30
+    vad, tx_q, _ = _make_vad(series)
+    ring = SampleRing(block_size=512, capacity_blocks=2)
+    vad.audio_queue = ring
+
+    def feed():
+        for i in range(len(series)):
+            while True:
+                try:
+                    ring.put_nowait(np.full(512, i + 1, dtype=np.float32))
+                    break
+                except Full:
+                    time.sleep(0.001)
+        ring.put(None)
+
+    t = threading.Thread(target=feed)
+    t.start()
+    vad.run()
+    t.join()
+
+    audio = tx_q.get()["audio"]
+    assert np.array_equal(audio[:512], np.full(512, 1, dtype=np.float32))
+    assert np.array_equal(audio[512:1024], np.full(512, 2, dtype=np.float32))
+
+
+def test_segment_buffer_grows_and_keeps_contents():
+    from benji.audio.vad import _SegmentBuffer
+
+    buf = _SegmentBuffer(4)
+    for i in range(5):
+        buf.append(np.full(3, i, dtype=np.float32))
+    assert len(buf) == 15
+    assert np.array_equal(buf.snapshot(), np.repeat(np.arange(5, dtype=np.float32), 3))
+    buf.clear()
+    assert len(buf) == 0 and len(buf.snapshot()) == 0
+
+
+def test_segment_snapshot_survives_appends_and_clear():
+    """Une partielle est une vue : ni la suite de l'énoncé ni le suivant ne
+    doivent réécrire l'audio que le transcripteur décode encore."""
+    from benji.audio.vad import _SegmentBuffer
+
+    buf = _SegmentBuffer(8)
+    buf.append(np.ones(4, dtype=np.float32))
+    partial = buf.snapshot()
+    buf.append(np.full(4, 2, dtype=np.float32))
+    buf.clear()
+    buf.append(np.full(8, 3, dtype=np.float32))
+    assert np.array_equal(partial, np.ones(4, dtype=np.float32))
+
+
+def test_pre_speech_ring_keeps_the_most_recent_samples_in_order():
+    from benji.audio.vad import _PreSpeechRing, _SegmentBuffer
+
+    ring = _PreSpeechRing(8)
+    for i in range(5):
+        ring.append(np.full(3, i, dtype=np.float32))  # 15 échantillons, 8 gardés
+    target = _SegmentBuffer(16)
+    ring.drain_into(target)
+    assert np.array_equal(target.snapshot(), np.array([2, 2, 3, 3, 3, 4, 4, 4], dtype=np.float32))
+    assert len(ring) == 0
+
+
+def test_final_starts_with_the_pre_speech_pad():
+    # 200 ms de pré-roll à 32 ms par chunk → 6 chunks de silence gardés.
+    series = [0.1] * 10 + [0.9] * 5 + [0.1] * 30
+    vad, tx_q, _ = _make_vad(series)
+    for i in range(len(series)):
+        vad.process_chunk(np.full(512, i + 1, dtype=np.float32))
+    audio = tx_q.get()["audio"]
+    assert np.array_equal(audio[:512], np.full(512, 5, dtype=np.float32))
+    assert np.array_equal(audio[6 * 512 : 7 * 512], np.full(512, 11, dtype=np.float32))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_rolling_quantile_tracks_numpy_on_synthetic_noise(seed):
+    """Le p95 glissant suit `np.quantile` sur la même fenêtre, à une fraction
+    de case près — y compris quand le niveau de bruit change en cours de route."""
+    from collections import deque
+
+    from benji.audio.vad import _RollingQuantile
+
+    rng = np.random.default_rng(seed)
+    # Pièce calme, puis ventilation qui démarre : la distribution se décale.
+    values = np.concatenate([rng.beta(2, 30, 600), rng.beta(6, 20, 600)])
+    est = _RollingQuantile(window=156, q=0.95)
+    ref: deque[float] = deque(maxlen=156)
+    for i, v in enumerate(values):
+        est.add(float(v))
+        ref.append(float(v))
+        if i >= 20:
+            assert abs(est.value() - float(np.quantile(ref, 0.95))) < 0.01
+
+
+def test_adaptive_threshold_lifts_above_a_noisy_floor():
+    series = [0.4] * 40
+    vad, _, _ = _make_vad(series, vad_cfg=VADConfig(partial_interval_ms=0, adaptive_margin=0.1))
+    for _ in range(40):
+        vad.process_chunk(np.full(512, 0.01, dtype=np.float32))
+    assert vad._effective_threshold() == pytest.approx(0.5, abs=0.01)
+
+
+def test_digital_silence_skips_inference_and_is_counted():
+    from benji.stats import SessionStats
+
+    series = [0.9] * 3  # le modèle n'est appelé que sur le chunk non nul
+    vad, _, _ = _make_vad(series)
+    vad.stats = stats = SessionStats()
+    for _ in range(5):
+        vad.process_chunk(np.zeros(512, dtype=np.float32))
+    vad.process_chunk(np.full(512, 0.01, dtype=np.float32))
+
+    assert vad.model.call_count == 1
+    assert vad.model.skip.call_count == 5
+    assert vad.is_speaking
+    snap = stats.snapshot()
+    assert (snap["vad_chunks"], snap["vad_skipped"]) == (6, 5)
+
+
+def test_digital_silence_floor_zero_disables_the_gate():
+    series = [0.1] * 3
+    vad, _, _ = _make_vad(series, vad_cfg=VADConfig(digital_silence_floor=0.0))
+    for _ in range(3):
+        vad.process_chunk(np.zeros(512, dtype=np.float32))
+    assert vad.model.call_count == 3
+
+
+def test_silero_skip_keeps_context_and_resets_state():
+    """Après un trou de silence numérique, l'inférence reprend avec le vrai
+    contexte précédent (la fin du chunk sauté) et un état LSTM remis à zéro."""
+    from benji.audio.vad import SileroVADOnnx
+
+    model = SileroVADOnnx.__new__(SileroVADOnnx)
+    model._bindings = None
+    model._state = np.ones((2, 1, 128), dtype=np.float32)
+    model._context = np.ones(64, dtype=np.float32)
+    chunk = np.arange(512, dtype=np.float32) * 1e-7
+    model.skip(chunk)
+    assert not model._state.any()
+    assert np.array_equal(model._context, chunk[-64:])
+
+
+class _FakeBatch:
+    """Substitut de SileroVADBatch : confiances scriptées, une ligne par flux."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.calls = 0
+        self.skipped: list[int] = []
+        self.resets: list[int] = []
+
+    def __call__(self, chunks):
+        self.calls += 1
+        return np.array(next(self._rows), dtype=np.float32)
+
+    def skip(self, stream, chunk):
+        self.skipped.append(stream)
+
+    def reset_state(self, stream):
+        self.resets.append(stream)
+
+    def slot(self, stream):
+        from benji.audio.vad import _BatchSlot
+
+        return _BatchSlot(self, stream)
+
+
+def test_multi_stream_segments_each_stream_independently():
+    from benji.audio.vad import MultiStreamVADProcessor
+
+    # Le micro parle sur les 10 premiers blocs, le système sur les 10 suivants.
+    rows = [[0.9, 0.1]] * 10 + [[0.1, 0.9]] * 10 + [[0.1, 0.1]] * 30
+    tx_q = Queue()
+    model = _FakeBatch(rows)
+    vad = MultiStreamVADProcessor(
+        Queue(), tx_q, AudioConfig(),
+        VADConfig(partial_interval_ms=0, min_speech_duration_ms=0, speculative_final_ms=0),
+        model=model,
+    )
+    for _ in rows:
+        vad.process_block(np.full((2, 512), 0.01, dtype=np.float32))
+
+    items = [tx_q.get() for _ in range(tx_q.qsize())]
+    assert [it["source"] for it in items] == ["mic", "system"]
+    assert all(it["is_final"] for it in items)
+    assert model.calls == len(rows)  # un seul appel par bloc, pas un par flux
+    assert sorted(model.resets) == [0, 1]  # chaque flush ne remet que sa ligne
+
+
+def test_multi_stream_speaking_indicator_stays_on_while_any_stream_speaks():
+    from benji.audio.vad import MultiStreamVADProcessor
+
+    # Le micro parle seul, puis avec le système, puis se tait avant lui.
+    rows = [[0.9, 0.1]] * 5 + [[0.9, 0.9]] * 5 + [[0.1, 0.9]] * 30 + [[0.1, 0.1]] * 30
+    display_q = Queue()
+    vad = MultiStreamVADProcessor(
+        Queue(), Queue(), AudioConfig(),
+        VADConfig(partial_interval_ms=0, min_speech_duration_ms=0, speculative_final_ms=0),
+        display_queue=display_q, model=_FakeBatch(rows),
+    )
+    for _ in rows:
+        vad.process_block(np.full((2, 512), 0.01, dtype=np.float32))
+
+    statuses = [m for m in (display_q.get() for _ in range(display_q.qsize()))
+                if m["type"] == "vad_status"]
+    assert statuses == [{"type": "vad_status", "speaking": True},
+                        {"type": "vad_status", "speaking": False}]
+
+
+class _FullQueue:
+    """File de transcription saturée : toute finale est abandonnée."""
+
+    def put(self, item, block=True, timeout=None):
+        raise Full
+
+
+def test_multi_stream_drop_names_its_stream():
+    from benji.audio.vad import MultiStreamVADProcessor
+
+    rows = [[0.1, 0.9]] * 10 + [[0.1, 0.1]] * 30
+    display_q = Queue()
+    vad = MultiStreamVADProcessor(
+        Queue(), _FullQueue(), AudioConfig(),
+        VADConfig(partial_interval_ms=0, min_speech_duration_ms=0, speculative_final_ms=0),
+        display_queue=display_q, model=_FakeBatch(rows),
+    )
+    for _ in rows:
+        vad.process_block(np.full((2, 512), 0.01, dtype=np.float32))
+
+    drops = [m for m in (display_q.get() for _ in range(display_q.qsize())) if m.get("drop")]
+    assert [m["source"] for m in drops] == ["system"]
+
+
+def test_multi_stream_skips_inference_only_when_every_stream_is_silent():
+    from benji.audio.vad import MultiStreamVADProcessor
+    from benji.stats import SessionStats
+
+    stats = SessionStats()
+    model = _FakeBatch([[0.1, 0.1]])
+    vad = MultiStreamVADProcessor(Queue(), Queue(), stats=stats, model=model)
+
+    vad.process_block(np.zeros((2, 512), dtype=np.float32))
+    mixed = np.zeros((2, 512), dtype=np.float32)
+    mixed[0] = 0.01
+    vad.process_block(mixed)
+
+    assert model.calls == 1
+    assert model.skipped == [0, 1, 1]  # la ligne muette du 2e bloc est remise à zéro
+    assert stats.snapshot()["vad_skipped"] == 2
+
+
+def test_long_utterance_is_cut_at_the_quietest_recent_chunk():
+    # Limite douce à 1 s (~32 chunks) ; une respiration (confiance et énergie
+    # basses) au chunk 28 : la coupe doit tomber là, pas au chunk 32.
+    n = 32
+    series = [0.9] * n + [0.1] * 30
+    cfg = VADConfig(
+        partial_interval_ms=0, min_speech_duration_ms=0, silence_duration_ms=600,
+        max_speech_duration_s=1.0, split_lookback_ms=320, adaptive_threshold=False,
+        speculative_final_ms=0,
+    )
+    series[27] = 0.6  # toujours de la parole, mais le creux le plus calme
+    vad, tx_q, _ = _make_vad(series, vad_cfg=cfg)
+    for i in range(len(series)):
+        level = 0.01 if i == 27 else 0.3
+        vad.process_chunk(np.full(512, level, dtype=np.float32))
+
+    first, second = tx_q.get(), tx_q.get()
+    assert len(first["audio"]) == 27 * 512 + 256  # coupé au milieu du creux
+    # Le reste n'est pas perdu : il ouvre le segment suivant, clos après
+    # 600 ms de silence (19 chunks).
+    assert len(first["audio"]) + len(second["audio"]) == (n + 19) * 512
+    assert np.allclose(second["audio"][:256], 0.01)
+
+
+def test_split_lookback_zero_keeps_the_hard_cut():
+    series = [0.9] * 40
+    cfg = VADConfig(
+        partial_interval_ms=0, min_speech_duration_ms=0, silence_duration_ms=5000,
+        max_speech_duration_s=0.32, split_lookback_ms=0,
+    )
+    vad, tx_q, _ = _make_vad(series, vad_cfg=cfg)
+    for _ in range(10):
+        vad.process_chunk(np.full(512, 0.3, dtype=np.float32))
+    assert len(tx_q.get()["audio"]) == 10 * 512
+    assert not vad.is_speaking
+
+
+def test_segments_read_from_a_ring_carry_a_latency_trace():
+    from benji.audio.ring import SampleRing
+
+    series = [0.9] * 4 + [0.1] * 30
+    vad, tx_q, _ = _make_vad(series)
+    ring = SampleRing(block_size=512, capacity_blocks=len(series))
+    for i in range(len(series)):
+        ring.put_nowait(np.full(512, 0.01, dtype=np.float32), stamp=100.0 + i)
+    ring.close()
+    vad.audio_queue = ring
+
+    vad.run()
+
+    trace = tx_q.get()["trace"]
+    # The final closes on the last silence chunk: its capture time and position.
+    closing = 4 + 19
+    assert trace["kind"] == "final"
+    assert trace["sample"] == closing * 512
+    assert trace["capture"] == 100.0 + closing - 1
+    assert trace["vad_in"] <= trace["vad_out"]
+
+
+def test_process_chunk_without_capture_time_emits_no_trace(chunks):
+    vad, tx_q, _ = _make_vad([0.9] * 10 + [0.1] * 30)
+    for c in chunks:
+        vad.process_chunk(c)
+    assert "trace" not in tx_q.get()
+
+
+def test_speculative_final_is_sent_early_and_matched_by_the_final():
+    # 10 chunks de parole, puis du silence : à 150 ms (5 chunks de 32 ms) la
+    # spéculation part ; à 600 ms (19 chunks) la finale la désigne.
+    series = [0.9] * 10 + [0.1] * 25
+    cfg = VADConfig(partial_interval_ms=0, min_speech_duration_ms=0, speculative_final_ms=150)
+    vad, tx_q, _ = _make_vad(series, vad_cfg=cfg)
+    for _ in series:
+        vad.process_chunk(np.full(512, 0.3, dtype=np.float32))
+
+    spec, final = tx_q.get(), tx_q.get()
+    assert spec["speculative"] and spec["is_final"]
+    assert len(spec["audio"]) == (10 + 5) * 512
+    assert final["speculation"] == spec["speculation"]
+    assert "speculative" not in final
+    assert len(final["audio"]) == (10 + 19) * 512
+    assert tx_q.empty()
+
+
+def test_speech_resuming_after_speculation_unlinks_the_final():
+    series = [0.9] * 10 + [0.1] * 6 + [0.9] * 5 + [0.1] * 25
+    cfg = VADConfig(partial_interval_ms=0, min_speech_duration_ms=0, speculative_final_ms=150)
+    vad, tx_q, _ = _make_vad(series, vad_cfg=cfg)
+    for _ in series:
+        vad.process_chunk(np.full(512, 0.3, dtype=np.float32))
+
+    items = [tx_q.get() for _ in range(tx_q.qsize())]
+    specs = [it for it in items if it.get("speculative")]
+    finals = [it for it in items if not it.get("speculative")]
+    # Une spéculation par silence ; la finale ne désigne que la seconde, la
+    # première couvrait une parole incomplète.
+    assert [s["speculation"] for s in specs] == [1, 2]
+    assert len(finals) == 1 and finals[0]["speculation"] == 2
+
+
+def test_segments_mark_where_the_trailing_silence_starts(chunks):
+    vad, tx_q, _ = _make_vad([0.9] * 10 + [0.1] * 30)
+    for c in chunks:
+        vad.process_chunk(c)
+    item = tx_q.get()
+    assert item["speech_end"] == len(item["audio"]) - 19 * 512
@@ -99,6 +99,35 @@ def test_partial_line_shows_and_clears(qtbot):
     assert not tab.partial.isVisible()
 
 
+def test_partial_snapshot_replaces_the_partial_line(qtbot):
+    tab = LiveTab()
+    qtbot.addWidget(tab)
+    tab.show()
+    words = [{"text": t} for t in ("bonjour", "le", "mnde")]
+    tab.on_event({"type": "partial_snapshot", "committed": 2, "words": words})
+    words[-1] = {"text": "monde"}
+    words.append({"text": "!"})
+    tab.on_event({"type": "partial_snapshot", "committed": 3, "words": words})
+    # Pas de cumul : le second instantané remplace le premier.
+    assert "bonjour le monde!" in tab.partial.text_label.text()
+    assert "mnde" not in tab.partial.text_label.text()
+    tab.on_event(_final("Bonjour le monde !", "A", 1))
+    assert not tab.partial.isVisible()
+
+
+def test_a_drop_from_another_stream_keeps_the_partial_line(qtbot):
+    tab = LiveTab()
+    qtbot.addWidget(tab)
+    tab.show()
+    words = [{"text": "bonjour"}]
+    tab.on_event({"type": "partial_snapshot", "committed": 1, "words": words,
+                  "source": "system"})
+    tab.on_event(_final("", drop=True, source="mic"))
+    assert "bonjour" in tab.partial.text_label.text()
+    tab.on_event(_final("", drop=True, source="system"))
+    assert not tab.partial.isVisible()
+
+
 def test_items_are_capped_so_long_meetings_do_not_grow_forever(qtbot, monkeypatch):
     """Au-delà du plafond, les lignes les plus anciennes sont retirées.
 